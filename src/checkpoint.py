@@ -0,0 +1,90 @@
+import json
+import os
+import numpy as np
+
+from src.history import History
+from src.population import Population
+
+
+def save_checkpoint(path, humans, energy, rng=None, history=None, steps=0, series=None,
+                    config=None):
+    """
+    writes the complete state of a simulation into a single .npz file, so the
+    simulation can be continued with load_checkpoint after the process ended.
+    The file is written next to the old one first and then replaces it, so an
+    interrupted save never destroys the last checkpoint.
+
+    Args:
+        path (str): file to write
+        humans (Population): population containing all humans
+        energy (float): amount of movement the system should have, an array
+            for several patches
+        rng (Generator): random number generator whose state is saved, optional
+        history (History): recorded curves, optional
+        steps (int): amount of steps calculated so far
+        series (dict): further arrays of the run (e.g. counts of every step), optional
+        config (dict): values the run was started with, they have to be json
+            serializable, optional
+
+    Returns:
+        path (str): written file
+    """
+    path = str(path)
+    arrays = {"column_" + name: getattr(humans, name) for name in Population.columns}
+    arrays["energy"] = np.asarray(energy, dtype=float)
+    arrays["steps"] = np.array(int(steps))
+    if rng is not None:
+        # the state of a bit generator holds integers larger than 64 bit
+        arrays["rng"] = np.array(json.dumps(rng.bit_generator.state))
+    if config is not None:
+        arrays["config"] = np.array(json.dumps(config))
+    if history is not None:
+        arrays.update({"history_" + key: value for key, value in history.state().items()})
+    for name, values in (series or {}).items():
+        arrays["series_" + name] = np.asarray(values)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        np.savez_compressed(file, **arrays)
+    os.replace(temporary, path)
+    return path
+
+
+def load_checkpoint(path):
+    """
+    restores a simulation written by save_checkpoint
+
+    Args:
+        path (str): file to read
+
+    Returns:
+        state (dict): "humans" (Population), "energy" (float or array), "rng"
+            (Generator or None), "history" (History or None), "steps" (int),
+            "series" (dict) and "config" (dict or None)
+    """
+    with np.load(path, allow_pickle=False) as data:
+        humans = Population()
+        for name in Population.columns:
+            setattr(humans, name, data["column_" + name].astype(Population._dtype(name)))
+        humans.recount()
+        rng = None
+        if "rng" in data:
+            state = json.loads(str(data["rng"]))
+            bit_generator = getattr(np.random, state["bit_generator"])()
+            bit_generator.state = state
+            rng = np.random.Generator(bit_generator)
+        history = None
+        if "history_names" in data:
+            history = History.from_state(
+                {key[len("history_"):]: data[key] for key in data.files if key.startswith("history_")})
+        series = {key[len("series_"):]: data[key] for key in data.files if key.startswith("series_")}
+        energy = data["energy"]
+        config = json.loads(str(data["config"])) if "config" in data else None
+        return {
+            "humans": humans,
+            "energy": float(energy) if energy.ndim == 0 else energy,
+            "rng": rng,
+            "history": history,
+            "steps": int(data["steps"]),
+            "series": series,
+            "config": config,
+        }
@@ -0,0 +1,192 @@
+import io
+import zlib
+import numpy as np
+
+
+# positions are rounded to 3 decimals by Population.update, other positions
+# are stored unchanged
+position_scale = 1000
+# columns stored as fixed point numbers
+position_columns = ("x", "y")
+# columns whose codes fit into 2 bits (Status and Group)
+code_columns = ("status", "group")
+
+
+def quantize(values, scale=position_scale):
+    """
+    turns positions into fixed point integers, positions that are already
+    rounded to 1/scale are restored exactly by dequantize
+
+    Args:
+        values (array): positions
+        scale (int): amount of steps per unit of length
+
+    Returns:
+        values (array): int32 multiples of 1/scale
+    """
+    return np.rint(np.asarray(values) * scale).astype(np.int32)
+
+
+def dequantize(values, scale=position_scale):
+    """
+    turns fixed point integers back into positions
+
+    Args:
+        values (array): int32 multiples of 1/scale
+        scale (int): amount of steps per unit of length
+
+    Returns:
+        values (array): positions (float64)
+    """
+    return values / scale
+
+
+def pack_codes(codes):
+    """
+    packs codes between 0 and 3 into 2 bits each, four codes per byte
+
+    Args:
+        codes (array): codes of shape (frames, humans)
+
+    Returns:
+        packed (array): uint8 of shape (frames, ceil(humans / 4))
+    """
+    codes = np.asarray(codes, dtype=np.uint8)
+    frames, n = codes.shape
+    padded = np.zeros((frames, -(-n // 4) * 4), dtype=np.uint8)
+    padded[:, :n] = codes
+    padded = padded.reshape(frames, -1, 4)
+    return padded[..., 0] | padded[..., 1] << 2 | padded[..., 2] << 4 | padded[..., 3] << 6
+
+
+def unpack_codes(packed, n, dtype=np.int8):
+    """
+    unpacks codes packed by pack_codes
+
+    Args:
+        packed (array): uint8 of shape (frames, ceil(n / 4))
+        n (int): amount of humans
+        dtype (dtype): dtype of the codes
+
+    Returns:
+        codes (array): codes of shape (frames, n)
+    """
+    shifts = np.array([0, 2, 4, 6], dtype=np.uint8)
+    codes = (packed[..., None] >> shifts) & 3
+    return codes.reshape(len(packed), -1)[:, :n].astype(dtype)
+
+
+def encode_positions(values):
+    """
+    stores positions of several frames as the fixed point first frame and
+    int16 differences to the previous frame, or as int32 fixed point numbers
+    if a human moved too far between two frames. Frames with positions that
+    are not multiples of 1/scale (e.g. the initial positions, which are not
+    rounded) are stored unchanged as well, so every frame is restored exactly.
+
+    Args:
+        values (array): positions of shape (frames, humans)
+
+    Returns:
+        arrays (dict): "first" and "delta", or "fixed", and "rows" and "raw"
+            for the frames that are stored unchanged
+    """
+    values = np.asarray(values)
+    fixed = quantize(values)
+    delta = np.diff(fixed, axis=0)
+    limit = np.iinfo(np.int16)
+    if delta.size == 0 or (delta.min() >= limit.min and delta.max() <= limit.max):
+        arrays = {"first": fixed[:1], "delta": delta.astype(np.int16)}
+    else:
+        arrays = {"fixed": fixed}
+    inexact = np.flatnonzero(np.any(dequantize(fixed) != values, axis=1))
+    if len(inexact):
+        arrays["rows"] = inexact
+        arrays["raw"] = values[inexact]
+    return arrays
+
+
+def decode_positions(arrays):
+    """
+    restores positions stored by encode_positions
+
+    Args:
+        arrays (dict): "first" and "delta", or "fixed", and optionally "rows" and "raw"
+
+    Returns:
+        values (array): positions of shape (frames, humans)
+    """
+    if "fixed" in arrays:
+        values = dequantize(arrays["fixed"])
+    else:
+        fixed = np.concatenate((arrays["first"], arrays["delta"].astype(np.int32)))
+        values = dequantize(np.cumsum(fixed, axis=0, dtype=np.int32))
+    if "raw" in arrays:
+        values[arrays["rows"]] = arrays["raw"]
+    return values
+
+
+def encode_chunk(columns, compress=False):
+    """
+    encodes the frames of a chunk into bytes: positions as fixed point
+    differences, status and group codes as 2 bits, booleans as single bits
+    and all other columns unchanged
+
+    Args:
+        columns (dict): values of every column, shape (frames, humans)
+        compress (bool): compresses the bytes with zlib
+
+    Returns:
+        data (bytes): encoded chunk
+    """
+    arrays = {}
+    for name, values in columns.items():
+        if name in position_columns:
+            for part, stored in encode_positions(values).items():
+                arrays[f"{name}.{part}"] = stored
+        elif name in code_columns:
+            arrays[name + ".packed"] = pack_codes(values)
+        elif values.dtype == np.bool_:
+            arrays[name + ".bits"] = np.packbits(values, axis=1)
+        else:
+            arrays[name] = values
+        arrays[name + ".shape"] = np.array(values.shape)
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    data = buffer.getvalue()
+    return zlib.compress(data) if compress else data
+
+
+def decode_chunk(data, compressed=False, dtypes=None):
+    """
+    restores the columns of a chunk encoded by encode_chunk
+
+    Args:
+        data (bytes): encoded chunk
+        compressed (bool): True if the bytes were compressed
+        dtypes (dict): dtype of every column, optional
+
+    Returns:
+        columns (dict): values of every column, shape (frames, humans)
+    """
+    if compressed:
+        data = zlib.decompress(data)
+    dtypes = dtypes or {}
+    columns = {}
+    with np.load(io.BytesIO(data), allow_pickle=False) as arrays:
+        parts = {}
+        for key in arrays.files:
+            name, _, part = key.partition(".")
+            parts.setdefault(name, {})[part] = arrays[key]
+    for name, stored in parts.items():
+        frames, n = stored.pop("shape")
+        if "packed" in stored:
+            values = unpack_codes(stored["packed"], n, dtypes.get(name, np.int8))
+        elif "bits" in stored:
+            values = np.unpackbits(stored["bits"], axis=1, count=n).astype(np.bool_)
+        elif "" in stored:
+            values = stored[""]
+        else:
+            values = decode_positions(stored)
+        columns[name] = values.reshape(frames, n)
+    return columns
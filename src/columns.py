@@ -0,0 +1,179 @@
+import numpy as np
+
+
+# amount of status codes (Status) and of groups (Group) the humans are counted by
+number_of_states = 3
+number_of_groups = 3
+
+
+class Columns:
+    """
+    Stores the attributes of humans as contiguous numpy columns
+    (structure of arrays). Row i of every column belongs to the same
+    human. A single Human keeps its attributes in Columns of size one,
+    a Population keeps all humans of a simulation in them.
+    The amount of humans in every group and health state is kept up to date
+    whenever a status or group is changed with set_status or set_group, so
+    counting costs only as much as the humans that changed.
+    """
+
+    columns = (
+        "x",
+        "y",
+        "vx",
+        "vy",
+        "ax",
+        "ay",
+        "status",
+        "group",
+        "patch",
+        "infection_radius",
+        "infection_probability",
+        "radius",
+        "time_till_recovery",
+        "quarantined",
+    )
+
+    def __init__(self, number_of_humans=0):
+        """
+        initialises the columns with zeros
+
+        Args:
+            number_of_humans (int): amount of humans (rows)
+
+        Attr:
+            self.x (array): x-positions
+            self.y (array): y-positions
+            self.vx (array): velocities in x direction
+            self.vy (array): velocities in y direction
+            self.ax (array): accelerations in x direction
+            self.ay (array): accelerations in y direction
+            self.status (array): status codes (values of Status)
+            self.group (array): group codes (values of Group)
+            self.patch (array): patch (e.g. city) every human lives in
+            self.infection_radius (array): maximum distances at which humans get infected
+            self.infection_probability (array): probabilities of infecting another human
+            self.radius (array): radii of the circles shown in the graphic
+            self.time_till_recovery (array): times till the humans are recovered
+            self.quarantined (array): True for humans in quarantine, they neither
+                move nor take part in infections
+            self.layout (int): counts the changes of the rows (deleting or appending humans)
+            self.counts (array): amount of humans of every group (rows) in every
+                health state (columns)
+        """
+        n = int(number_of_humans)
+        for name in self.columns:
+            setattr(self, name, np.zeros(n, dtype=self._dtype(name)))
+        self.layout = 0
+        self.recount()
+
+    @staticmethod
+    def _dtype(name):
+        """returns the dtype used for a column"""
+        if name in ("status", "group"):
+            return np.int8
+        if name == "patch":
+            return np.int32
+        if name == "quarantined":
+            return np.bool_
+        return np.float64
+
+    def __len__(self):
+        return len(self.x)
+
+    def take(self, indices):
+        """
+        copies some humans into new columns of the same type
+
+        Args:
+            indices (array): rows or boolean mask of the humans to copy
+
+        Returns:
+            columns (Columns): columns containing the copied humans
+        """
+        columns = type(self)()
+        for name in self.columns:
+            setattr(columns, name, getattr(self, name)[indices].copy())
+        columns.recount()
+        return columns
+
+    def delete(self, indices):
+        """
+        removes some humans, views onto these columns become invalid
+
+        Args:
+            indices (array): rows or boolean mask of the humans to remove
+        """
+        keep = np.ones(len(self), dtype=bool)
+        keep[indices] = False
+        self.counts -= self._count(~keep)
+        for name in self.columns:
+            setattr(self, name, getattr(self, name)[keep])
+        self.layout += 1
+
+    def extend(self, other):
+        """
+        appends all humans of another population
+
+        Args:
+            other (Columns): humans to append
+        """
+        for name in self.columns:
+            setattr(self, name, np.concatenate(
+                (getattr(self, name), getattr(other, name))))
+        self.counts += other.counts
+        self.layout += 1
+
+    def _count(self, indices):
+        """
+        counts some humans by group and health state
+
+        Args:
+            indices (array): rows or boolean mask of the humans to count
+
+        Returns:
+            counts (array): amount of humans of every group in every health state
+        """
+        codes = self.group[indices].astype(np.int64) * number_of_states + self.status[indices]
+        return np.bincount(np.ravel(codes), minlength=number_of_groups * number_of_states).reshape(
+            number_of_groups, number_of_states)
+
+    def recount(self):
+        """counts all humans again, needed after writing the status or group column directly"""
+        self.counts = self._count(slice(None))
+
+    @staticmethod
+    def _unique(indices):
+        """removes repeated rows, so no human is counted twice"""
+        if isinstance(indices, slice):
+            return indices
+        indices = np.asarray(indices)
+        if indices.dtype == bool or indices.ndim == 0:
+            return indices
+        return np.unique(indices)
+
+    def set_status(self, indices, status):
+        """
+        changes the health state of some humans and updates the counts
+
+        Args:
+            indices (array): rows or boolean mask of the humans
+            status (int): new status code (value of Status)
+        """
+        indices = self._unique(indices)
+        self.counts -= self._count(indices)
+        self.status[indices] = status
+        self.counts += self._count(indices)
+
+    def set_group(self, indices, group):
+        """
+        moves some humans into a group and updates the counts
+
+        Args:
+            indices (array): rows or boolean mask of the humans
+            group (int): new group code (value of Group)
+        """
+        indices = self._unique(indices)
+        self.counts -= self._count(indices)
+        self.group[indices] = group
+        self.counts += self._count(indices)
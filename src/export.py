@@ -0,0 +1,188 @@
+import argparse
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+from PIL import Image
+
+from src.replay import Replay
+from src.runner import default_config, models, run
+from src.trajectory import Trajectory, TrajectoryWriter
+
+
+def render_frames(task):
+    """
+    rasterizes some frames of a trajectory into png files without a display,
+    used by the worker processes
+
+    Args:
+        task (tuple): directory of the trajectory, indices of the frames, directory
+            of the images, length of the axes, dots per inch
+
+    Returns:
+        files (list): written images, in the order of the indices
+    """
+    path, indices, directory, world_limit, dpi = task
+    fig = Figure(figsize=(10, 4))
+    FigureCanvasAgg(fig)
+    viewer = Replay(fig, Trajectory(path), world_limit, slider=False)
+    files = []
+    for index in indices:
+        viewer.show(index)
+        name = os.path.join(directory, f"frame_{index:08d}.png")
+        fig.savefig(name, dpi=dpi)
+        files.append(name)
+    return files
+
+
+def stitch(files, out, fps):
+    """
+    joins images into a video, a gif is written with Pillow, every other
+    format (e.g. mp4) with ffmpeg
+
+    Args:
+        files (list): images in the order of the video
+        out (str): file of the video
+        fps (float): frames per second
+    """
+    if str(out).lower().endswith(".gif"):
+        images = [Image.open(name) for name in files]
+        images[0].save(out, save_all=True, append_images=images[1:],
+                       duration=1000 / fps, loop=0)
+        for image in images:
+            image.close()
+        return
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError(f"writing {out} needs ffmpeg, install it or export a .gif")
+    # ffmpeg reads the images in the order of a list file
+    listing = os.path.join(os.path.dirname(files[0]), "frames.txt")
+    with open(listing, "w") as file:
+        for name in files:
+            file.write(f"file '{os.path.abspath(name)}'\nduration {1 / fps}\n")
+    subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                    "-i", listing, "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                    "-pix_fmt", "yuv420p", "-r", str(fps), str(out)], check=True)
+
+
+def export_trajectory(path, out, fps=25, every=1, processes=None, world_limit=100, dpi=100):
+    """
+    renders a recorded trajectory into a video. The frames are split into
+    blocks that are rasterized in a pool of processes, the images are joined
+    in the order of the frames.
+
+    Args:
+        path (str): directory of the trajectory
+        out (str): file of the video, .gif or .mp4
+        fps (float): frames per second of the video
+        every (int): only every n-th frame of the trajectory is shown
+        processes (int): amount of worker processes, one per core if None
+        world_limit (float): length of the x and y axis
+        dpi (int): dots per inch of the images
+
+    Returns:
+        out (str): written video
+    """
+    indices = np.arange(0, len(Trajectory(path)), int(every))
+    if len(indices) == 0:
+        raise ValueError(f"the trajectory {path} has no frames")
+    workers = processes or os.cpu_count() or 1
+    blocks = np.array_split(indices, min(workers * 4, len(indices)))
+    with tempfile.TemporaryDirectory() as directory:
+        tasks = [(str(path), block.tolist(), directory, world_limit, dpi) for block in blocks]
+        if processes == 1:
+            files = [name for names in map(render_frames, tasks) for name in names]
+        else:
+            with multiprocessing.Pool(processes) as pool:
+                files = [name for names in pool.imap(render_frames, tasks) for name in names]
+        stitch(files, out, fps)
+    return str(out)
+
+
+def export_run(config, n_steps, out, stride=1, **options):
+    """
+    runs a scenario without a display and renders it into a video, the
+    quarantine is recorded as well if humans get quarantined, so the video
+    shows it like the quarantine scenario
+
+    Args:
+        config (dict): values that influence the simulation (see runner.run)
+        n_steps (int): amount of steps to simulate
+        out (str): file of the video, .gif or .mp4
+        stride (int): amount of steps between two frames of the video
+        options: further arguments of export_trajectory
+
+    Returns:
+        out (str): written video
+    """
+    config = {**default_config, **config}
+    columns = ("x", "y", "status")
+    if config["detection_probability"] > 0:
+        columns += ("quarantined",)
+    with tempfile.TemporaryDirectory() as directory:
+        with TrajectoryWriter(directory, config["number_of_humans"], columns, stride=stride,
+                              time_step=config["time_step"]) as trajectory:
+            run(config, n_steps, trajectory=trajectory)
+        return export_trajectory(directory, out, world_limit=config["world_limit"], **options)
+
+
+def parse_args(argv=None):
+    """
+    reads the command line arguments of the export
+
+    Args:
+        argv (list): arguments, the ones of the process if None
+
+    Returns:
+        args (Namespace): all parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Renders a recorded trajectory or a new run into a video without a display.")
+    parser.add_argument("out", help="video file, .gif or .mp4 (needs ffmpeg)")
+    parser.add_argument("--trajectory", metavar="DIR",
+                        help="recorded trajectory, a new run is simulated if not given")
+    parser.add_argument("--model", choices=sorted(models), default=default_config["model"])
+    parser.add_argument("--prob", type=float, default=default_config["prob"])
+    parser.add_argument("--infection-radius", type=float, default=default_config["infection_radius"])
+    parser.add_argument("--humans", type=int, default=default_config["number_of_humans"])
+    parser.add_argument("--temperature", type=float, default=default_config["temperature"])
+    parser.add_argument("--detection-probability", type=float,
+                        default=default_config["detection_probability"],
+                        help="probability of an infected human to be quarantined in a step")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--stride", type=int, default=10, help="amount of steps between two frames")
+    parser.add_argument("--every", type=int, default=1,
+                        help="only every n-th frame of a recorded trajectory is shown")
+    parser.add_argument("--fps", type=float, default=25)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--dpi", type=int, default=100)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """exports a video from the command line"""
+    args = parse_args(argv)
+    options = {"fps": args.fps, "processes": args.processes, "dpi": args.dpi}
+    if args.trajectory:
+        export_trajectory(args.trajectory, args.out, every=args.every, **options)
+    else:
+        config = {
+            "model": args.model,
+            "prob": args.prob,
+            "infection_radius": args.infection_radius,
+            "number_of_humans": args.humans,
+            "temperature": args.temperature,
+            "detection_probability": args.detection_probability,
+            "seed": args.seed,
+        }
+        export_run(config, args.steps, args.out, stride=args.stride, **options)
+    print(f"written {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import numpy as np
+
+
+class History:
+    """
+    Epidemic curves of a run stored in preallocated arrays. Every entry
+    (bucket) summarises `stride` recorded states by their mean, minimum and
+    maximum. When all buckets are used, neighbouring buckets are merged and
+    the stride doubles, so a run of any length needs a fixed amount of memory
+    and a plot of the history never has more than `capacity` points.
+    """
+
+    def __init__(self, names, capacity=1024):
+        """
+        initialises an empty history
+
+        Args:
+            names (list): name of every recorded value (e.g. "inf", "rec", "suc")
+            capacity (int): largest amount of buckets, rounded up to an even number
+
+        Attr:
+            self.time (array): time of the first state of every bucket
+            self.mean (array): mean of every value in every bucket
+            self.min (array): smallest value in every bucket
+            self.max (array): largest value in every bucket
+            self.size (int): amount of complete buckets
+            self.stride (int): amount of states summarised by a bucket
+            self.recorded (int): amount of states recorded so far
+        """
+        self.names = list(names)
+        capacity = max(2, int(capacity) + int(capacity) % 2)
+        k = len(self.names)
+        self.time = np.zeros(capacity)
+        self.mean = np.zeros((capacity, k))
+        self.min = np.zeros((capacity, k))
+        self.max = np.zeros((capacity, k))
+        self.size = 0
+        self.stride = 1
+        self.recorded = 0
+        # bucket that is still being filled
+        self._count = 0
+        self._time = 0.0
+        self._sum = np.zeros(k)
+        self._min = np.zeros(k)
+        self._max = np.zeros(k)
+
+    @property
+    def capacity(self):
+        """largest amount of buckets"""
+        return len(self.time)
+
+    def __len__(self):
+        """amount of buckets including the one that is still being filled"""
+        return self.size + (self._count > 0)
+
+    def append(self, time, values):
+        """
+        records a state
+
+        Args:
+            time (float): time of the state
+            values (array): one value for every name
+        """
+        values = np.asarray(values, dtype=float)
+        if self._count == 0:
+            self._time = time
+            self._sum[:] = values
+            self._min[:] = values
+            self._max[:] = values
+        else:
+            self._sum += values
+            np.minimum(self._min, values, out=self._min)
+            np.maximum(self._max, values, out=self._max)
+        self._count += 1
+        self.recorded += 1
+        if self._count == self.stride:
+            self._store()
+
+    def _store(self):
+        """moves the filled bucket into the arrays, merges buckets if they are full"""
+        n = self.size
+        self.time[n] = self._time
+        self.mean[n] = self._sum / self._count
+        self.min[n] = self._min
+        self.max[n] = self._max
+        self.size += 1
+        self._count = 0
+        if self.size == self.capacity:
+            self._merge()
+
+    def _merge(self):
+        """halves the resolution: every two neighbouring buckets become one"""
+        half = self.size // 2
+        self.time[:half] = self.time[0:2 * half:2]
+        self.mean[:half] = (self.mean[0:2 * half:2] + self.mean[1:2 * half:2]) / 2
+        self.min[:half] = np.minimum(self.min[0:2 * half:2], self.min[1:2 * half:2])
+        self.max[:half] = np.maximum(self.max[0:2 * half:2], self.max[1:2 * half:2])
+        self.size = half
+        self.stride *= 2
+
+    def curves(self, kind="mean"):
+        """
+        gives the recorded curves, including the bucket that is still being filled
+
+        Args:
+            kind (str): "mean", "min" or "max" of every bucket
+
+        Returns:
+            time (array): time of every bucket
+            values (array): one row per name, one column per bucket
+        """
+        stored = getattr(self, kind)
+        if self._count == 0:
+            return self.time[:self.size], stored[:self.size].T
+        pending = {"mean": self._sum / self._count, "min": self._min, "max": self._max}[kind]
+        time = np.append(self.time[:self.size], self._time)
+        values = np.vstack((stored[:self.size], pending)).T
+        return time, values
+
+    def __getitem__(self, name):
+        """
+        gives the mean curve of a single value
+
+        Args:
+            name (str): name of the value
+
+        Returns:
+            values (array): mean of the value in every bucket
+        """
+        return self.curves()[1][self.names.index(name)]
+
+    def state(self):
+        """
+        gives everything needed to restore the history, e.g. for a checkpoint
+
+        Returns:
+            state (dict): arrays and numbers of the history
+        """
+        return {
+            "names": np.array(self.names),
+            "time": self.time[:self.size].copy(),
+            "mean": self.mean[:self.size].copy(),
+            "min": self.min[:self.size].copy(),
+            "max": self.max[:self.size].copy(),
+            "counters": np.array([self.capacity, self.stride, self.recorded, self._count]),
+            "pending": np.vstack((self._sum, self._min, self._max)),
+            "pending_time": np.array(self._time),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        restores a history from History.state
+
+        Args:
+            state (dict): arrays and numbers of the history
+
+        Returns:
+            history (History): history in the saved state
+        """
+        capacity, stride, recorded, count = (int(v) for v in state["counters"])
+        history = cls([str(name) for name in state["names"]], capacity)
+        size = len(state["time"])
+        history.time[:size] = state["time"]
+        history.mean[:size] = state["mean"]
+        history.min[:size] = state["min"]
+        history.max[:size] = state["max"]
+        history.size = size
+        history.stride = stride
+        history.recorded = recorded
+        history._count = count
+        history._time = float(state["pending_time"])
+        history._sum[:], history._min[:], history._max[:] = state["pending"]
+        return history
@@ -1,5 +1,6 @@
 from enum import Enum 
 import numpy as np
+from src.columns import Columns
 
 
 class Status(Enum):
@@ -12,6 +13,16 @@ class Status(Enum):
     RECOVERED = 2
 
 
+class Group(Enum):
+    """
+    Represents the group of a human, the groups are counted separately
+    """
+
+    STANDARD = 0
+    MASK = 1
+    VULNERABLE = 2
+
+
 status_colors = {
     Status.SUCEPTIBLE: "#0000df",
     Status.INFECTED: "#df0000",
@@ -19,6 +30,23 @@ status_colors = {
 }
 
 
+class _Column:
+    """
+    Attribute of a human that is stored in a column of its population.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, human, owner=None):
+        if human is None:
+            return self
+        return getattr(human._population, self.name)[human._index].item()
+
+    def __set__(self, human, value):
+        getattr(human._population, self.name)[human._index] = value
+
+
 class Human:
     """
     Humans can be suceptible (S), infected (I) or recovered (R).
@@ -28,8 +56,23 @@ class Human:
     a human object checks if it is moving outside the given bounds.
     If so, the human calculates a new position like if it was
     bouncing off the boundary.
+
+    A human does not store its attributes itself, it is a view onto
+    one row of Columns (usually a Population). A human created on its
+    own gets columns of size one.
     """
 
+    _x = _Column("x")
+    _y = _Column("y")
+    _vx = _Column("vx")
+    _vy = _Column("vy")
+    _ax = _Column("ax")
+    _ay = _Column("ay")
+    radius = _Column("radius")
+    infection_radius = _Column("infection_radius")
+    infection_probability = _Column("infection_probability")
+    time_till_recovery = _Column("time_till_recovery")
+
     def __init__(
         self,
         location,
@@ -64,7 +107,11 @@ class Human:
             self.infection_probability (float): probbability of getting infected (between 0 and 1)
             self.status (class attribute): status of health (suceptible, infected, recovered) 
             self.time_till_recovery (float): time till the human is recovered from infection
+            self._population (Columns): columns storing the attributes
+            self._index (int): row of the human in the population
         """
+        self._population = Columns(1)
+        self._index = 0
         self._x = location[0]
         self._y = location[1]
         self._vx = velocity[0]
@@ -77,6 +124,43 @@ class Human:
         self.status = status
         self.time_till_recovery = time_till_recovery
 
+    @classmethod
+    def view(cls, population, index):
+        """
+        creates a human that is a view onto a row of a population
+
+        Args:
+            population (Columns): columns storing the human
+            index (int): row of the human in the population
+
+        Returns:
+            human (Human): view onto the row
+        """
+        human = cls.__new__(cls)
+        human._population = population
+        human._index = index
+        return human
+
+    @property
+    def status(self):
+        """
+        status of health
+
+        Returns:
+            status (Status): suceptible, infected or recovered
+        """
+        return Status(int(self._population.status[self._index]))
+
+    @status.setter
+    def status(self, new_status):
+        """
+        sets a new status of health
+
+        Args:
+            new_status (Status): changed status
+        """
+        self._population.set_status(self._index, Status(new_status).value)
+
     @property
     def location(self):
         """
@@ -236,11 +320,14 @@ class Human:
         self._vy = vy
         self.set_location(x, y)
 
-    def will_infect(self, other_human):
+    def will_infect(self, other_human, rng=None):
         """
         checks if another human gets infected
 
         Args:
             other_human (object): human within the infection radius
+            rng (Generator): random number generator, a new one is created if None
         """
-        return self.is_infected() and other_human.is_suceptible() and np.random.rand() <= self.infection_probability
+        if rng is None:
+            rng = np.random.default_rng()
+        return self.is_infected() and other_human.is_suceptible() and rng.random() <= self.infection_probability
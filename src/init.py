@@ -1,25 +1,59 @@
 import numpy as np
-import random
-import math
-from src.human import Human, Status
+from src.human import Group, Status
+from src.population import Population
+import src.placement as placement
 
 
-def infect_random(humans, number_of_humans):
+def infect_random(humans, number_of_humans, rng=None):
     """
     a random Human is selected and gets infected
 
     Args:
         number_of_humans (int): amount of humans in the simulation
+        rng (Generator): random number generator, a new one is created if None
 
     Returns:
-        humans (list): list containing all humans
+        humans (Population): population containing all humans
     """
-    random_number = np.random.randint(int(number_of_humans))
-    humans[random_number].infect()
+    if rng is None:
+        rng = np.random.default_rng()
+    random_number = rng.integers(int(number_of_humans))
+    humans.infect(random_number)
     return humans
 
 
-def make_vulnerable(humans, number_of_humans, number_vulnerable_humans, infection_radius, prob):
+def assign_group(humans, number, group, factor, rng=None):
+    """
+    moves some standard humans into another group. The humans are drawn at once
+    without replacement, their infection radius and infection probability are
+    multiplied by a factor that varies from human to human.
+
+    Args:
+        humans (Population): population containing all humans
+        number (int): amount of humans that change their group
+        group (Group): group they belong to afterwards
+        factor (float): mean of the factor (standard deviation 0.2)
+        rng (Generator): random number generator, a new one is created if None
+
+    Returns:
+        chosen (array): rows of the humans that changed their group
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    number = int(number)
+    standard = np.flatnonzero(humans.group == Group.STANDARD.value)
+    if number > len(standard):
+        raise ValueError(
+            f"cannot move {number} humans into the group {group.name.lower()}, "
+            f"only {len(standard)} humans are left in the standard group")
+    chosen = rng.choice(standard, number, replace=False)
+    humans.set_group(chosen, group.value)
+    humans.infection_radius[chosen] *= rng.normal(factor, 0.2, number)
+    humans.infection_probability[chosen] *= rng.normal(factor, 0.2, number)
+    return chosen
+
+
+def make_vulnerable(humans, number_of_humans, number_vulnerable_humans, infection_radius, prob, rng=None):
     """
     A certain number of humans becomes gets more vulnerable, which makes it easier for him/her 
     to get infected.
@@ -29,24 +63,18 @@ def make_vulnerable(humans, number_of_humans, number_vulnerable_humans, infectio
         number_vulnerable_humans (int): amount of humans that are more vulnerable
         infection_radius (float): distance at which a human gets infected
         prob (float): probability of infection for standard humans
+        rng (Generator): random number generator, a new one is created if None
 
     Returns:
-        humans (list): a list containing all humans (the ones that are more vulnerable and the 
-        ones that are not)
+        humans (Population): population containing all humans (the ones that are more vulnerable
+        and the ones that are not)
     """
-    while number_vulnerable_humans > 0:
-        random_number = np.random.randint(int(number_of_humans))
-        if humans[random_number].infection_radius == infection_radius:
-            humans[random_number].infection_radius *= random.gauss(1.9, 0.2)
-            humans[random_number].infection_probability *= random.gauss(
-                1.9, 0.2)
-            if humans[random_number].infection_probability >= 1:
-                humans[random_number].infection_probability = 0.99
-            number_vulnerable_humans -= 1
+    chosen = assign_group(humans, number_vulnerable_humans, Group.VULNERABLE, 1.9, rng)
+    humans.infection_probability[chosen] = np.minimum(humans.infection_probability[chosen], 0.99)
     return humans
 
 
-def wear_mask(humans, number_of_humans, number_mask_humans, infection_radius, prob):
+def wear_mask(humans, number_of_humans, number_mask_humans, infection_radius, prob, rng=None):
     """
     A specific number of humans wears a face mask now. Therefore the infection probability
     and the infection radius become smaller.
@@ -55,18 +83,13 @@ def wear_mask(humans, number_of_humans, number_mask_humans, infection_radius, pr
         number_of_humans (int): total amount of humans in the simulation
         number_mask_humans (int): amount of humans that are wearing a face mask
         prob (float): probability of infection for standard humans
+        rng (Generator): random number generator, a new one is created if None
 
     Returns:
-        humans (list): a list containing all humans (the ones that are wearing a face 
+        humans (Population): population containing all humans (the ones that are wearing a face
         mask and the ones that are not)
     """
-    while number_mask_humans > 0:
-        random_number = np.random.randint(int(number_of_humans))
-        if humans[random_number].infection_radius == infection_radius:
-            humans[random_number].infection_radius *= random.gauss(0.45, 0.2)
-            humans[random_number].infection_probability *= random.gauss(
-                0.45, 0.2)
-            number_mask_humans -= 1
+    assign_group(humans, number_mask_humans, Group.MASK, 0.45, rng)
     return humans
 
 
@@ -77,10 +100,11 @@ def init_sys(
     world_limit=100,
     infection_radius=5,
     min_distance=1.5,
+    rng=None,
 ):
     """
     initializes the simulation with a certain number of humans, makes sure the humans wont overlap
-    and infects randomly one of them
+    and infects randomly one of them. Raises a ValueError if the humans do not fit into the world.
 
     Args:
         temperature (float): temperature of the system, influcences velocity
@@ -88,53 +112,35 @@ def init_sys(
         world_limit (float): length of the x and y axis
         infection_radius (float): maximum distance a human can infect another
         min_radius (float): minimmal distance between humans
+        rng (Generator): random number generator, a new one is created if None
 
     Returns:
-        humans (list): list containing all humans
+        humans (Population): population containing all humans
         energy (float): amount of movement in the system
     """
 
     if float(prob) > 1:
         raise ValueError("Wahrscheinlichkeit muss kleiner oder gleich 1 sein.")
 
-    humans = []
-    energy = 0
-
-    while len(humans) < float(number_of_humans):
-        # create location
-        location_gen = np.random.rand(2)
-        location = (world_limit - 2 * min_distance) * location_gen + [
-            min_distance,
-            min_distance,
-        ]
-        # check if two humans overlap
-        overlap = False
-        for s in humans:
-            dist = math.dist(location, s.location)
-            if dist < 2*min_distance:
-                overlap = True
-                break
-        if overlap == False:
-            # create velocity
-            velocity_gen_x = random.gauss(0, 1)
-            velocity_gen_y = random.gauss(0, 1)
-            velocity = [velocity_gen_x *
-                        float(temperature), velocity_gen_y * float(temperature)]
-
-            # create the human and put it in the list
-            new_human = Human(
-                location,
-                velocity,
-                infection_probability=prob,
-                radius=min_distance,
-                infection_radius=infection_radius,
-                status=Status.SUCEPTIBLE,
-                time_till_recovery=0,
-            )
-            # calculate energy
-            energy += np.linalg.norm(new_human.velocity)**2
-
-            humans.append(new_human)
-
-    infect_random(humans, number_of_humans)
+    if rng is None:
+        rng = np.random.default_rng()
+    number_of_humans = int(float(number_of_humans))
+    humans = Population(number_of_humans)
+
+    # create locations that do not overlap
+    humans.x[:], humans.y[:] = placement.place_humans(
+        number_of_humans, min_distance, world_limit, rng)
+    # create velocities
+    velocity_gen = rng.standard_normal((2, number_of_humans))
+    humans.vx[:] = velocity_gen[0] * float(temperature)
+    humans.vy[:] = velocity_gen[1] * float(temperature)
+
+    humans.set_status(slice(None), Status.SUCEPTIBLE.value)
+    humans.infection_probability[:] = float(prob)
+    humans.radius[:] = min_distance
+    humans.infection_radius[:] = infection_radius
+    # calculate energy
+    energy = humans.energy()
+
+    infect_random(humans, number_of_humans, rng)
     return humans, energy
@@ -0,0 +1,140 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def lennard_jones(r, epsilon, sigma):
+    """
+    calculates the force resulting from the Lennard-Jones potential
+
+    Args:
+        r (float): distance between two humans (or an array of distances)
+        epsilon (float): depth of the potential
+        sigma (float): distance at which the potential is zero
+    """
+    # derivative of 4 * epsilon * ((sigma / r) ** 12 - (sigma / r) ** 6)
+    return (-24 * epsilon * sigma ** 6 * (r ** 6 - 2 * sigma ** 6)) / (r ** 13)
+
+
+def _pair_forces_numpy(x, y, radius, i, j, dist, ax, ay, epsilon, sigma):
+    """pair_forces with whole-array operations"""
+    near = (dist < 3 * radius[i]) & (dist > 0)
+    i = i[near]
+    j = j[near]
+    dist = dist[near]
+    ljp = lennard_jones(dist, epsilon, sigma)
+    force_x = ljp * (x[i] - x[j]) / dist
+    force_y = ljp * (y[i] - y[j]) / dist
+    n = len(x)
+    ax += np.bincount(i, force_x, n) - np.bincount(j, force_x, n)
+    ay += np.bincount(i, force_y, n) - np.bincount(j, force_y, n)
+
+
+def _pair_forces_loop(x, y, radius, i, j, dist, ax, ay, epsilon, sigma):
+    """pair_forces as a single loop over the pairs, compiled by numba"""
+    for k in range(len(i)):
+        a = i[k]
+        b = j[k]
+        r = dist[k]
+        if r > 0 and r < 3 * radius[a]:
+            ljp = (-24 * epsilon * sigma ** 6 * (r ** 6 - 2 * sigma ** 6)) / (r ** 13)
+            force_x = ljp * (x[a] - x[b]) / r
+            force_y = ljp * (y[a] - y[b]) / r
+            ax[a] += force_x
+            ay[a] += force_y
+            ax[b] -= force_x
+            ay[b] -= force_y
+
+
+def _infection_candidates_numpy(status, infection_radius, target, source, dist, suceptible, infected):
+    """infection_candidates with whole-array operations"""
+    keep = ((dist > 0) & (dist < infection_radius[target])
+            & (status[target] == suceptible) & (status[source] == infected))
+    return target[keep], source[keep]
+
+
+def _infection_candidates_loop(status, infection_radius, target, source, dist, suceptible, infected):
+    """infection_candidates as a single loop over the pairs, compiled by numba"""
+    keep = np.zeros(len(target), dtype=np.bool_)
+    for k in range(len(target)):
+        t = target[k]
+        keep[k] = (dist[k] > 0 and dist[k] < infection_radius[t]
+                   and status[t] == suceptible and status[source[k]] == infected)
+    return target[keep], source[keep]
+
+
+# implementations of every kernel, numba is only offered if it is installed
+backends = {
+    "numpy": {
+        "pair_forces": _pair_forces_numpy,
+        "infection_candidates": _infection_candidates_numpy,
+    },
+}
+if numba is not None:
+    backends["numba"] = {
+        "pair_forces": numba.njit(cache=True)(_pair_forces_loop),
+        "infection_candidates": numba.njit(cache=True)(_infection_candidates_loop),
+    }
+
+# backend used by the simulation, the compiled one if available
+backend = "numba" if "numba" in backends else "numpy"
+
+
+def set_backend(name):
+    """
+    selects the implementation of the kernels used by the simulation
+
+    Args:
+        name (str): "numpy" or "numba"
+    """
+    global backend
+    if name not in ("numpy", "numba"):
+        raise ValueError(f"unknown backend {name!r}, choose 'numpy' or 'numba'")
+    if name not in backends:
+        raise ImportError("the numba backend needs numba to be installed (pip install numba)")
+    backend = name
+
+
+def pair_forces(x, y, radius, i, j, dist, ax, ay, epsilon, sigma):
+    """
+    adds the Lennard-Jones forces of all pairs closer than three times the
+    radius of their first human to the accelerations (in place)
+
+    Args:
+        x (array): x-positions of the humans
+        y (array): y-positions of the humans
+        radius (array): radius of every human
+        i (array): index of the first human of every pair
+        j (array): index of the second human of every pair
+        dist (array): distance between the humans of every pair
+        ax (array): accelerations in x direction, changed in place
+        ay (array): accelerations in y direction, changed in place
+        epsilon (float): depth of the potential
+        sigma (float): distance at which the potential is zero
+    """
+    backends[backend]["pair_forces"](x, y, radius, i, j, dist, ax, ay, float(epsilon), float(sigma))
+
+
+def infection_candidates(status, infection_radius, target, source, dist, suceptible, infected):
+    """
+    keeps the directed pairs in which an infected source is inside the infection
+    radius of a suceptible target, the order of the pairs is kept
+
+    Args:
+        status (array): status codes of the humans
+        infection_radius (array): infection radius of every human
+        target (array): index of the human that could get infected
+        source (array): index of the human that could infect
+        dist (array): distance between the humans
+        suceptible (int): status code of suceptible humans
+        infected (int): status code of infected humans
+
+    Returns:
+        target (array): index of the humans that could get infected
+        source (array): index of the humans that could infect them
+    """
+    return backends[backend]["infection_candidates"](
+        status, infection_radius, target, source, dist, suceptible, infected)
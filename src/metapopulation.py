@@ -0,0 +1,201 @@
+import math
+import numpy as np
+
+import src.simulation as sim
+from src.neighbours import NeighbourList
+from src.population import Population
+
+
+def check_migration(migration, number_of_patches):
+    """
+    checks a migration matrix, humans never migrate into their own patch
+
+    Args:
+        migration (array): probability of a human in patch a to move to patch b
+            (row a, column b), no migration if None
+        number_of_patches (int): amount of patches
+
+    Returns:
+        migration (array): the matrix as floats with an empty diagonal
+    """
+    if migration is None:
+        migration = np.zeros((number_of_patches, number_of_patches))
+    migration = np.array(migration, dtype=float)
+    if migration.shape != (number_of_patches, number_of_patches):
+        raise ValueError("the migration matrix needs one row and one column per patch")
+    np.fill_diagonal(migration, 0)
+    if np.any(migration < 0) or np.any(migration.sum(axis=1) > 1):
+        raise ValueError("every row of the migration matrix has to be a probability")
+    return migration
+
+
+def draw_destinations(migration, patch, draw):
+    """
+    chooses the destination of leaving humans from the draw that made them
+    leave, the draw is uniform below the leaving probability of the patch
+
+    Args:
+        migration (array): checked migration matrix
+        patch (array): patch of every leaving human
+        draw (array): random number of every leaving human
+
+    Returns:
+        destination (array): new patch of every leaving human
+    """
+    cumulative = np.cumsum(migration[patch], axis=1)
+    return np.minimum(np.sum(draw[:, None] >= cumulative, axis=1), len(migration) - 1)
+
+
+class Metapopulation:
+    """
+    Several patches (e.g. cities or regions) whose humans are stored in a
+    single population, the patch of every human is kept in its patch column.
+    For the pair search the patches are laid out side by side with a gap
+    larger than the interaction cutoff, so all patches are stepped in one pass
+    without humans of different patches interacting. Migration only changes
+    the patch of a human, no rows are copied or deleted.
+    """
+
+    def __init__(self, humans, energies, migration=None, migration_interval=25,
+                 world_limit=100, skin=1.0):
+        """
+        initialises the metapopulation
+
+        Args:
+            humans (Population): humans of all patches, their patch column is used
+            energies (array): amount of movement of every patch
+            migration (array): probability of a human in patch a to move to patch b
+                in a migration (row a, column b), no migration if None
+            migration_interval (int): amount of steps between two migrations
+            world_limit (float): length of the x and y axis of every patch
+            skin (float): skin of the neighbour list
+
+        Attr:
+            self.number_of_patches (int): amount of patches
+            self.tiles (int): amount of patches along each axis of the layout
+            self.steps (int): amount of steps calculated so far
+            self.migrations (int): amount of humans that changed their patch so far
+        """
+        self.humans = humans
+        self.energies = np.asarray(energies, dtype=float)
+        self.number_of_patches = len(self.energies)
+        self.migration = check_migration(migration, self.number_of_patches)
+        self.migration_interval = migration_interval
+        self.world_limit = world_limit
+        self.tiles = max(1, math.ceil(math.sqrt(self.number_of_patches)))
+        self.neighbours = NeighbourList(skin, world_limit)
+        self.steps = 0
+        self.migrations = 0
+
+    @classmethod
+    def from_patches(cls, populations, energies, migration=None, **kwargs):
+        """
+        puts separate populations into one metapopulation, population k becomes patch k
+
+        Args:
+            populations (list): population of every patch
+            energies (array): amount of movement of every patch
+            migration (array): probability of a human in patch a to move to patch b
+            kwargs: further arguments of the metapopulation
+
+        Returns:
+            metapopulation (Metapopulation): all patches
+        """
+        humans = Population()
+        for k, population in enumerate(populations):
+            population = population.take(np.arange(len(population)))
+            population.patch[:] = k
+            humans.extend(population)
+        return cls(humans, energies, migration, **kwargs)
+
+    def patch_rows(self, patch):
+        """
+        gives a mask of the humans in a patch
+
+        Args:
+            patch (int): index of the patch
+
+        Returns:
+            rows (array): True for every human in the patch
+        """
+        return self.humans.patch == patch
+
+    def patch_counts(self):
+        """
+        counts the humans of every patch in each health state
+
+        Returns:
+            counts (array): amount of suceptible, infected and recovered humans (columns)
+                of every patch (rows)
+        """
+        codes = self.humans.patch.astype(np.int64) * 3 + self.humans.status
+        return np.bincount(codes, minlength=3 * self.number_of_patches).reshape(
+            self.number_of_patches, 3)
+
+    def _offsets(self, gap):
+        """calculates where the patch of every human lies in the layout"""
+        spacing = self.world_limit + gap
+        patch = self.humans.patch
+        return (patch % self.tiles) * spacing, (patch // self.tiles) * spacing, self.tiles * spacing
+
+    def step(self, dt, rng=None):
+        """
+        calculates a step of all patches like simulation.calculate_movement and
+        lets humans migrate every migration_interval steps
+
+        Args:
+            dt (float): time step in which the movement is calculated
+            rng (Generator): random number generator, a new one is created if None
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        humans = self.humans
+        if len(humans) > 0:
+            cutoff = sim.interaction_cutoff(humans)
+            offset_x, offset_y, layout = self._offsets(cutoff + self.neighbours.skin)
+            x = humans.x.copy()
+            y = humans.y.copy()
+            humans.x += offset_x
+            humans.y += offset_y
+            try:
+                self.neighbours.world_limit = layout
+                self.neighbours.update(humans, cutoff)
+                humans.ax[:] = 0.0
+                humans.ay[:] = 0.0
+                sim.calculate_interactions(humans, layout, self.neighbours)
+                sim.infection(humans, layout, self.neighbours, rng)
+            finally:
+                humans.x[:] = x
+                humans.y[:] = y
+
+            def limit(vx, vy, rows):
+                return sim.limit_velocity_patches(vx, vy, self.energies, humans.patch[rows])
+
+            sim.integrate(humans, dt, limit, self.world_limit)
+
+        self.steps += 1
+        if self.migration_interval and self.steps % self.migration_interval == 0:
+            self.migrate(rng)
+
+    def migrate(self, rng=None):
+        """
+        moves humans to other patches, every human leaves its patch with the
+        probabilities of its row of the migration matrix
+
+        Args:
+            rng (Generator): random number generator, a new one is created if None
+
+        Returns:
+            movers (array): rows of the humans that changed their patch
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        patch = self.humans.patch
+        leaving = self.migration.sum(axis=1)
+        draw = rng.random(len(patch))
+        movers = np.flatnonzero(draw < leaving[patch])
+        if len(movers) == 0:
+            return movers
+        patch[movers] = draw_destinations(self.migration, patch[movers], draw[movers])
+        self.migrations += len(movers)
+        return movers
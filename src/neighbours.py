@@ -0,0 +1,278 @@
+import math
+import numpy as np
+
+
+# offsets of the neighbouring cells, the half shell visits every pair of cells only once
+full_shell = [(ox, oy) for oy in (-1, 0, 1) for ox in (-1, 0, 1)]
+half_shell = [(0, 0), (1, 0), (-1, 1), (0, 1), (1, 1)]
+
+
+class CellGrid:
+    """
+    Uniform grid (cell list) over the world. Every human is sorted into the
+    square cell containing its location. As the cells are at least as large
+    as the cutoff, all humans closer than the cutoff are found in the same or
+    in one of the eight adjacent cells, so a search costs O(N) instead of O(N²).
+    The amount of cells is capped by the amount of humans.
+    """
+
+    def __init__(self, x, y, cutoff, world_limit=100):
+        """
+        sorts the humans into the cells
+
+        Args:
+            x (array): x-positions of the humans
+            y (array): y-positions of the humans
+            cutoff (float): smallest allowed edge length of a cell
+            world_limit (float): length of the x and y axis
+
+        Attr:
+            self.cells_per_axis (int): amount of cells along each axis
+            self.cell_size (float): edge length of a cell
+            self.cell (array): cell index of every human
+            self.order (array): humans sorted by cell index
+            self.start (array): position of the first human of every cell in order
+            self.count (array): amount of humans in every cell
+        """
+        self.x = x
+        self.y = y
+        # never more cells than humans, so the grid stays O(N) in memory
+        limit = max(1, math.ceil(math.sqrt(len(x))))
+        if cutoff > 0:
+            limit = min(limit, max(1, int(world_limit // cutoff)))
+        self.cells_per_axis = limit
+        self.cell_size = world_limit / self.cells_per_axis
+        self.cx, self.cy = self.cell_coordinates(x, y)
+        self.cell = self.cy * self.cells_per_axis + self.cx
+        self.order = np.argsort(self.cell, kind="stable")
+        number_of_cells = self.cells_per_axis ** 2
+        self.count = np.bincount(self.cell, minlength=number_of_cells)
+        self.start = np.concatenate(([0], np.cumsum(self.count)[:-1]))
+
+    def cell_coordinates(self, x, y):
+        """
+        calculates the cell column and row of locations
+
+        Args:
+            x (array): x-positions
+            y (array): y-positions
+
+        Returns:
+            cx (array): cell columns
+            cy (array): cell rows
+        """
+        last = self.cells_per_axis - 1
+        cx = np.clip((x / self.cell_size).astype(np.int64), 0, last)
+        cy = np.clip((y / self.cell_size).astype(np.int64), 0, last)
+        return cx, cy
+
+    def candidates(self, cx, cy, shell=full_shell):
+        """
+        lists every human stored in the grid that is in a cell next to a query cell
+
+        Args:
+            cx (array): cell columns of the queries
+            cy (array): cell rows of the queries
+            shell (list): offsets of the neighbouring cells to visit
+
+        Returns:
+            q (array): index of the query
+            j (array): index of the human in the neighbouring cell
+        """
+        queries = np.arange(len(cx))
+        qs = []
+        js = []
+        for ox, oy in shell:
+            nx = cx + ox
+            ny = cy + oy
+            valid = (nx >= 0) & (nx < self.cells_per_axis) & (
+                ny >= 0) & (ny < self.cells_per_axis)
+            q = queries[valid]
+            cell = ny[valid] * self.cells_per_axis + nx[valid]
+            counts = self.count[cell]
+            total = int(np.sum(counts))
+            if total == 0:
+                continue
+            # position of every candidate inside its cell
+            first = np.cumsum(counts) - counts
+            within = np.arange(total) - np.repeat(first, counts)
+            qs.append(np.repeat(q, counts))
+            js.append(self.order[np.repeat(self.start[cell], counts) + within])
+        if not qs:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(qs), np.concatenate(js)
+
+    def pairs(self, cutoff):
+        """
+        finds every pair of humans in the grid that are closer than the cutoff
+
+        Args:
+            cutoff (float): maximum distance of a pair
+
+        Returns:
+            i (array): index of the first human (always smaller than j)
+            j (array): index of the second human
+            dist (array): distance between the humans
+        """
+        i, j = self.candidates(self.cx, self.cy, half_shell)
+        # inside the same cell both orders are found, keep only one
+        same_cell = self.cell[i] == self.cell[j]
+        keep = ~same_cell | (i < j)
+        i = i[keep]
+        j = j[keep]
+        i, j = np.minimum(i, j), np.maximum(i, j)
+        dist = np.hypot(self.x[i] - self.x[j], self.y[i] - self.y[j])
+        near = dist < cutoff
+        return i[near], j[near], dist[near]
+
+
+def radius_pairs(x, y, radius, world_limit=100):
+    """
+    finds every ordered pair (i, j) of humans with j inside the own radius of i.
+    The humans are put into levels of radii that differ by at most a factor of two,
+    every level gets a grid with cells as large as its largest radius. So humans
+    with a small radius are not searched with the cells needed by the largest one.
+
+    Args:
+        x (array): x-positions of the humans
+        y (array): y-positions of the humans
+        radius (array): radius of every human
+        world_limit (float): length of the x and y axis
+
+    Returns:
+        i (array): index of the human whose radius is used
+        j (array): index of the human inside that radius
+        dist (array): distance between the humans
+    """
+    searching = np.flatnonzero(radius > 0)
+    if len(searching) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    smallest = np.min(radius[searching])
+    levels = np.floor(np.log2(radius[searching] / smallest)).astype(np.int64)
+    i_all = []
+    j_all = []
+    for level in np.unique(levels):
+        members = searching[levels == level]
+        cutoff = np.max(radius[members])
+        grid = CellGrid(x, y, cutoff, world_limit)
+        cx, cy = grid.cell_coordinates(x[members], y[members])
+        q, j = grid.candidates(cx, cy)
+        i_all.append(members[q])
+        j_all.append(j)
+    i = np.concatenate(i_all)
+    j = np.concatenate(j_all)
+    dist = np.hypot(x[i] - x[j], y[i] - y[j])
+    near = (dist < radius[i]) & (i != j)
+    return i[near], j[near], dist[near]
+
+
+class NeighbourList:
+    """
+    Verlet neighbour list. The pairs closer than the cutoff plus a skin are
+    stored and reused for the following steps. As long as no human has moved
+    more than half the skin since the list was built, no pair can have come
+    closer than the cutoff without being in the list, so the expensive grid
+    search only has to be repeated after larger movements.
+    """
+
+    def __init__(self, skin=1.0, world_limit=100):
+        """
+        initialises an empty neighbour list
+
+        Args:
+            skin (float): extra distance added to the cutoff when the list is built
+            world_limit (float): length of the x and y axis
+
+        Attr:
+            self.cutoff (float): cutoff of the current step
+            self.steps (int): amount of steps the list was used for
+            self.rebuilds (int): amount of times the list was built
+        """
+        self.skin = skin
+        self.world_limit = world_limit
+        self.cutoff = 0.0
+        self.steps = 0
+        self.rebuilds = 0
+        self._built_cutoff = -1.0
+        self._built_for = None
+        self._x0 = None
+        self._y0 = None
+        self.i = np.zeros(0, dtype=np.int64)
+        self.j = np.zeros(0, dtype=np.int64)
+
+    def update(self, humans, cutoff):
+        """
+        prepares the list for a new step and builds it again if needed
+
+        Args:
+            humans (Population): population containing all humans
+            cutoff (float): largest distance of a pair needed in this step
+        """
+        self.steps += 1
+        self.cutoff = cutoff
+        built_for = (id(humans), humans.layout, len(humans))
+        if (built_for != self._built_for or cutoff > self._built_cutoff
+                or self.max_displacement(humans) > self.skin / 2):
+            self.build(humans, cutoff)
+
+    def reset(self):
+        """builds the list again in the next step, e.g. after the humans were restored"""
+        self._built_for = None
+
+    def max_displacement(self, humans):
+        """
+        calculates the largest distance a human moved since the list was built
+
+        Args:
+            humans (Population): population containing all humans
+
+        Returns:
+            displacement (float): largest distance
+        """
+        if len(humans) == 0:
+            return 0.0
+        return float(np.max(np.hypot(humans.x - self._x0, humans.y - self._y0)))
+
+    def build(self, humans, cutoff):
+        """
+        searches all pairs within cutoff plus skin with a cell list
+
+        Args:
+            humans (Population): population containing all humans
+            cutoff (float): largest distance of a pair needed in this step
+        """
+        reach = cutoff + self.skin
+        grid = CellGrid(humans.x, humans.y, reach, self.world_limit)
+        self.i, self.j, _ = grid.pairs(reach)
+        self._x0 = humans.x.copy()
+        self._y0 = humans.y.copy()
+        self._built_cutoff = cutoff
+        self._built_for = (id(humans), humans.layout, len(humans))
+        self.rebuilds += 1
+
+    def pairs(self, humans):
+        """
+        gives all pairs of the list that are currently closer than the cutoff
+
+        Args:
+            humans (Population): population containing all humans
+
+        Returns:
+            i (array): index of the first human (always smaller than j)
+            j (array): index of the second human
+            dist (array): distance between the humans
+        """
+        dist = np.hypot(humans.x[self.i] - humans.x[self.j],
+                        humans.y[self.i] - humans.y[self.j])
+        near = dist < self.cutoff
+        return self.i[near], self.j[near], dist[near]
+
+    def report(self):
+        """
+        describes how often the list had to be built
+
+        Returns:
+            report (str): amount of steps and rebuilds
+        """
+        rate = self.rebuilds / self.steps if self.steps else 0.0
+        return f"neighbour list: {self.rebuilds} rebuilds in {self.steps} steps ({rate:.1%}), skin {self.skin}"
@@ -0,0 +1,107 @@
+import time
+
+
+class FramePacer:
+    """
+    Decouples the physics steps from the rendered frames. Every frame as many
+    steps are calculated as fit into a real-time budget, so large simulations
+    still make visible progress and small ones run many steps per frame.
+    If the steps alone take clearly longer than the budget, the computation
+    is behind and drawing the frame is skipped (but never for more than a few
+    frames in a row, so the picture keeps updating).
+    """
+
+    def __init__(self, budget=0.015, max_steps=None, max_skipped=5, clock=time.perf_counter):
+        """
+        initialises the pacer
+
+        Args:
+            budget (float): real time in seconds that may be spent on steps per frame
+            max_steps (int): largest amount of steps per frame, unlimited if None
+            max_skipped (int): largest amount of frames skipped in a row
+            clock (function): gives the current time in seconds
+
+        Attr:
+            self.steps (int): amount of steps calculated so far
+            self.ticks (int): amount of frames requested by the animation
+            self.frames (int): amount of frames that were drawn
+            self.skipped (int): amount of frames that were not drawn
+            self.last_steps (int): amount of steps of the last frame
+            self.render (bool): True if the last frame should be drawn
+        """
+        self.budget = budget
+        self.max_steps = max_steps
+        self.max_skipped = max_skipped
+        self.clock = clock
+        self.steps = 0
+        self.ticks = 0
+        self.frames = 0
+        self.skipped = 0
+        self.last_steps = 0
+        self.render = True
+        self._skipped_in_row = 0
+        self._started = None
+
+    def advance(self, step):
+        """
+        calculates steps until the budget of this frame is used up
+
+        Args:
+            step (function): calculates a single step of the simulation
+
+        Returns:
+            steps (int): amount of steps calculated in this frame
+        """
+        start = self.clock()
+        if self._started is None:
+            self._started = start
+        n = 0
+        while True:
+            step()
+            n += 1
+            elapsed = self.clock() - start
+            if elapsed >= self.budget:
+                break
+            if self.max_steps is not None and n >= self.max_steps:
+                break
+            # stop early if another step would not fit anymore
+            if elapsed / n > self.budget - elapsed:
+                break
+
+        self.steps += n
+        self.ticks += 1
+        self.last_steps = n
+        behind = elapsed > 1.5 * self.budget
+        self.render = not behind or self._skipped_in_row >= self.max_skipped
+        if self.render:
+            self.frames += 1
+            self._skipped_in_row = 0
+        else:
+            self.skipped += 1
+            self._skipped_in_row += 1
+        return n
+
+    def rates(self):
+        """
+        calculates the achieved speed since the first frame
+
+        Returns:
+            steps_per_second (float): physics steps per second
+            frames_per_second (float): drawn frames per second
+        """
+        if self._started is None:
+            return 0.0, 0.0
+        elapsed = self.clock() - self._started
+        if elapsed <= 0:
+            return 0.0, 0.0
+        return self.steps / elapsed, self.frames / elapsed
+
+    def report(self):
+        """
+        describes the achieved speed
+
+        Returns:
+            report (str): steps per second and frames per second
+        """
+        steps_per_second, frames_per_second = self.rates()
+        return f"{steps_per_second:.0f} steps/s, {frames_per_second:.1f} frames/s, {self.skipped} frames skipped"
@@ -0,0 +1,362 @@
+import multiprocessing
+from multiprocessing import connection, shared_memory
+import threading
+import numpy as np
+
+import src.simulation as sim
+from src.metapopulation import check_migration, draw_destinations
+from src.neighbours import NeighbourList
+from src.population import Population
+
+
+class SharedPopulation:
+    """
+    Columns of a population with a fixed capacity stored in a block of shared
+    memory, so a worker process can step the humans in place and the main
+    process can exchange migrants without pickling them. Only the first
+    `size` rows belong to humans, the rest is room for arriving migrants.
+    """
+
+    def __init__(self, capacity, name=None):
+        """
+        creates a new block or attaches to an existing one
+
+        Args:
+            capacity (int): largest amount of humans
+            name (str): name of an existing block, a new block is created if None
+
+        Attr:
+            self.arrays (dict): column name to array of length capacity
+        """
+        self.capacity = int(capacity)
+        layout = []
+        nbytes = 0
+        for column in Population.columns:
+            dtype = np.dtype(Population._dtype(column))
+            # keep every column aligned to 8 bytes
+            nbytes += -nbytes % 8
+            layout.append((column, dtype, nbytes))
+            nbytes += dtype.itemsize * self.capacity
+        self.shm = shared_memory.SharedMemory(name=name, create=name is None, size=max(nbytes, 1))
+        self.name = self.shm.name
+        self.arrays = {column: np.ndarray(self.capacity, dtype, buffer=self.shm.buf, offset=offset)
+                       for column, dtype, offset in layout}
+
+    def store(self, humans):
+        """
+        copies humans into the first rows
+
+        Args:
+            humans (Population): humans to copy
+        """
+        if len(humans) > self.capacity:
+            raise ValueError(f"{len(humans)} humans do not fit into a capacity of {self.capacity}")
+        for column, array in self.arrays.items():
+            array[:len(humans)] = getattr(humans, column)
+
+    def view(self, size):
+        """
+        gives a population whose columns are views onto the first rows, changes
+        to the population are changes of the shared memory
+
+        Args:
+            size (int): amount of humans
+
+        Returns:
+            humans (Population): population viewing the shared memory
+        """
+        humans = Population()
+        for column, array in self.arrays.items():
+            setattr(humans, column, array[:size])
+        humans.recount()
+        return humans
+
+    def close(self, unlink=False):
+        """
+        detaches from the shared memory
+
+        Args:
+            unlink (bool): True to free the memory (only the creating process)
+        """
+        self.arrays = {}
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+def _control_arrays(buffer, number_of_cities):
+    """gives the command, generation, sizes and counts stored in the control block"""
+    values = np.ndarray(2 + 4 * number_of_cities, np.int64, buffer=buffer)
+    return values[0:1], values[1:2], values[2:2 + number_of_cities], \
+        values[2 + number_of_cities:].reshape(number_of_cities, 3)
+
+
+def _step_city(k, name, capacity, control_name, number_of_cities, barrier,
+               energy, time_step, world_limit, seed):
+    """
+    steps a single city in a worker process until the main process stops it.
+    Between two barriers the worker calculates as many steps as the command asks for.
+    A failing worker breaks the barrier, so the other processes do not wait for it.
+    """
+    block = SharedPopulation(capacity, name)
+    control = shared_memory.SharedMemory(name=control_name)
+    command, generation, sizes, counts = _control_arrays(control.buf, number_of_cities)
+    rng = np.random.default_rng(seed)
+    neighbours = NeighbourList(world_limit=world_limit)
+    humans = None
+    seen = -1
+    try:
+        while True:
+            barrier.wait()
+            n_steps = int(command[0])
+            if n_steps < 0:
+                break
+            # rows were exchanged since the last batch
+            if generation[0] != seen:
+                humans = block.view(int(sizes[k]))
+                seen = int(generation[0])
+            for _ in range(n_steps):
+                sim.calculate_movement(humans, time_step, energy, world_limit, neighbours, rng)
+            counts[k] = humans.status_counts()
+            barrier.wait()
+    except threading.BrokenBarrierError:
+        # another process failed, it reports the error
+        pass
+    except BaseException:
+        barrier.abort()
+        raise
+    finally:
+        del humans, command, generation, sizes, counts
+        block.close()
+        control.close()
+
+
+class ParallelCities:
+    """
+    Cities that are stepped in parallel, every city by its own worker process.
+    The columns of every city live in shared memory. The cities only interact
+    through migration, so the workers run independently between two
+    migrations, meet at a barrier and the main process moves the migrants
+    between the shared blocks before the next batch of steps.
+    """
+
+    def __init__(self, populations, energies, migration=None, migration_interval=25,
+                 time_step=0.0001, world_limit=100, capacity=None, seed=None):
+        """
+        copies the cities into shared memory and starts one worker per city
+
+        Args:
+            populations (list): population of every city
+            energies (array): amount of movement of every city
+            migration (array): probability of a human in city a to move to city b
+                in a migration (row a, column b), no migration if None
+            migration_interval (int): amount of steps between two migrations
+            time_step (float): time step in which the movement is calculated
+            world_limit (float): length of the x and y axis
+            capacity (int): largest amount of humans in a city, twice the largest
+                city if None
+            seed (int): seed of the random streams of the workers and the migration
+
+        Attr:
+            self.steps (int): amount of steps calculated so far
+            self.migrations (int): amount of humans that changed their city so far
+        """
+        k = len(populations)
+        self.number_of_cities = k
+        self.migration = check_migration(migration, k)
+        self.migration_interval = migration_interval
+        self.steps = 0
+        self.migrations = 0
+        if capacity is None:
+            capacity = 2 * max((len(p) for p in populations), default=0)
+        streams = np.random.SeedSequence(seed).spawn(k + 1)
+        self.rng = np.random.default_rng(streams[-1])
+
+        self.blocks = []
+        self.control = shared_memory.SharedMemory(create=True, size=8 * (2 + 4 * k))
+        self.command, self.generation, self.sizes, self.counts = _control_arrays(self.control.buf, k)
+        self.barrier = multiprocessing.Barrier(k + 1)
+        self.workers = []
+        self._closing = False
+        try:
+            for population in populations:
+                block = SharedPopulation(capacity)
+                block.store(population)
+                self.blocks.append(block)
+            self.sizes[:] = [len(p) for p in populations]
+            self.counts[:] = [p.status_counts() for p in populations]
+            self.generation[0] = 0
+            for city, (block, energy) in enumerate(zip(self.blocks, energies)):
+                worker = multiprocessing.Process(
+                    target=_step_city,
+                    args=(city, block.name, capacity, self.control.name, k, self.barrier,
+                          float(energy), time_step, world_limit, streams[city]),
+                    daemon=True)
+                worker.start()
+                self.workers.append(worker)
+        except BaseException:
+            self.close()
+            raise
+        if self.workers:
+            watcher = threading.Thread(target=self._watch,
+                                       args=([w.sentinel for w in self.workers],), daemon=True)
+            watcher.start()
+
+    def _watch(self, sentinels):
+        """
+        breaks the barrier if a worker stops before close (e.g. it crashed
+        while stepping), runs in a thread. A worker killed while it holds the
+        lock of the barrier cannot be recovered from.
+        """
+        connection.wait(sentinels)
+        if not self._closing:
+            self.barrier.abort()
+
+    def _wait(self):
+        """
+        waits at the barrier together with the workers, raises a
+        BrokenBarrierError if a worker failed or stopped. The cities cannot be
+        stepped afterwards, only closed.
+        """
+        try:
+            self.barrier.wait()
+        except threading.BrokenBarrierError as error:
+            # the workers leave after the barrier is broken
+            for worker in self.workers:
+                worker.join(1)
+            failed = [city for city, worker in enumerate(self.workers) if worker.exitcode]
+            raise threading.BrokenBarrierError(
+                f"the workers of the cities {failed} stopped, see their output") from error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def step(self, n_steps=1):
+        """
+        calculates steps of all cities in parallel, migrants are exchanged every
+        migration_interval steps
+
+        Args:
+            n_steps (int): amount of steps
+        """
+        remaining = int(n_steps)
+        while remaining > 0:
+            batch = remaining
+            if self.migration_interval:
+                batch = min(batch, self.migration_interval - self.steps % self.migration_interval)
+            self.command[0] = batch
+            # start the batch, then wait until every city has finished it
+            self._wait()
+            self._wait()
+            self.steps += batch
+            remaining -= batch
+            if self.migration_interval and self.steps % self.migration_interval == 0:
+                self.exchange()
+
+    def exchange(self):
+        """
+        moves migrants between the shared blocks while the workers wait,
+        every human leaves its city with the probabilities of its row of the
+        migration matrix
+        """
+        leaving = self.migration.sum(axis=1)
+        movers = []
+        destinations = []
+        arrivals = np.zeros(self.number_of_cities, dtype=np.int64)
+        for city in range(self.number_of_cities):
+            draw = self.rng.random(int(self.sizes[city]))
+            moving = draw < leaving[city]
+            destination = draw_destinations(
+                self.migration, np.full(np.count_nonzero(moving), city), draw[moving])
+            movers.append(moving)
+            destinations.append(destination)
+            arrivals += np.bincount(destination, minlength=self.number_of_cities)
+        leavers = np.array([np.count_nonzero(moving) for moving in movers])
+        full = np.flatnonzero(self.sizes - leavers + arrivals > [b.capacity for b in self.blocks])
+        if len(full):
+            raise RuntimeError(f"city {full[0]} is full, create the cities with a larger capacity")
+
+        arriving = [[] for _ in range(self.number_of_cities)]
+        for city, (block, moving, destination) in enumerate(zip(self.blocks, movers, destinations)):
+            if not np.any(moving):
+                continue
+            size = int(self.sizes[city])
+            rows = {column: array[:size][moving] for column, array in block.arrays.items()}
+            for target in np.unique(destination):
+                chosen = destination == target
+                arriving[target].append({column: values[chosen] for column, values in rows.items()})
+            # close the gaps the migrants left
+            keep = ~moving
+            remaining = size - int(leavers[city])
+            for array in block.arrays.values():
+                array[:remaining] = array[:size][keep]
+            self.sizes[city] = remaining
+        self.migrations += int(leavers.sum())
+        for city, groups in enumerate(arriving):
+            block = self.blocks[city]
+            for rows in groups:
+                size = int(self.sizes[city])
+                n = len(rows["x"])
+                for column, values in rows.items():
+                    block.arrays[column][size:size + n] = values
+                self.sizes[city] = size + n
+        for city, block in enumerate(self.blocks):
+            self.counts[city] = np.bincount(
+                block.arrays["status"][:int(self.sizes[city])], minlength=3)
+        self.generation[0] += 1
+
+    def populations(self):
+        """
+        copies the current humans of every city out of the shared memory
+
+        Returns:
+            populations (list): population of every city
+        """
+        return [block.view(int(size)).take(np.arange(int(size)))
+                for block, size in zip(self.blocks, self.sizes)]
+
+    def status_counts(self):
+        """
+        gives the amount of humans of every city in each health state
+
+        Returns:
+            counts (array): amount of suceptible, infected and recovered humans
+                (columns) of every city (rows)
+        """
+        return self.counts.copy()
+
+    def close(self):
+        """
+        stops the workers and frees the shared memory, also after a worker
+        failed or not all workers were started
+        """
+        self._closing = True
+        try:
+            if self.workers:
+                if len(self.workers) == self.number_of_cities and not self.barrier.broken:
+                    self.command[0] = -1
+                    try:
+                        self.barrier.wait()
+                    except threading.BrokenBarrierError:
+                        pass
+                else:
+                    # the started workers would wait for the missing ones forever
+                    self.barrier.abort()
+                for worker in self.workers:
+                    worker.join(5)
+                    if worker.is_alive():
+                        worker.terminate()
+                        worker.join()
+                self.workers = []
+        finally:
+            for block in self.blocks:
+                block.close(unlink=True)
+            self.blocks = []
+            if self.control is not None:
+                del self.command, self.generation, self.sizes, self.counts
+                self.control.close()
+                self.control.unlink()
+                self.control = None
@@ -0,0 +1,158 @@
+import math
+import numpy as np
+
+from src.neighbours import CellGrid
+
+
+def lattice_capacity(min_distance, world_limit=100):
+    """
+    calculates how many humans fit into the world when they are packed on a
+    square or a hexagonal lattice
+
+    Args:
+        min_distance (float): radius of a human, two humans are at least twice as far apart
+        world_limit (float): length of the x and y axis
+
+    Returns:
+        square (int): amount of humans on a square lattice
+        hexagonal (int): amount of humans on a hexagonal lattice
+    """
+    spacing = 2 * min_distance
+    length = world_limit - 2 * min_distance
+    if length < 0:
+        return 0, 0
+    per_row = math.floor(length / spacing) + 1
+    square = per_row ** 2
+    rows = math.floor(length / (spacing * math.sqrt(3) / 2)) + 1
+    # every second row is shifted by half the spacing
+    shifted_row = math.floor((length - spacing / 2) / spacing) + 1 if length >= spacing / 2 else 0
+    hexagonal = (rows + 1) // 2 * per_row + rows // 2 * shifted_row
+    return square, hexagonal
+
+
+def place_randomly(number_of_humans, min_distance, world_limit, rng, min_acceptance=0.01):
+    """
+    places humans uniformly at random without overlap. Candidates are drawn in
+    rounds, a background grid finds the humans near every candidate, so a round
+    costs about as much as the amount of candidates.
+
+    Args:
+        number_of_humans (int): amount of humans to place
+        min_distance (float): radius of a human, two humans are at least twice as far apart
+        world_limit (float): length of the x and y axis
+        rng (Generator): random number generator
+        min_acceptance (float): smallest share of accepted candidates in a round
+            before the world is considered too full for random placement
+
+    Returns:
+        x (array): x-positions, None if the world became too full
+        y (array): y-positions, None if the world became too full
+    """
+    spacing = 2 * min_distance
+    low = min_distance
+    width = world_limit - 2 * min_distance
+    x = np.zeros(0)
+    y = np.zeros(0)
+    while len(x) < number_of_humans:
+        missing = number_of_humans - len(x)
+        m = max(2 * missing, 64)
+        cx = low + rng.random(m) * width
+        cy = low + rng.random(m) * width
+        # candidates overlapping a placed human
+        free = np.ones(m, dtype=bool)
+        if len(x):
+            grid = CellGrid(x, y, spacing, world_limit)
+            q, j = grid.candidates(*grid.cell_coordinates(cx, cy))
+            free[q[np.hypot(cx[q] - x[j], cy[q] - y[j]) < spacing]] = False
+        cx = cx[free]
+        cy = cy[free]
+        # candidates overlapping an earlier candidate of the same round
+        _, later, _ = CellGrid(cx, cy, spacing, world_limit).pairs(spacing)
+        free = np.ones(len(cx), dtype=bool)
+        free[later] = False
+        cx = cx[free][:missing]
+        cy = cy[free][:missing]
+        if len(cx) < min_acceptance * m:
+            return None, None
+        x = np.concatenate((x, cx))
+        y = np.concatenate((y, cy))
+    return x, y
+
+
+def place_on_lattice(number_of_humans, min_distance, world_limit, rng):
+    """
+    places humans on randomly chosen sites of a lattice, used when the world is
+    too full for random placement. On a square lattice the humans are moved
+    randomly inside their site as far as the distance to the neighbours allows.
+
+    Args:
+        number_of_humans (int): amount of humans to place
+        min_distance (float): radius of a human, two humans are at least twice as far apart
+        world_limit (float): length of the x and y axis
+        rng (Generator): random number generator
+
+    Returns:
+        x (array): x-positions
+        y (array): y-positions
+    """
+    spacing = 2 * min_distance
+    low = min_distance
+    length = world_limit - 2 * min_distance
+    square, hexagonal = lattice_capacity(min_distance, world_limit)
+    if square >= number_of_humans:
+        per_row = max(1, math.ceil(math.sqrt(number_of_humans)))
+        if per_row > 1:
+            step = length / (per_row - 1)
+            sites = np.arange(per_row) * step
+            jitter = (step - spacing) / 2
+        else:
+            sites = np.array([length / 2])
+            jitter = length / 2
+        site_x, site_y = np.meshgrid(sites, sites)
+    else:
+        row_step = spacing * math.sqrt(3) / 2
+        site_x = []
+        site_y = []
+        for row in range(math.floor(length / row_step) + 1):
+            shift = spacing / 2 if row % 2 else 0.0
+            xs = np.arange(shift, length + 1e-9, spacing)
+            site_x.append(xs)
+            site_y.append(np.full(len(xs), row * row_step))
+        site_x = np.concatenate(site_x)
+        site_y = np.concatenate(site_y)
+        jitter = 0.0
+    chosen = rng.choice(site_x.size, number_of_humans, replace=False)
+    x = site_x.ravel()[chosen] + rng.uniform(-jitter, jitter, number_of_humans)
+    y = site_y.ravel()[chosen] + rng.uniform(-jitter, jitter, number_of_humans)
+    return low + np.clip(x, 0, length), low + np.clip(y, 0, length)
+
+
+def place_humans(number_of_humans, min_distance=1.5, world_limit=100, rng=None):
+    """
+    finds locations for humans that do not overlap. The humans are placed at
+    random, if the world is too full for that they are placed on a lattice.
+
+    Args:
+        number_of_humans (int): amount of humans to place
+        min_distance (float): radius of a human, two humans are at least twice as far apart
+        world_limit (float): length of the x and y axis
+        rng (Generator): random number generator, a new one is created if None
+
+    Returns:
+        x (array): x-positions
+        y (array): y-positions
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    number_of_humans = int(number_of_humans)
+    capacity = max(lattice_capacity(min_distance, world_limit))
+    if number_of_humans > capacity:
+        raise ValueError(
+            f"{number_of_humans} humans do not fit into a world of size {world_limit} "
+            f"when they are at least {2 * min_distance} apart, at most {capacity} fit")
+    if number_of_humans == 0:
+        return np.zeros(0), np.zeros(0)
+    x, y = place_randomly(number_of_humans, min_distance, world_limit, rng)
+    if x is None:
+        x, y = place_on_lattice(number_of_humans, min_distance, world_limit, rng)
+    return x, y
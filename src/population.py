@@ -0,0 +1,158 @@
+import numpy as np
+from src.columns import Columns
+from src.human import Human, Status, status_colors
+
+
+# color of every status code, indexed by Status.value
+status_palette = np.array([status_colors[s] for s in Status])
+
+
+class Population(Columns):
+    """
+    Stores all humans of a simulation as contiguous numpy columns
+    (structure of arrays) instead of a list of Human objects.
+    Row i of every column belongs to the same human. Indexing or
+    iterating a population gives Human objects that are thin views
+    onto a row, so code written for lists of humans keeps working.
+    """
+
+    def __getitem__(self, index):
+        """
+        gives a view onto a single human
+
+        Args:
+            index (int): row of the human
+
+        Returns:
+            human (Human): view onto the row
+        """
+        n = len(self)
+        index = int(index)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("population index out of range")
+        return Human.view(self, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield Human.view(self, i)
+
+    @classmethod
+    def from_humans(cls, humans):
+        """
+        creates a population from a list of humans (the humans are copied)
+
+        Args:
+            humans (list): list of humans
+
+        Returns:
+            population (Population): population containing the humans
+        """
+        population = cls(len(humans))
+        for i, h in enumerate(humans):
+            for name in cls.columns:
+                getattr(population, name)[i] = getattr(h._population, name)[h._index]
+        population.recount()
+        return population
+
+    def append(self, human):
+        """
+        appends a copy of a single human
+
+        Args:
+            human (Human): human to append
+        """
+        self.extend(Population.from_humans([human]))
+
+    def update(self, new_x, new_y, new_vx, new_vy, world_limit=100):
+        """
+        updates all humans like Human.update: they are given new locations and
+        velocities that bounce off the walls, infected humans count down their
+        time_till_recovery until at zero to set the status to RECOVERED.
+        Quarantined humans keep their location and velocity, they are released
+        as soon as they are recovered.
+
+        Args:
+            new_x (array): changed x-positions
+            new_y (array): changed y-positions
+            new_vx (array): changed velocities in x direction
+            new_vy (array): changed velocities in y direction
+            world_limit (float): length of the x and y axis
+        """
+        if np.any(self.quarantined):
+            held = self.quarantined
+            new_x = np.where(held, self.x, new_x)
+            new_y = np.where(held, self.y, new_y)
+            new_vx = np.where(held, self.vx, new_vx)
+            new_vy = np.where(held, self.vy, new_vy)
+        upper = world_limit - self.radius
+        flip_x = ((self.x <= self.radius) & (new_vx < 0)) | (
+            (self.x >= upper) & (new_vx > 0))
+        flip_y = ((self.y <= self.radius) & (new_vy < 0)) | (
+            (self.y >= upper) & (new_vy > 0))
+        self.vx[:] = np.where(flip_x, -new_vx, new_vx)
+        self.vy[:] = np.where(flip_y, -new_vy, new_vy)
+        self.x[:] = np.round(np.clip(new_x, self.radius, upper), 3)
+        self.y[:] = np.round(np.clip(new_y, self.radius, upper), 3)
+
+        infected = self.is_infected()
+        self.time_till_recovery[infected] -= 1
+        recovering = np.flatnonzero(infected & (self.time_till_recovery <= 0))
+        self.set_status(recovering, Status.RECOVERED.value)
+        self.quarantined[recovering] = False
+
+    def infect(self, indices, time_till_recovery=200):
+        """
+        sets the status of some humans to infected and changes the time till recovery
+
+        Args:
+            indices (array): rows or boolean mask of the humans to infect
+            time_till_recovery (float): time of the infection
+        """
+        self.set_status(indices, Status.INFECTED.value)
+        self.time_till_recovery[indices] = time_till_recovery
+
+    def is_suceptible(self):
+        """returns a mask that is True for suceptible humans"""
+        return self.status == Status.SUCEPTIBLE.value
+
+    def is_infected(self):
+        """returns a mask that is True for infected humans"""
+        return self.status == Status.INFECTED.value
+
+    def is_recovered(self):
+        """returns a mask that is True for recovered humans"""
+        return self.status == Status.RECOVERED.value
+
+    def is_quarantined(self):
+        """returns a mask that is True for quarantined humans"""
+        return self.quarantined.copy()
+
+    def status_counts(self):
+        """
+        gives the amount of humans in each health state, taken from the
+        counts that are updated on every change of a status
+
+        Returns:
+            counts (array): amount of suceptible, infected and recovered humans
+        """
+        return self.counts.sum(axis=0)
+
+    def colors(self):
+        """
+        gives the colors corresponding to the health status
+
+        Returns:
+            colors (array): color codes of all humans
+        """
+        return status_palette[self.status]
+
+    def energy(self):
+        """
+        calculates the amount of movement in the population
+
+        Returns:
+            energy (float): sum of the squared velocities
+        """
+        return float(np.sum(self.vx ** 2 + self.vy ** 2))
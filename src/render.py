@@ -0,0 +1,207 @@
+import matplotlib.animation as animation
+from matplotlib.patches import Rectangle
+import numpy as np
+
+
+# colors and labels of the stack plots
+sir_colors = ['#df0000', '#4a4a4a', '#0000df']
+sir_labels = ['infected', 'recovered', 'succeptable']
+# every health state split into the vulnerable, standard and mask group
+group_colors = ['#9c0000', '#df0000', '#eb6666',
+                '#3b3b3b', '#4a4a4a', '#6e6e6e',
+                '#00009c', '#0000df', '#6666eb']
+group_labels = ['infected (vulnerable)', 'infected', 'infected (mask)',
+                'recovered (vulnerable)', 'recovered', 'recovered (mask)',
+                'succeptable (vulnerable)', 'succeptable', 'succeptable (mask)']
+# quarantined humans apart from the other infected ones
+quarantine_colors = ['#df0000', '#ffc637', '#4a4a4a', '#0000df']
+quarantine_labels = ['infected', 'quarantined', 'recovered', 'succeptable']
+# box around the amount of quarantined humans
+quarantine_box = dict(boxstyle="square", ec=(0.9, 0.68, 0.12), fc=(1., 0.78, 0.22))
+
+
+class HumanView:
+    """
+    Scatter plot of the humans. The scatter is created once and only its
+    positions and colors are changed every frame.
+    """
+
+    def __init__(self, subplot, world_limit=100, title=False, animated=True):
+        """
+        creates the scatter
+
+        Args:
+            subplot (plot): plot the humans are drawn in
+            world_limit (float): length of the x and y axis
+            title (bool): True if the achieved speed should be shown in the top left corner
+            animated (bool): False if the scatter is drawn without blitting
+        """
+        subplot.set_xlim(0, world_limit)
+        subplot.set_ylim(0, world_limit)
+        self.scatter = subplot.scatter([], [], s=25, animated=animated)
+        self.title = None
+        if title:
+            # inside the axes, blitting only restores the area of the axes
+            self.title = subplot.text(
+                0.01, 0.99, "", transform=subplot.transAxes, ha="left", va="top",
+                fontsize="x-small", animated=animated,
+                bbox=dict(boxstyle="square", fc="white", ec="none", alpha=0.7))
+
+    def update(self, humans, pacer=None, rows=None, neighbours=None):
+        """
+        moves the scatter to the current state of the humans
+
+        Args:
+            humans (Population): population containing all humans
+            pacer (FramePacer): its achieved speed is shown in the corner, optional
+            rows (array): rows or mask of the humans to show, all if None
+            neighbours (NeighbourList): its rebuild report is shown below the speed, optional
+
+        Returns:
+            artists (tuple): changed artists
+        """
+        if rows is None:
+            rows = slice(None)
+        self.scatter.set_offsets(np.column_stack((humans.x[rows], humans.y[rows])))
+        self.scatter.set_facecolor(humans.colors()[rows])
+        if self.title is None:
+            return (self.scatter,)
+        lines = [item.report() for item in (pacer, neighbours) if item is not None]
+        if lines:
+            self.title.set_text("\n".join(lines))
+        return (self.scatter, self.title)
+
+
+class StackView:
+    """
+    Stack plot of several series. One polygon per series is created once and
+    its corners are replaced every frame. The time axis is scaled to the width
+    of the plot, so the axis limits never change.
+    """
+
+    def __init__(self, subplot, colors, total, animated=True):
+        """
+        creates the polygons
+
+        Args:
+            subplot (plot): plot the stack plot is drawn in
+            colors (list): color of every series (from bottom to top)
+            total (float): height of the plot
+            animated (bool): False if the polygons are drawn without blitting
+        """
+        subplot.set_xlim(0, 1)
+        subplot.set_ylim(0, total)
+        self.bands = [subplot.fill_between([0, 1], 0, 0, color=c, animated=animated)
+                      for c in colors]
+
+    def update(self, steps, series):
+        """
+        draws the series
+
+        Args:
+            steps (array): time of every entry
+            series (list): values of every series (from bottom to top)
+
+        Returns:
+            artists (tuple): changed artists
+        """
+        steps = np.asarray(steps, dtype=float)
+        if len(steps) == 0:
+            return tuple(self.bands)
+        width = steps[-1] - steps[0]
+        xs = (steps - steps[0]) / width if width > 0 else np.zeros(len(steps))
+        upper = np.cumsum(np.asarray(series, dtype=float), axis=0)
+        lower = np.vstack((np.zeros(len(steps)), upper[:-1]))
+        for band, low, high in zip(self.bands, lower, upper):
+            verts = np.concatenate((np.column_stack((xs, high)),
+                                    np.column_stack((xs[::-1], low[::-1]))))
+            band.set_verts([verts])
+        return tuple(self.bands)
+
+
+def hide_axes(subplot, frame=True):
+    """
+    hides the axes of a subplot
+
+    Args:
+        subplot (plot): plot whose axes are hidden
+        frame (bool): False if the frame should be hidden as well
+    """
+    subplot.set_frame_on(frame)
+    subplot.axes.xaxis.set_visible(False)
+    subplot.axes.yaxis.set_visible(False)
+
+
+def add_legend(subplot, colors, labels, **style):
+    """
+    creates the legend of a stack plot once
+
+    Args:
+        subplot (plot): plot of the stack plot
+        colors (list): color of every entry
+        labels (list): label of every entry
+        style: arguments of the legend (position, columns, ...)
+
+    Returns:
+        legend: the legend
+    """
+    handles = [Rectangle((0, 0), 1, 1, fc=c) for c in colors]
+    return subplot.legend(handles, labels, **style)
+
+
+class TextView:
+    """
+    Text box whose content is changed every frame.
+    """
+
+    def __init__(self, subplot, animated=True, **style):
+        """
+        creates the text
+
+        Args:
+            subplot (plot): plot the text is drawn in
+            animated (bool): False if the text is drawn without blitting
+            style: arguments of the text (size, bbox, ...)
+        """
+        self.text = subplot.text(0, 0.5, "", animated=animated, **style)
+
+    def update(self, text):
+        """
+        changes the text
+
+        Args:
+            text (str): new content
+
+        Returns:
+            artists (tuple): changed artists
+        """
+        self.text.set_text(text)
+        return (self.text,)
+
+
+def animate(fig, pacer, step, record, draw, interval=20):
+    """
+    creates the single animation driving a figure: every frame the pacer
+    calculates the steps, the state is recorded and the changed artists are
+    drawn with blitting
+
+    Args:
+        fig (figure): figure that gets animated
+        pacer (FramePacer): decides how many steps fit into a frame
+        step (function): calculates a single step of the simulation
+        record (function): records the state after the steps of a frame
+        draw (function): updates the artists and returns the changed ones
+        interval (float): time between two frames in ms
+
+    Returns:
+        ani (FuncAnimation): animation of the figure
+    """
+    def frame(i):
+        pacer.advance(step)
+        record()
+        if not pacer.render:
+            return ()
+        return draw()
+
+    return animation.FuncAnimation(
+        fig, frame, init_func=draw, interval=interval, blit=True, cache_frame_data=False)
@@ -0,0 +1,245 @@
+import argparse
+import math
+import matplotlib.pyplot as plt
+from matplotlib.widgets import Slider
+import numpy as np
+
+import src.render as render
+from src.columns import number_of_groups, number_of_states
+from src.human import Group, Status
+from src.population import Population
+from src.trajectory import Trajectory, summarise
+
+
+def summary_index(trajectory, block=256):
+    """
+    gives the amount of humans in each health state in every frame, the
+    summary written with the trajectory or counted once from the statuses
+
+    Args:
+        trajectory (Trajectory): recorded trajectory
+        block (int): amount of frames counted at once
+
+    Returns:
+        counts (array): amount of suceptible, infected and recovered humans
+            (columns) in every frame (rows)
+    """
+    if trajectory.summary is not None:
+        return trajectory.summary
+    if "status" not in trajectory.names():
+        raise ValueError("the trajectory has no statuses, record it with the status column")
+    status = trajectory["status"]
+    return np.concatenate([summarise(status[start:start + block])
+                           for start in range(0, len(trajectory), block)]
+                          or [np.zeros((0, 3), dtype=np.int64)])
+
+
+def band_counts(trajectory, counts, block=256):
+    """
+    gives the bands of the stack plot in every frame, they follow the
+    recorded columns like the scenarios do: every health state split into
+    the groups if the group was recorded, the quarantined humans apart from
+    the other infected ones if the quarantine was recorded and the health
+    states otherwise
+
+    Args:
+        trajectory (Trajectory): recorded trajectory
+        counts (array): amount of humans in each health state in every frame (see summary_index)
+        block (int): amount of frames counted at once
+
+    Returns:
+        bands (array): value of every band (columns, from bottom to top) in every frame (rows)
+    """
+    names = trajectory.names()
+    frames = len(trajectory)
+    if "group" in names:
+        statuses, groups = trajectory["status"], trajectory["group"]
+        codes = number_of_groups * number_of_states
+        bands = []
+        for start in range(0, frames, block):
+            # code of every human, every frame has its own range of codes
+            code = (groups[start:start + block].astype(np.int64) * number_of_states
+                    + statuses[start:start + block])
+            code += codes * np.arange(len(code))[:, None]
+            bands.append(np.bincount(code.ravel(), minlength=len(code) * codes).reshape(-1, codes))
+        totals = np.concatenate(bands or [np.zeros((0, codes), dtype=np.int64)])
+        return totals[:, [group.value * number_of_states + state.value
+                          for state in (Status.INFECTED, Status.RECOVERED, Status.SUCEPTIBLE)
+                          for group in (Group.VULNERABLE, Group.STANDARD, Group.MASK)]]
+    suc, inf, rec = np.asarray(counts).T
+    if "quarantined" in names:
+        quarantined = trajectory["quarantined"]
+        qua = np.concatenate([np.count_nonzero(quarantined[start:start + block], axis=1)
+                              for start in range(0, frames, block)]
+                             or [np.zeros(0, dtype=np.int64)])
+        return np.column_stack((inf - qua, qua, rec, suc))
+    return np.column_stack((inf, rec, suc))
+
+
+def frame_humans(frame):
+    """
+    puts the columns of a frame into a population so the views can draw it
+
+    Args:
+        frame (dict): values of every recorded column
+
+    Returns:
+        humans (Population): humans of the frame, columns that were not recorded are zero
+    """
+    humans = Population(len(next(iter(frame.values()))))
+    for name, values in frame.items():
+        getattr(humans, name)[:] = values
+    return humans
+
+
+class Replay:
+    """
+    Shows a recorded trajectory in the layout of the scenario it was recorded
+    from, the humans of a single frame next to the stack plot of the whole
+    run. The recorded columns choose the layout: one world per city if the
+    patch was recorded, the quarantined humans in a box of their own if the
+    quarantine was recorded and the health states of every group if the group
+    was recorded. A frame is read only when it is shown and the curves come
+    from the per-frame summary, so jumping to any frame costs the same.
+    """
+
+    def __init__(self, fig, trajectory, world_limit=100, max_points=2000, slider=True):
+        """
+        creates the plots and the slider
+
+        Args:
+            fig (figure): figure the replay is drawn in
+            trajectory (Trajectory): recorded trajectory
+            world_limit (float): length of the x and y axis
+            max_points (int): largest amount of points of the stack plot
+            slider (bool): False to leave out the slider, e.g. when exporting a video
+
+        Attr:
+            self.index (int): frame that is shown
+            self.views (list): view of every city, the cities are the patches of the first frame
+            self.slider (Slider): chooses the frame, None without a slider
+        """
+        self.fig = fig
+        self.trajectory = trajectory
+        self.counts = summary_index(trajectory)
+        self.bands = band_counts(trajectory, self.counts)
+        self.index = 0
+
+        names = trajectory.names()
+        first = trajectory.frame(0) if len(trajectory) else {}
+        patches = int(np.max(first["patch"])) + 1 if "patch" in first else 1
+        quarantine = "quarantined" in names
+        panels = patches + quarantine + 1
+        rows = math.ceil(panels / 2)
+        if patches > 1:
+            fig.set_size_inches(10, 4 * rows)
+
+        self.views = []
+        for k in range(patches):
+            plot_humans = fig.add_subplot(rows, 2, k + 1)
+            render.hide_axes(plot_humans)
+            self.views.append(render.HumanView(plot_humans, world_limit, animated=False))
+        self.view_humans = self.views[0]
+        self.title = self.view_humans.scatter.axes.set_title("", fontsize="small")
+        self.view_quarantine = None
+        if quarantine:
+            plot_quarantine = fig.add_subplot(rows, 2, patches + 1)
+            render.hide_axes(plot_quarantine, frame=False)
+            self.view_quarantine = render.TextView(
+                plot_quarantine, animated=False, size=20, bbox=render.quarantine_box)
+        plot_stack = fig.add_subplot(rows, 2, panels)
+        render.hide_axes(plot_stack, frame=False)
+        # the same bands and legends as the scenarios
+        if "group" in names:
+            colors, labels = render.group_colors, render.group_labels
+            style = dict(loc="lower right", bbox_to_anchor=(0.1, -0.15), ncol=3, fontsize="small")
+        elif quarantine:
+            colors, labels = render.quarantine_colors, render.quarantine_labels
+            style = dict(loc="lower left", bbox_to_anchor=(-0.12, -0.30), ncol=4)
+        else:
+            colors, labels = render.sir_colors, render.sir_labels
+            style = dict(loc="lower center", bbox_to_anchor=(-0.12, -0.15), ncol=3)
+        view_stack = render.StackView(plot_stack, colors,
+                                      max(trajectory.number_of_humans, 1), animated=False)
+        render.add_legend(plot_stack, colors, labels, **style)
+
+        # the whole run is drawn once, only the cursor moves
+        time = np.asarray(trajectory.time)
+        shown = np.unique(np.linspace(0, max(len(trajectory) - 1, 0), max_points).astype(int))
+        if len(trajectory):
+            view_stack.update(time[shown], np.asarray(self.bands[shown]).T)
+        self._start = time[0] if len(time) else 0.0
+        self._width = time[-1] - time[0] if len(time) > 1 else 0.0
+        self.cursor = plot_stack.axvline(0, color="black", linewidth=1)
+
+        self.slider = None
+        if slider:
+            fig.subplots_adjust(bottom=0.2)
+            self.slider = Slider(fig.add_axes([0.15, 0.04, 0.7, 0.04]), "frame",
+                                 0, max(len(trajectory) - 1, 0), valinit=0, valstep=1)
+            self.slider.on_changed(self.show)
+        if len(trajectory):
+            self.show(0)
+
+    def show(self, index):
+        """
+        draws a frame
+
+        Args:
+            index (int): index of the frame
+
+        Returns:
+            artists (tuple): changed artists
+        """
+        self.index = int(index)
+        frame = self.trajectory.frame(self.index)
+        humans = frame_humans(frame)
+        # quarantined humans are only counted, they are not shown in the world
+        free = ~humans.quarantined
+        artists = ()
+        for k, view in enumerate(self.views):
+            artists += view.update(humans, rows=free & (humans.patch == k))
+        if self.view_quarantine is not None:
+            artists += self.view_quarantine.update(
+                "Quarantined: " + str(np.count_nonzero(humans.quarantined)))
+        time = float(self.trajectory.time[self.index])
+        position = (time - self._start) / self._width if self._width > 0 else 0.0
+        self.cursor.set_xdata([position, position])
+        suc_s, inf_s, rec_s = self.counts[self.index]
+        self.title.set_text(f"t = {time:.4g}   S {suc_s}  I {inf_s}  R {rec_s}")
+        self.fig.canvas.draw_idle()
+        return artists + (self.cursor, self.title)
+
+
+def replay(path, plot=plt, show=False, world_limit=100):
+    """
+    opens a recorded trajectory for replay
+
+    Args:
+        path (str): directory of the trajectory
+        plot: plot to show
+        show (bool): variable if graphic should be shown
+        world_limit (float): length of the x and y axis
+
+    Returns:
+        plot: plot to show
+        replay (Replay): the replay, it has to be kept for the slider to work
+    """
+    fig = plot.figure(figsize=(10, 4))
+    viewer = Replay(fig, Trajectory(path), world_limit)
+    if show:
+        plot.show()
+    return plot, viewer
+
+
+def main(argv=None):
+    """replays a trajectory from the command line"""
+    parser = argparse.ArgumentParser(description="Replays a recorded trajectory.")
+    parser.add_argument("path", help="directory of the trajectory")
+    parser.add_argument("--world-limit", type=float, default=100)
+    args = parser.parse_args(argv)
+    replay(args.path, show=True, world_limit=args.world_limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import argparse
+import os
+import numpy as np
+
+from src.checkpoint import load_checkpoint, save_checkpoint
+import src.init as init
+import src.kernels as kernels
+import src.simulation as sim
+from src.neighbours import NeighbourList
+from src.trajectory import TrajectoryWriter
+
+
+# values used for everything that is not given in the config
+default_config = {
+    "model": "basic",
+    "prob": 1.0,
+    "infection_radius": 5.0,
+    "number_of_humans": 50,
+    "temperature": 10000.0,
+    "time_step": 0.0001,
+    "world_limit": 100,
+    # extra distance of the neighbour list, tune it with the rebuild report
+    "skin": 2.0,
+    # probability of an infected human to be quarantined in a step
+    "detection_probability": 0.0,
+    # int or SeedSequence, a run is repeated exactly with the same seed
+    "seed": None,
+    # "numpy" or "numba", the current kernel backend is kept if None
+    "backend": None,
+}
+
+# values a resumed run has to share with its checkpoint
+checkpoint_keys = ("model", "prob", "infection_radius", "number_of_humans", "temperature",
+                   "time_step", "world_limit", "detection_probability")
+
+# movement models that can be run without a display
+models = {
+    "basic": "calculate_movement",
+    "randomwalk": "random_walk",
+}
+
+
+def check_checkpoint(state, config, path):
+    """
+    makes sure a checkpoint was written by run with the same config, a run
+    would otherwise continue silently with the values of the checkpoint
+
+    Args:
+        state (dict): loaded checkpoint (see checkpoint.load_checkpoint)
+        config (dict): complete config of the run
+        path (str): file of the checkpoint, used in the messages
+    """
+    saved = state["config"]
+    if saved is None or "model" not in saved or "counts" not in state["series"]:
+        raise ValueError(f"{path} was not written by run, restore it with "
+                         "checkpoint.load_checkpoint or use another checkpoint")
+    changed = [f"{key} {saved.get(key)!r} instead of {config[key]!r}"
+               for key in checkpoint_keys if saved.get(key) != config[key]]
+    if changed:
+        raise ValueError(f"{path} was written with {', '.join(changed)}, "
+                         "resume it with the same config or use another checkpoint")
+
+
+def run(config, n_steps, checkpoint=None, checkpoint_interval=0, trajectory=None, neighbours=None):
+    """
+    runs a scenario without matplotlib for a fixed number of steps. With a
+    checkpoint the state is saved every checkpoint_interval steps and a run
+    that finds the checkpoint continues from it, so an interrupted run is
+    resumed with the same config and gives the same result as an
+    uninterrupted one. A checkpoint written with another config is refused.
+
+    Args:
+        config (dict): values that influence the simulation, missing keys are taken
+            from default_config
+        n_steps (int): amount of steps to simulate
+        checkpoint (str): .npz file the run is saved to and resumed from, optional
+        checkpoint_interval (int): amount of steps between two checkpoints
+        trajectory (TrajectoryWriter): receives the humans at the start and after
+            every step, optional. A resumed run continues it at the step of the
+            checkpoint, so it has to be opened with append=True.
+        neighbours (NeighbourList): neighbour list of the run, e.g. to read its
+            rebuild report afterwards, created from the config if None
+
+    Returns:
+        result (dict): numpy arrays "time", "suceptible", "infected" and "recovered",
+            the first entry is the state before the first step
+    """
+    config = {**default_config, **config}
+    if config["model"] not in models:
+        raise ValueError(f"unknown model {config['model']!r}, choose one of {sorted(models)}")
+    n_steps = int(n_steps)
+    if config["backend"] is not None:
+        kernels.set_backend(config["backend"])
+    if neighbours is None:
+        neighbours = NeighbourList(config["skin"], config["world_limit"])
+    counts = np.zeros((n_steps + 1, 3), dtype=np.int64)
+
+    if checkpoint is not None and os.path.exists(checkpoint):
+        state = load_checkpoint(checkpoint)
+        check_checkpoint(state, config, checkpoint)
+        humans, energy, rng, first = state["humans"], state["energy"], state["rng"], state["steps"]
+        saved = state["series"]["counts"][:n_steps + 1]
+        counts[:len(saved)] = saved
+    else:
+        rng = np.random.default_rng(config["seed"])
+        humans, energy = init.init_sys(
+            config["temperature"],
+            config["prob"],
+            config["number_of_humans"],
+            world_limit=config["world_limit"],
+            infection_radius=config["infection_radius"],
+            rng=rng,
+        )
+        first = 0
+        counts[0] = humans.status_counts()
+
+    if trajectory is not None:
+        trajectory.start_at(first)
+        trajectory.record(humans)
+    for step in range(first + 1, n_steps + 1):
+        if config["model"] == "basic":
+            sim.calculate_movement(humans, config["time_step"], energy,
+                                   world_limit=config["world_limit"],
+                                   neighbours=neighbours, rng=rng)
+        else:
+            sim.random_walk(humans, config["time_step"], energy, config["temperature"],
+                            rng=rng, world_limit=config["world_limit"],
+                            neighbours=neighbours)
+        if config["detection_probability"] > 0:
+            sim.quarantine(humans, config["detection_probability"], rng)
+        counts[step] = humans.status_counts()
+        if trajectory is not None:
+            trajectory.record(humans)
+        if checkpoint is not None and checkpoint_interval and step % checkpoint_interval == 0:
+            # the trajectory has to reach the checkpoint when the run is resumed
+            if trajectory is not None:
+                trajectory.sync()
+            save_checkpoint(checkpoint, humans, energy, rng, steps=step,
+                            series={"counts": counts[:step + 1]},
+                            config={key: config[key] for key in checkpoint_keys})
+            # a resumed run starts with a new neighbour list, so does this one
+            neighbours.reset()
+
+    return {
+        "time": np.arange(n_steps + 1) * config["time_step"],
+        "suceptible": counts[:, 0],
+        "infected": counts[:, 1],
+        "recovered": counts[:, 2],
+    }
+
+
+def parse_args(argv=None):
+    """
+    reads the command line arguments of the headless runner
+
+    Args:
+        argv (list): arguments, the ones of the process if None
+
+    Returns:
+        config (dict): values that influence the simulation
+        args (Namespace): all parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Runs a virus spread scenario without a display and stores the S/I/R series.")
+    parser.add_argument("--model", choices=sorted(models), default=default_config["model"])
+    parser.add_argument("--prob", type=float, default=default_config["prob"])
+    parser.add_argument("--infection-radius", type=float, default=default_config["infection_radius"])
+    parser.add_argument("--humans", type=int, default=default_config["number_of_humans"])
+    parser.add_argument("--temperature", type=float, default=default_config["temperature"])
+    parser.add_argument("--time-step", type=float, default=default_config["time_step"])
+    parser.add_argument("--detection-probability", type=float,
+                        default=default_config["detection_probability"],
+                        help="probability of an infected human to be quarantined in a step")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--skin", type=float, default=default_config["skin"],
+                        help="extra distance of the neighbour list, see the rebuild report")
+    parser.add_argument("--backend", choices=["numpy", "numba"], default=None,
+                        help="implementation of the pair kernels, numba if installed by default")
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--out", help="stores the series in this .npz file")
+    parser.add_argument("--checkpoint", help="saves the run to this .npz file and resumes from it")
+    parser.add_argument("--checkpoint-interval", type=int, default=1000,
+                        help="amount of steps between two checkpoints")
+    parser.add_argument("--trajectory", metavar="DIR",
+                        help="writes the positions and statuses to this directory")
+    parser.add_argument("--stride", type=int, default=1,
+                        help="amount of steps between two frames of the trajectory")
+    parser.add_argument("--codec", choices=["delta"], default=None,
+                        help="stores the trajectory as fixed point differences and packed statuses")
+    parser.add_argument("--compress", action="store_true",
+                        help="compresses every chunk of an encoded trajectory with zlib")
+    args = parser.parse_args(argv)
+    config = {
+        "model": args.model,
+        "prob": args.prob,
+        "infection_radius": args.infection_radius,
+        "number_of_humans": args.humans,
+        "temperature": args.temperature,
+        "time_step": args.time_step,
+        "detection_probability": args.detection_probability,
+        "seed": args.seed,
+        "skin": args.skin,
+        "backend": args.backend,
+    }
+    return config, args
+
+
+def main(argv=None):
+    """runs the headless runner from the command line"""
+    config, args = parse_args(argv)
+    neighbours = NeighbourList(config["skin"], default_config["world_limit"])
+    if args.trajectory:
+        with TrajectoryWriter(args.trajectory, config["number_of_humans"], stride=args.stride,
+                              time_step=config["time_step"], codec=args.codec,
+                              compress=args.compress,
+                              append=args.checkpoint is not None) as trajectory:
+            result = run(config, args.steps, args.checkpoint, args.checkpoint_interval,
+                         trajectory, neighbours)
+    else:
+        result = run(config, args.steps, args.checkpoint, args.checkpoint_interval,
+                     neighbours=neighbours)
+    if args.out:
+        np.savez(args.out, **result)
+    print(f"S={result['suceptible'][-1]} I={result['infected'][-1]} R={result['recovered'][-1]} "
+          f"after {args.steps} steps, peak infected {np.max(result['infected'])}")
+    print(neighbours.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,301 +1,417 @@
+import os
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.patches import Rectangle
-import math
-import time
-import random
 import numpy as np
 
-from src.human import Status
+from src.checkpoint import load_checkpoint, save_checkpoint
+from src.human import Group, Status
 import src.init as init
 import src.simulation as sim
+import src.render as render
+from src.neighbours import NeighbourList
+from src.pacing import FramePacer
+from src.history import History
+from src.metapopulation import Metapopulation
 
 
 # global variables that will influence the simulation, including default values
 world_limit = 100
 time_step = 0.0001
 plot_refresh_rate = 20
+# real time in seconds that may be spent on physics steps per frame
+frame_budget = 0.015
+# extra distance of the neighbour lists, the rebuild rate is shown next to the speed
+skin = 2.0
+# amount of steps between two saves of a scenario that has a checkpoint
+checkpoint_interval = 1000
 
 
-# global lists the simulation will work with
-# lists used by almost all scenarios
-global_humans = []
-inf = []
-suc = []
-rec = []
-steps = []
-# lists used by the cities scenario
-humans_city1 = []
-humans_city2 = []
-humans_city3 = []
-# lists used by the vulnerable scenario
-inf_mask = []
-suc_mask = []
-rec_mask = []
-inf_vulnerable = []
-suc_vulnerable = []
-rec_vulnerable = []
-# lists used by the quarantine scenario
-quarantine_humans = []
-qua = []
+def record_counts(humans, time, history):
+    """
+    appends the amount of humans in each health state to the history
+
+    Args:
+        humans (Population): humans that are counted
+        time (float): time of the entry
+        history (History): history of the infected, recovered and suceptible humans
+    """
+    suc_s, inf_s, rec_s = humans.status_counts()
+    history.append(time, (inf_s, rec_s, suc_s))
+
+
+def record_step(trajectory, humans):
+    """
+    passes the humans to the trajectory of a scenario
+
+    Args:
+        trajectory (TrajectoryWriter): writer of the trajectory, nothing is recorded if None
+        humans (Population): population containing all humans
+    """
+    if trajectory is not None:
+        trajectory.record(humans)
+
+
+def scenario_inputs(checkpoint, name, ask):
+    """
+    asks for the inputs of a scenario, a scenario that is resumed from its
+    checkpoint takes the inputs it was started with instead
+
+    Args:
+        checkpoint (str): .npz file of the scenario, nothing is resumed if None or missing
+        name (str): name of the scenario, e.g. "basic"
+        ask (function): asks for the inputs
+
+    Returns:
+        inputs (tuple): values of the inputs
+        state (dict): saved state (see checkpoint.load_checkpoint), None for a new scenario
+    """
+    if checkpoint is None or not os.path.exists(checkpoint):
+        return tuple(ask()), None
+    state = load_checkpoint(checkpoint)
+    if (state["config"] or {}).get("scenario") != name:
+        raise ValueError(f"{checkpoint} is not a checkpoint of the {name} scenario")
+    return tuple(state["config"]["inputs"]), state
+
+
+def keep_checkpoint(fig, pacer, checkpoint, save, record):
+    """
+    saves a scenario every checkpoint_interval steps and when its window is closed
+
+    Args:
+        fig (figure): figure of the scenario
+        pacer (FramePacer): counts the steps
+        checkpoint (str): .npz file of the scenario, nothing is saved if None
+        save (function): writes the checkpoint
+        record (function): records the state after the steps of a frame
+
+    Returns:
+        record (function): records the state and saves it when it is time
+    """
+    if checkpoint is None:
+        return record
+    saved = pacer.steps
+
+    def record_and_save():
+        nonlocal saved
+        record()
+        if pacer.steps - saved >= checkpoint_interval:
+            save()
+            saved = pacer.steps
+
+    fig.canvas.mpl_connect("close_event", lambda event: save())
+    return record_and_save
+
+
+def draw_history(view, history):
+    """
+    draws the mean of every bucket of a history as stack plot
+
+    Args:
+        view (StackView): stack plot
+        history (History): recorded curves (from bottom to top)
+
+    Returns:
+        artists (tuple): changed artists
+    """
+    time, values = history.curves()
+    return view.update(time, values)
 
 
 # standard scenario
-def scenario_basic(plot=plt, show=False):
+def scenario_basic(plot=plt, show=False, seed=None, trajectory=None, checkpoint=None):
     """
     creates the basic scenario
 
     Args:
         plot: plot to show
         show (bool): variable if graphic should be shown
+        seed (int): seed of the random numbers, every run differs if None
+        trajectory (TrajectoryWriter): receives the humans after every step, optional
+        checkpoint (str): .npz file the scenario is saved to and resumed from, optional
 
     Returns:
         plot: plot to show
-        ani_humans: animation of the humans
-        ani_stack: animation of the stackplot
+        ani: animation of the humans and the stackplot
     """
     # variables that influence the simulation
-    prob, infection_radius, number_of_humans, temperature = ask_for_input()
+    inputs, state = scenario_inputs(checkpoint, "basic", ask_for_input)
+    prob, infection_radius, number_of_humans, temperature = inputs
 
     # plot setup
     fig = plot.figure(figsize=(10, 4))
 
     # humans
     plot_humans = fig.add_subplot(1, 2, 1)
-    plot_humans.axes.xaxis.set_visible(False)
-    plot_humans.axes.yaxis.set_visible(False)
+    render.hide_axes(plot_humans)
 
     # stackplot
     plot_stack = fig.add_subplot(1, 2, 2)
-    plot_stack.set_frame_on(False)
-    plot_stack.axes.xaxis.set_visible(False)
-    plot_stack.axes.yaxis.set_visible(False)
+    render.hide_axes(plot_stack, frame=False)
 
     # setting up the list of humans
-    global_humans, energy = init.init_sys(
-        temperature,
-        prob,
-        number_of_humans,
-        infection_radius=infection_radius,
-        world_limit=world_limit,
-    )
-
-    inf = []
-    suc = []
-    rec = []
-    steps = []
-
-    # animation of the movement of humans
-    ani_humans = animation.FuncAnimation(
-        fig,
-        scenario_basic_animation,
-        fargs=[global_humans, plot_humans, time_step, energy],
-        interval=plot_refresh_rate,
-    )
-
-    # animation of the stackplot
-    ani_stack = animation.FuncAnimation(
-        fig,
-        stack_animation,
-        fargs=[global_humans, plot_stack, time_step,
-               inf, rec, suc, steps, number_of_humans],
-        interval=plot_refresh_rate)
+    if state is None:
+        rng = np.random.default_rng(seed)
+        humans, energy = init.init_sys(
+            temperature,
+            prob,
+            number_of_humans,
+            infection_radius=infection_radius,
+            world_limit=world_limit,
+            rng=rng,
+        )
+        history = History(["inf", "rec", "suc"])
+        start = 0
+    else:
+        humans, energy, rng, history = state["humans"], state["energy"], state["rng"], state["history"]
+        start = state["steps"]
+    neighbours = NeighbourList(skin, world_limit)
+    pacer = FramePacer(frame_budget)
+
+    view_humans = render.HumanView(plot_humans, world_limit, title=True)
+    view_stack = render.StackView(plot_stack, render.sir_colors, number_of_humans)
+    render.add_legend(plot_stack, render.sir_colors, render.sir_labels,
+                      loc="lower center", bbox_to_anchor=(-0.12, -0.15), ncol=3)
+
+    def step():
+        sim.calculate_movement(humans, time_step, energy, neighbours=neighbours, rng=rng)
+        record_step(trajectory, humans)
+
+    def record():
+        record_counts(humans, time_step*(start + pacer.steps), history)
+
+    def draw():
+        return (view_humans.update(humans, pacer, neighbours=neighbours)
+                + draw_history(view_stack, history))
+
+    def save():
+        save_checkpoint(checkpoint, humans, energy, rng, history, start + pacer.steps,
+                        config={"scenario": "basic", "inputs": inputs})
+
+    record_step(trajectory, humans)
+    record = keep_checkpoint(fig, pacer, checkpoint, save, record)
+    ani = render.animate(fig, pacer, step, record, draw, plot_refresh_rate)
 
     if show:
         plot.show()
-    return plot, ani_humans, ani_stack
+    return plot, ani
 
 
 # scenario randomwalk
-def scenario_randomwalk(plot=plt, show=False):
+def scenario_randomwalk(plot=plt, show=False, seed=None, trajectory=None, checkpoint=None):
     """
     creates the random walk scenario
 
     Args:
         plot: plot to show
         show (bool): variable if graphic should be shown
+        seed (int): seed of the random numbers, every run differs if None
+        trajectory (TrajectoryWriter): receives the humans after every step, optional
+        checkpoint (str): .npz file the scenario is saved to and resumed from, optional
 
     Returns:
         plot: plot to show
-        ani_humans: animation of the humans
-        ani_stack: animation of the stackplot
+        ani: animation of the humans and the stackplot
     """
     # variables that influence the simulation
-    prob, infection_radius, number_of_humans, temperature = ask_for_input()
+    inputs, state = scenario_inputs(checkpoint, "randomwalk", ask_for_input)
+    prob, infection_radius, number_of_humans, temperature = inputs
 
     # plot setup
     fig = plot.figure(figsize=(10, 4))
 
     # humans
     plot_humans = fig.add_subplot(1, 2, 1)
-    plot_humans.axes.xaxis.set_visible(False)
-    plot_humans.axes.yaxis.set_visible(False)
+    render.hide_axes(plot_humans)
 
     # stackplot
     plot_stack = fig.add_subplot(1, 2, 2)
-    plot_stack.set_frame_on(False)
-    plot_stack.axes.xaxis.set_visible(False)
-    plot_stack.axes.yaxis.set_visible(False)
-
-    global_humans, energy = init.init_sys(
-        temperature,
-        prob,
-        number_of_humans,
-        infection_radius=infection_radius,
-        world_limit=world_limit,
-    )
-
-    inf = []
-    suc = []
-    rec = []
-    steps = []
-
-    # animation of the movement of humans
-    ani_humans = animation.FuncAnimation(
-        fig,
-        scenario_random_animation,
-        fargs=[global_humans, plot_humans, time_step, energy, temperature],
-        interval=plot_refresh_rate,
-    )
-
-    # animation of the stackplot
-    ani_stack = animation.FuncAnimation(
-        fig,
-        stack_animation,
-        fargs=[global_humans, plot_stack, time_step,
-               inf, rec, suc, steps, number_of_humans],
-        interval=plot_refresh_rate)
+    render.hide_axes(plot_stack, frame=False)
+
+    if state is None:
+        rng = np.random.default_rng(seed)
+        humans, energy = init.init_sys(
+            temperature,
+            prob,
+            number_of_humans,
+            infection_radius=infection_radius,
+            world_limit=world_limit,
+            rng=rng,
+        )
+        history = History(["inf", "rec", "suc"])
+        start = 0
+    else:
+        humans, energy, rng, history = state["humans"], state["energy"], state["rng"], state["history"]
+        start = state["steps"]
+    neighbours = NeighbourList(skin, world_limit)
+    pacer = FramePacer(frame_budget)
+
+    view_humans = render.HumanView(plot_humans, world_limit, title=True)
+    view_stack = render.StackView(plot_stack, render.sir_colors, number_of_humans)
+    render.add_legend(plot_stack, render.sir_colors, render.sir_labels,
+                      loc="lower center", bbox_to_anchor=(-0.12, -0.15), ncol=3)
+
+    def step():
+        sim.random_walk(humans, time_step, energy, temperature, rng=rng, neighbours=neighbours)
+        record_step(trajectory, humans)
+
+    def record():
+        record_counts(humans, time_step*(start + pacer.steps), history)
+
+    def draw():
+        return (view_humans.update(humans, pacer, neighbours=neighbours)
+                + draw_history(view_stack, history))
+
+    def save():
+        save_checkpoint(checkpoint, humans, energy, rng, history, start + pacer.steps,
+                        config={"scenario": "randomwalk", "inputs": inputs})
+
+    record_step(trajectory, humans)
+    record = keep_checkpoint(fig, pacer, checkpoint, save, record)
+    ani = render.animate(fig, pacer, step, record, draw, plot_refresh_rate)
 
     if show:
         plot.show()
-    return plot, ani_humans, ani_stack
+    return plot, ani
 
 
 # scenario cities
-def scenario_cities(plot=plt, show=False):
+def scenario_cities(plot=plt, show=False, seed=None, trajectory=None, checkpoint=None):
     """
-    creates scenario with three cities
+    creates scenario with three cities that are stored as patches of a single
+    metapopulation, a single animation steps all of them
 
     Args:
         plot: plot to show
         show (bool): variable if graphic should be shown
+        seed (int): seed of the random numbers, every run differs if None
+        trajectory (TrajectoryWriter): receives the humans after every step, optional
+        checkpoint (str): .npz file the scenario is saved to and resumed from, optional
 
     Returns:
         plot: plot to show
-        ani_city1: animation of city number 1
-        ani_city2: animation of city number 2
-        ani_city3: animation of city number 3
-        ani_stack: animation of the stackplot
+        ani: animation of the cities and the stackplot
     """
     # variables that influence the simulation
-    prob, infection_radius, number_of_humans, temperature = ask_for_input()
+    inputs, state = scenario_inputs(checkpoint, "cities", ask_for_input)
+    prob, infection_radius, number_of_humans, temperature = inputs
 
     # plot setup
     fig = plot.figure(figsize=(10, 8))
 
     # city1
     plot_city1 = fig.add_subplot(2, 2, 1)
-    plot_city1.axes.xaxis.set_visible(False)
-    plot_city1.axes.yaxis.set_visible(False)
+    render.hide_axes(plot_city1)
 
     # city2
     plot_city2 = fig.add_subplot(2, 2, 2)
-    plot_city2.axes.xaxis.set_visible(False)
-    plot_city2.axes.yaxis.set_visible(False)
+    render.hide_axes(plot_city2)
 
     # city3
     plot_city3 = fig.add_subplot(2, 2, 3)
-    plot_city3.axes.xaxis.set_visible(False)
-    plot_city3.axes.yaxis.set_visible(False)
+    render.hide_axes(plot_city3)
 
     # stackplot
     plot_stack1 = fig.add_subplot(2, 2, 4)
-    plot_stack1.set_frame_on(False)
-    plot_stack1.axes.xaxis.set_visible(False)
-    plot_stack1.axes.yaxis.set_visible(False)
-
-    humans_city1, energy1 = init.init_sys(
-        temperature,
-        prob,
-        number_of_humans,
-        infection_radius=infection_radius,
-        world_limit=world_limit,
-    )
-    humans_city2, energy2 = init.init_sys(
-        temperature,
-        prob,
-        number_of_humans,
-        infection_radius=infection_radius,
-        world_limit=world_limit,
-    )
-    humans_city3, energy3 = init.init_sys(
-        temperature,
-        prob,
-        number_of_humans,
-        infection_radius=infection_radius,
-        world_limit=world_limit,
-    )
-    # setting all humans in city 2 and 3 to succeptible
-    for h in humans_city2:
-        h.status = Status.SUCEPTIBLE
-    for h in humans_city3:
-        h.status = Status.SUCEPTIBLE
-
-    # setup for city1
-    ani_city1 = animation.FuncAnimation(
-        fig,
-        scenario_cities_animation,
-        fargs=[humans_city1, humans_city2, humans_city3,
-               plot_city1, time_step, energy1, steps],
-        interval=plot_refresh_rate,
-    )
-
-    # setup for city2
-    ani_city2 = animation.FuncAnimation(
-        fig,
-        scenario_cities_animation,
-        fargs=[humans_city2, humans_city1, humans_city3,
-               plot_city2, time_step, energy2, steps],
-        interval=plot_refresh_rate,
-    )
-
-    # setup for city3
-    ani_city3 = animation.FuncAnimation(
-        fig,
-        scenario_cities_animation,
-        fargs=[humans_city3, humans_city2, humans_city1,
-               plot_city3, time_step, energy3, steps],
-        interval=plot_refresh_rate,
-    )
-
-    # setup for stackplot
-    ani_stack = animation.FuncAnimation(
-        fig,
-        stack_animation_cities,
-        fargs=[humans_city1, humans_city3, humans_city2,
-               plot_stack1, time_step, inf, rec, suc, steps],
-        interval=plot_refresh_rate)
+    render.hide_axes(plot_stack1, frame=False)
+
+    # every 25 steps a human of each city moves to each of the other cities on average
+    migration = np.full((3, 3), 1 / max(number_of_humans, 2))
+    if state is None:
+        rng = np.random.default_rng(seed)
+        humans_city1, energy1 = init.init_sys(
+            temperature,
+            prob,
+            number_of_humans,
+            infection_radius=infection_radius,
+            world_limit=world_limit,
+            rng=rng,
+        )
+        humans_city2, energy2 = init.init_sys(
+            temperature,
+            prob,
+            number_of_humans,
+            infection_radius=infection_radius,
+            world_limit=world_limit,
+            rng=rng,
+        )
+        humans_city3, energy3 = init.init_sys(
+            temperature,
+            prob,
+            number_of_humans,
+            infection_radius=infection_radius,
+            world_limit=world_limit,
+            rng=rng,
+        )
+        # setting all humans in city 2 and 3 to succeptible
+        humans_city2.set_status(slice(None), Status.SUCEPTIBLE.value)
+        humans_city3.set_status(slice(None), Status.SUCEPTIBLE.value)
+
+        cities = Metapopulation.from_patches(
+            [humans_city1, humans_city2, humans_city3], [energy1, energy2, energy3],
+            migration, migration_interval=25, world_limit=world_limit, skin=skin)
+        history = History(["inf", "rec", "suc"])
+        start = 0
+    else:
+        # the patch column keeps the city of every human
+        cities = Metapopulation(state["humans"], state["energy"], migration,
+                                migration_interval=25, world_limit=world_limit, skin=skin)
+        rng, history = state["rng"], state["history"]
+        start = cities.steps = state["steps"]
+        cities.migrations = int(state["series"]["migrations"])
+    pacer = FramePacer(frame_budget)
+
+    views = [render.HumanView(plot_city1, world_limit, title=True),
+             render.HumanView(plot_city2, world_limit),
+             render.HumanView(plot_city3, world_limit)]
+    view_stack = render.StackView(plot_stack1, render.sir_colors, 3 * number_of_humans)
+    render.add_legend(plot_stack1, render.sir_colors, render.sir_labels,
+                      loc="lower center", bbox_to_anchor=(-0.12, -0.15), ncol=3)
+
+    def step():
+        # all cities in one pass, humans move from city to city every 25 steps
+        cities.step(time_step, rng)
+        record_step(trajectory, cities.humans)
+
+    def record():
+        record_counts(cities.humans, time_step*(start + pacer.steps), history)
+
+    def draw():
+        artists = ()
+        for k, view in enumerate(views):
+            artists += view.update(cities.humans, pacer, cities.patch_rows(k), cities.neighbours)
+        return artists + draw_history(view_stack, history)
+
+    def save():
+        save_checkpoint(checkpoint, cities.humans, cities.energies, rng, history, cities.steps,
+                        {"migrations": cities.migrations},
+                        config={"scenario": "cities", "inputs": inputs})
+
+    record_step(trajectory, cities.humans)
+    record = keep_checkpoint(fig, pacer, checkpoint, save, record)
+    ani = render.animate(fig, pacer, step, record, draw, plot_refresh_rate)
 
     if show:
         plot.show()
-    return plot, ani_city1, ani_city2, ani_city3, ani_stack
+    return plot, ani
 
 # scenario vulnerable
-def scenario_mask_vulnerable(plot=plt, show=False):
+def scenario_mask_vulnerable(plot=plt, show=False, seed=None, trajectory=None, checkpoint=None):
     """
     creates scenario with different groups that are more or less vulnerable
 
     Args:
         plot: plot to show
         show (bool): variable if graphic should be shown
+        seed (int): seed of the random numbers, every run differs if None
+        trajectory (TrajectoryWriter): receives the humans after every step, optional
+        checkpoint (str): .npz file the scenario is saved to and resumed from, optional
 
     Returns:
         plot: plot to show
-        ani_humans: animation of the humans
-        ani_stack: animation of the stackplot
+        ani: animation of the humans and the stackplot
     """
     # variables that influence the simulation
-    prob, infection_radius, number_of_humans, temperature, number_vulnerable_humans, number_humans_with_mask = ask_for_different_input()
+    inputs, state = scenario_inputs(checkpoint, "mask_vulnerable", ask_for_different_input)
+    prob, infection_radius, number_of_humans, temperature, number_vulnerable_humans, number_humans_with_mask = inputs
     number_standard_humans = number_of_humans - \
         number_vulnerable_humans - number_humans_with_mask
 
@@ -304,85 +420,92 @@ def scenario_mask_vulnerable(plot=plt, show=False):
 
     # for healthy and vulnerable humans
     plot_humans = fig.add_subplot(1, 2, 1)
-    plot_humans.axes.xaxis.set_visible(False)
-    plot_humans.axes.yaxis.set_visible(False)
+    render.hide_axes(plot_humans)
 
     # for stackplot
     plot_stack = fig.add_subplot(1, 2, 2)
-    plot_stack.set_frame_on(False)
-    plot_stack.axes.xaxis.set_visible(False)
-    plot_stack.axes.yaxis.set_visible(False)
+    render.hide_axes(plot_stack, frame=False)
 
     # setting up the list of humans
-    global_humans, energy = init.init_sys(
-        temperature,
-        prob,
-        number_of_humans,
-        infection_radius=infection_radius,
-        world_limit=world_limit,
-    )
-
-    global_humans = init.make_vulnerable(
-        global_humans, number_of_humans, number_vulnerable_humans, infection_radius, prob)
-    global_humans = init.wear_mask(
-        global_humans, number_of_humans, number_humans_with_mask, infection_radius, prob)
-
-    inf = []
-    suc = []
-    rec = []
-
-    inf_mask = []
-    suc_mask = []
-    rec_mask = []
-
-    inf_vulnerable = []
-    suc_vulnerable = []
-    rec_vulnerable = []
-
-    steps = []
-
-    # animation of the movement of humans
-    ani_humans = animation.FuncAnimation(
-        fig,
-        scenario_basic_animation,
-        fargs=[global_humans, plot_humans, time_step, energy],
-        interval=plot_refresh_rate,
-    )
-
-    # animation of the stackplot
-    ani_stack = animation.FuncAnimation(
-        fig,
-        stack_animation_mask_vulnerable,
-        fargs=[
-            global_humans,
-            plot_stack,
-            time_step,
-            inf_vulnerable, inf, inf_mask,
-            rec_vulnerable, rec, rec_mask,
-            suc_vulnerable, suc, suc_mask,
-            steps,
+    if state is None:
+        rng = np.random.default_rng(seed)
+        humans, energy = init.init_sys(
+            temperature,
+            prob,
             number_of_humans,
-            infection_radius],
-        interval=plot_refresh_rate)
+            infection_radius=infection_radius,
+            world_limit=world_limit,
+            rng=rng,
+        )
+
+        humans = init.make_vulnerable(
+            humans, number_of_humans, number_vulnerable_humans, infection_radius, prob, rng)
+        humans = init.wear_mask(
+            humans, number_of_humans, number_humans_with_mask, infection_radius, prob, rng)
+        history = History([
+            "inf_vulnerable", "inf", "inf_mask",
+            "rec_vulnerable", "rec", "rec_mask",
+            "suc_vulnerable", "suc", "suc_mask"])
+        start = 0
+    else:
+        humans, energy, rng, history = state["humans"], state["energy"], state["rng"], state["history"]
+        start = state["steps"]
+    neighbours = NeighbourList(skin, world_limit)
+    pacer = FramePacer(frame_budget)
+
+    view_humans = render.HumanView(plot_humans, world_limit, title=True)
+    view_stack = render.StackView(plot_stack, render.group_colors, number_of_humans)
+    render.add_legend(plot_stack, render.group_colors, render.group_labels,
+                      loc="lower right", bbox_to_anchor=(0.1, -0.15), ncol=3, fontsize='small')
+
+    def step():
+        sim.calculate_movement(humans, time_step, energy, neighbours=neighbours, rng=rng)
+        record_step(trajectory, humans)
+
+    def record():
+        # amount of different states in every group
+        counts = humans.counts
+        suc_s, inf_s, rec_s = counts[Group.STANDARD.value]
+        suc_mask_s, inf_mask_s, rec_mask_s = counts[Group.MASK.value]
+        suc_vulnerable_s, inf_vulnerable_s, rec_vulnerable_s = counts[Group.VULNERABLE.value]
+
+        history.append(time_step*(start + pacer.steps), (
+            inf_vulnerable_s, inf_s, inf_mask_s,
+            rec_vulnerable_s, rec_s, rec_mask_s,
+            suc_vulnerable_s, suc_s, suc_mask_s))
+
+    def draw():
+        return (view_humans.update(humans, pacer, neighbours=neighbours)
+                + draw_history(view_stack, history))
+
+    def save():
+        save_checkpoint(checkpoint, humans, energy, rng, history, start + pacer.steps,
+                        config={"scenario": "mask_vulnerable", "inputs": inputs})
+
+    record_step(trajectory, humans)
+    record = keep_checkpoint(fig, pacer, checkpoint, save, record)
+    ani = render.animate(fig, pacer, step, record, draw, plot_refresh_rate)
 
     if show:
         plot.show()
-    return plot, ani_humans, ani_stack
+    return plot, ani
 
 
 # scenario quarantine
-def scenario_quarantine(plot=plt, show=False):
+def scenario_quarantine(plot=plt, show=False, seed=None, trajectory=None, checkpoint=None):
     """
     creates scenario where infected humans get quarantined
 
     Args:
         plot: plot to show
         show (bool): variable if graphic should be shown
+        seed (int): seed of the random numbers, every run differs if None
+        trajectory (TrajectoryWriter): receives the humans after every step, optional
+        checkpoint (str): .npz file the scenario is saved to and resumed from, optional
 
     Returns:
         plot: plot to show
-        ani_humans: animation of the humans
-        ani_stack: animation of the stackplot
+        ani: animation of the humans, the quarantine and the stackplot
     """
     # variables that influence the simulation
     world_limit = 100
@@ -393,464 +516,77 @@ def scenario_quarantine(plot=plt, show=False):
     number_of_humans = 50
     temperature = 10000
     #prob, number_of_humans, temperature = ask_for_input()
-    detection_probability = ask_for_even_more_input() * time_step
+    inputs, state = scenario_inputs(checkpoint, "quarantine", lambda: (ask_for_even_more_input(),))
+    detection_probability = inputs[0] * time_step
 
     # plot setup
     fig = plot.figure(figsize=(10, 4))
 
     # for humans
     plot_humans = fig.add_subplot(2, 2, 1)
-    plot_humans.axes.xaxis.set_visible(False)
-    plot_humans.axes.yaxis.set_visible(False)
+    render.hide_axes(plot_humans)
 
     # for quarantine
     plot_quarantine = fig.add_subplot(2, 2, 2)
-    plot_quarantine.set_frame_on(False)
-    plot_quarantine.axes.xaxis.set_visible(False)
-    plot_quarantine.axes.yaxis.set_visible(False)
+    render.hide_axes(plot_quarantine, frame=False)
 
     # for stackplot
     plot_stack = fig.add_subplot(2, 2, 3)
-    plot_stack.set_frame_on(False)
-    plot_stack.axes.xaxis.set_visible(False)
-    plot_stack.axes.yaxis.set_visible(False)
+    render.hide_axes(plot_stack, frame=False)
 
     # setting up the list of humans
-    global_humans, energy = init.init_sys(
-        temperature,
-        prob,
-        number_of_humans,
-        infection_radius=infection_radius,
-        world_limit=world_limit,
-    )
-
-    inf = []
-    suc = []
-    rec = []
-    steps = []
-
-    # animation of the movement of humans
-    ani_humans = animation.FuncAnimation(
-        fig,
-        scenario_basic_animation,
-        fargs=[global_humans, plot_humans, time_step, energy],
-        interval=plot_refresh_rate,
-    )
-
-    # animation for quarantine number
-    ani_quarantine = animation.FuncAnimation(
-        fig,
-        quarantine_animation,
-        fargs=[global_humans, quarantine_humans,
-               detection_probability, plot_quarantine],
-        interval=plot_refresh_rate
-    )
-
-    # animation of the stackplot
-    ani_stack = animation.FuncAnimation(
-        fig,
-        stack_animation_quarantine,
-        fargs=[global_humans, quarantine_humans, plot_stack,
-               time_step, inf, rec, suc, steps, number_of_humans],
-        interval=plot_refresh_rate)
+    if state is None:
+        rng = np.random.default_rng(seed)
+        humans, energy = init.init_sys(
+            temperature,
+            prob,
+            number_of_humans,
+            infection_radius=infection_radius,
+            world_limit=world_limit,
+            rng=rng,
+        )
+        history = History(["inf", "qua", "rec", "suc"])
+        start = 0
+    else:
+        humans, energy, rng, history = state["humans"], state["energy"], state["rng"], state["history"]
+        start = state["steps"]
+    neighbours = NeighbourList(skin, world_limit)
+    pacer = FramePacer(frame_budget)
+
+    view_humans = render.HumanView(plot_humans, world_limit, title=True)
+    view_quarantine = render.TextView(plot_quarantine, size=20, bbox=render.quarantine_box)
+    view_stack = render.StackView(plot_stack, render.quarantine_colors, number_of_humans)
+    render.add_legend(plot_stack, render.quarantine_colors, render.quarantine_labels,
+                      loc="lower left", bbox_to_anchor=(-0.12, -0.30), ncol=4)
+
+    def step():
+        sim.calculate_movement(humans, time_step, energy, neighbours=neighbours, rng=rng)
+        sim.quarantine(humans, detection_probability, rng)
+        record_step(trajectory, humans)
+
+    def record():
+        suc_s, inf_s, rec_s = humans.status_counts()
+        qua_s = np.count_nonzero(humans.quarantined)
+        history.append(time_step*(start + pacer.steps), (inf_s - qua_s, qua_s, rec_s, suc_s))
+
+    def draw():
+        # quarantined humans are only counted, they are not shown in the world
+        return (view_humans.update(humans, pacer, ~humans.quarantined, neighbours)
+                + view_quarantine.update(
+                    "Quarantined: " + str(np.count_nonzero(humans.quarantined)))
+                + draw_history(view_stack, history))
+
+    def save():
+        save_checkpoint(checkpoint, humans, energy, rng, history, start + pacer.steps,
+                        config={"scenario": "quarantine", "inputs": inputs})
+
+    record_step(trajectory, humans)
+    record = keep_checkpoint(fig, pacer, checkpoint, save, record)
+    ani = render.animate(fig, pacer, step, record, draw, plot_refresh_rate)
 
     if show:
         plot.show()
-    return plot, ani_humans, ani_stack, ani_quarantine
-
-
-# animations
-def scenario_basic_animation(i, humans, subplot, time_step, energy):
-    """
-    updates human every timestep
-
-    Args:
-        humans (list): list of all humans
-        subplot (plot): plot that gets animated
-        time_step (float): timestep in which movement is calculated
-        energy (float): amount of movement
-    """
-    new_energy = 0
-    xs = []
-    ys = []
-    colors = []
-
-    # set colors
-    for h in humans:
-        xs.append(float(h._x))
-        ys.append(float(h._y))
-        colors.append(h.color)
-
-    subplot.clear()
-    subplot.scatter(xs, ys, s=25, c=colors)
-    subplot.set_ylim(0, 100)
-    subplot.set_xlim(0, 100)
-    global_humans = sim.calculate_movement(humans, time_step, energy)
-
-
-def scenario_random_animation(i, humans, subplot, time_step, energy, temperature):
-    """
-    updates human every timestep
-
-    Args:
-        humans (list): list of all humans
-        subplot (plot): plot that gets animated
-        time_step (float): timestep in which movement is calculated
-        energy (float): amount of movement
-        temperature (float) influences speed of the humans
-    """
-    new_energy = 0
-    xs = []
-    ys = []
-    colors = []
-
-    for h in humans:
-        xs.append(float(h._x))
-        ys.append(float(h._y))
-        colors.append(h.color)
-
-    subplot.clear()
-    subplot.scatter(xs, ys, s=25, c=colors)
-    subplot.set_ylim(0, 100)
-    subplot.set_xlim(0, 100)
-    global_humans = sim.random_walk(humans, time_step, energy, temperature)
-
-
-def scenario_cities_animation(i, humans, others1, others2, subplot, time_step, energy, steps):
-    """
-    updates the hmans everytimestep and moves every few steps humans from city to city
-
-    Args:
-        humans (list): list of all humans in the animated city
-        others1 (list): list of all humans in the one of the other two cities
-        others2 (list): list of all humans in the one of the other two cities
-        subplot (plot): plot that gets animated
-        time_step (float): timestep in which movement is calculated
-        energy (float): amount of movement
-        temperature (float): influences speed of the humans
-        steps (list): list containing all time_steps from the past
-    """
-    new_energy = 0
-    xs = []
-    ys = []
-    colors = []
-
-    for h in humans:
-        xs.append(float(h._x))
-        ys.append(float(h._y))
-        colors.append(h.color)
-
-    subplot.clear()
-    subplot.scatter(xs, ys, s=25, c=colors)
-    subplot.set_ylim(0, 100)
-    subplot.set_xlim(0, 100)
-    global_humans = sim.calculate_movement(humans, time_step, energy)
-
-    # Particles moving from city to city
-    if len(steps) % 25 == False and len(steps) != 0:
-        random_number1 = random.randint(0, len(humans)-1)
-        random_number2 = random.randint(0, len(humans)-1)
-        while random_number1 == random_number2:
-            random_number2 = random.randint(0, len(humans)-1)
-        if random_number1 != random_number2:
-            others1.append(humans[random_number1])
-            others2.append(humans[random_number2])
-            if random_number1 > random_number2:
-                del humans[random_number1]
-                del humans[random_number2]
-            if random_number2 > random_number1:
-                del humans[random_number2]
-                del humans[random_number1]
-
-
-def quarantine_animation(i, humans, quarantined, detection_probability, plot):
-    """
-    updates human every timestep
-
-    Args:
-        humans (list): list of all humans
-        quarantined (list): ist of quarantined humans
-        plot (plot): plot that gets animated
-    """
-    for h in humans:
-        if h.is_infected() and np.random.rand() < detection_probability:
-            humans.remove(h)
-            quarantined.append(h)
-
-    for q in quarantined:
-      # update only the recovery for people in quarantine
-        q.update(q.location, q.velocity)
-        if q.is_recovered():
-            quarantined.remove(q)
-            humans.append(q)
-
-    global_humans = humans
-    quarantine_humans = quarantined
-
-    plot.clear()
-    plot.text(0, 0.5, "Quarantined: " + str(len(quarantined)), size=20,
-              bbox=dict(boxstyle="square", ec=(0.9, 0.68, 0.12), fc=(1., 0.78, 0.22)))
-
-
-def stack_animation_cities(i, humans1, humans2, humans3, test, time_step, inf, rec, suc, steps):
-    """
-    updates the stackplot every timestep
-
-    Args:
-        humans1 (list): list of all humans in city number 1
-        humans2 (list): list of all humans in city number 2
-        humans3 (list): list of all humans in city number 3
-        test: plot that gets animated
-        time_step (float): timestep in which movement is calculated
-        inf (list): list containing the amount of infected humans at all past timestep
-        rec (list): list containing the amount of recovered humans at all past timestep
-        suc (list): list containing the amount of suceptible humans at all past timestep
-        steps (list): list containing all time_steps from the past
-    """
-    global_humans = humans1+humans2+humans3
-    step_counter = len(suc)
-    steps.append(time_step*step_counter)
-    suc_s = 0
-    inf_s = 0
-    rec_s = 0
-    for h in global_humans:
-        if h.status == Status.SUCEPTIBLE:
-            suc_s += 1
-        if h.status == Status.INFECTED:
-            inf_s += 1
-        if h.status == Status.RECOVERED:
-            rec_s += 1
-    suc.append(suc_s)
-    inf.append(inf_s)
-    rec.append(rec_s)
-    test.clear()
-    test.set_ylim(0, len(global_humans))
-    test.stackplot(steps, inf, rec, suc, colors=[
-                   '#df0000', '#4a4a4a', '#0000df'])
-
-    label1 = 'infected'
-    label2 = 'recovered'
-    label3 = 'succeptable'
-    p1 = Rectangle((0, 0), 1, 1, fc='#df0000')
-    p2 = Rectangle((0, 0), 1, 1, fc='#4a4a4a')
-    p3 = Rectangle((0, 0), 1, 1, fc='#0000df')
-    legend = test.legend([p1, p2, p3], [label1, label2, label3],
-                         loc="lower center", bbox_to_anchor=(-0.12, -0.15), ncol=3)
-
-
-def stack_animation_mask_vulnerable(
-        i,
-        humans,
-        test,
-        time_step,
-        inf_vulnerable, inf, inf_mask,
-        rec_vulnerable, rec, rec_mask,
-        suc_vulnerable, suc, suc_mask,
-        steps,
-        number_of_humans,
-        infection_radius):
-    """
-    updates the stackplot every timestep
-
-    Args:
-        humans (list): list of all humans in the animated city
-        test: plot that gets animated
-        time_step (float): timestep in which movement is calculated
-        inf (list): list containing the amount of regular infected humans at all past timestep
-        rec (list): list containing the amount of regular recovered humans at all past timestep
-        suc (list): list containing the amount of regular suceptible humans at all past timestep
-        inf_vulnerable (list): list containing the amount of infected vulnerable humans at all past timestep
-        rec_vulnerable (list): list containing the amount of recovered vulnerable humans at all past timestep
-        suc_vulnerable (list): list containing the amount of suceptible vulnerable humans at all past timestep
-        inf_mask (list): list containing the amount of infected humans wearing masks at all past timestep
-        rec_mask (list): list containing the amount of recovered humans wearing masks at all past timestep
-        suc_mask (list): list containing the amount of suceptible humans wearing masks at all past timestep
-        steps (list): list containing all time_steps from the past
-        number_of_humans (float): amount of humans in the scenario
-
-    """
-    # updates the stackplot every timestep
-    step_counter = len(suc)
-    steps.append(time_step*step_counter)
-    suc_s = 0
-    inf_s = 0
-    rec_s = 0
-
-    suc_mask_s = 0
-    inf_mask_s = 0
-    rec_mask_s = 0
-
-    suc_vulnerable_s = 0
-    inf_vulnerable_s = 0
-    rec_vulnerable_s = 0
-
-    # counting the amount of different states
-    for h in humans:
-        if h.infection_radius == infection_radius:
-            if h.status == Status.SUCEPTIBLE:
-                suc_s += 1
-            if h.status == Status.INFECTED:
-                inf_s += 1
-            if h.status == Status.RECOVERED:
-                rec_s += 1
-        elif h.infection_radius < infection_radius:
-            if h.status == Status.SUCEPTIBLE:
-                suc_mask_s += 1
-            if h.status == Status.INFECTED:
-                inf_mask_s += 1
-            if h.status == Status.RECOVERED:
-                rec_mask_s += 1
-        elif h.infection_radius > infection_radius:
-            if h.status == Status.SUCEPTIBLE:
-                suc_vulnerable_s += 1
-            if h.status == Status.INFECTED:
-                inf_vulnerable_s += 1
-            if h.status == Status.RECOVERED:
-                rec_vulnerable_s += 1
-
-    suc.append(suc_s)
-    inf.append(inf_s)
-    rec.append(rec_s)
-
-    suc_mask.append(suc_mask_s)
-    inf_mask.append(inf_mask_s)
-    rec_mask.append(rec_mask_s)
-
-    suc_vulnerable.append(suc_vulnerable_s)
-    inf_vulnerable.append(inf_vulnerable_s)
-    rec_vulnerable.append(rec_vulnerable_s)
-
-    test.clear()
-    test.set_ylim(0, len(humans))
-
-    test.stackplot(
-        steps,
-        inf_vulnerable, inf, inf_mask,
-        rec_vulnerable, rec, rec_mask,
-        suc_vulnerable, suc, suc_mask,
-        colors=[
-            '#9c0000', '#df0000', '#eb6666',
-            '#3b3b3b', '#4a4a4a', '#6e6e6e',
-            '#00009c', '#0000df', '#6666eb'
-        ])
-
-    label1 = 'infected'
-    label2 = 'infected (vulnerable)'
-    label3 = 'infected (mask)'
-    label4 = 'recovered'
-    label5 = 'recovered (vulnerable)'
-    label6 = 'recovered (mask)'
-    label7 = 'succeptable'
-    label8 = 'succeptable(vulnerable)'
-    label9 = 'succeptable (mask)'
-    p1 = Rectangle((0, 0), 1, 1, fc='#df0000')
-    p4 = Rectangle((0, 0), 1, 1, fc='#4a4a4a')
-    p7 = Rectangle((0, 0), 1, 1, fc='#0000df')
-    p2 = Rectangle((0, 0), 1, 1, fc='#9c0000')
-    p3 = Rectangle((0, 0), 1, 1, fc='#eb6666')
-    p5 = Rectangle((0, 0), 1, 1, fc='#3b3b3b')
-    p6 = Rectangle((0, 0), 1, 1, fc='#6e6e6e')
-    p8 = Rectangle((0, 0), 1, 1, fc='#00009c')
-    p9 = Rectangle((0, 0), 1, 1, fc='#6666eb')
-    legend = test.legend([p1, p2, p3, p4, p5, p6, p7, p8, p9], [label1, label2, label3, label4, label5, label6,
-                                                                label7, label8, label9], loc="lower right", bbox_to_anchor=(0.1, -0.15), ncol=3, fontsize='small')
-
-
-def stack_animation_quarantine(i, humans, quarantined, test, time_step, inf, rec, suc, steps, number_of_humans):
-    """
-    updates the stackplot every timestep
-
-    Args:
-        humans (list): list of all humans in the animated city
-        quarantined (list): list of all quarantined humans
-        test: plot that gets animated
-        time_step (float): timestep in which movement is calculated
-        inf (list): list containing the amount of infected humans at all past timestep
-        rec (list): list containing the amount of recovered humans at all past timestep
-        suc (list): list containing the amount of suceptible humans at all past timestep
-        steps (list): list containing all time_steps from the past
-        number_of_humans (float): amount of humans in the scenario
-
-    """
-    step_counter = len(suc)
-    steps.append(time_step*step_counter)
-    suc_s = 0
-    inf_s = 0
-    rec_s = 0
-
-    # counting the amount of different states
-    for h in humans:
-        if h.status == Status.SUCEPTIBLE:
-            suc_s += 1
-        if h.status == Status.INFECTED:
-            inf_s += 1
-        if h.status == Status.RECOVERED:
-            rec_s += 1
-    suc.append(suc_s)
-    inf.append(inf_s)
-    qua.append(len(quarantined))
-    rec.append(rec_s)
-    test.clear()
-    test.set_ylim(0, len(humans))
-    test.stackplot(steps, inf, qua, rec, suc, colors=[
-                   '#df0000', '#ffc637', '#4a4a4a', '#0000df'])
-
-    label1 = 'infected'
-    label2 = 'recovered'
-    label3 = 'succeptable'
-    label4 = 'quarantined'
-    p1 = Rectangle((0, 0), 1, 1, fc='#df0000')
-    p2 = Rectangle((0, 0), 1, 1, fc='#4a4a4a')
-    p3 = Rectangle((0, 0), 1, 1, fc='#0000df')
-    p4 = Rectangle((0, 0), 1, 1, fc='#ffc637')
-    legend = test.legend([p1, p2, p3, p4], [label1, label2, label3, label4],
-                         loc="lower left", bbox_to_anchor=(-0.12, -0.30), ncol=4)
-
-
-def stack_animation(i, humans, test, time_step, inf, rec, suc, steps, number_of_humans):
-    """updates the stackplot every timestep
-
-    Args:
-        humans (list): list of all humans in the animated city
-        test: plot that gets animated
-        time_step (float): timestep in which movement is calculated
-        inf (list): list containing the amount of infected humans at all past timestep
-        rec (list): list containing the amount of recovered humans at all past timestep
-        suc (list): list containing the amount of suceptible humans at all past timestep
-        steps (list): list containing all time_steps from the past
-        number_of_humans (float): amount of humans in the scenario
-
-    """
-    step_counter = len(suc)
-    steps.append(time_step*step_counter)
-    suc_s = 0
-    inf_s = 0
-    rec_s = 0
-
-    # counting the amount of different states
-    for h in humans:
-        if h.status == Status.SUCEPTIBLE:
-            suc_s += 1
-        if h.status == Status.INFECTED:
-            inf_s += 1
-        if h.status == Status.RECOVERED:
-            rec_s += 1
-    suc.append(suc_s)
-    inf.append(inf_s)
-    rec.append(rec_s)
-    test.clear()
-    test.set_ylim(0, len(humans))
-    test.stackplot(steps, inf, rec, suc, colors=[
-                   '#df0000', '#4a4a4a', '#0000df'])
-
-    label1 = 'infected'
-    label2 = 'recovered'
-    label3 = 'succeptable'
-    p1 = Rectangle((0, 0), 1, 1, fc='#df0000')
-    p2 = Rectangle((0, 0), 1, 1, fc='#4a4a4a')
-    p3 = Rectangle((0, 0), 1, 1, fc='#0000df')
-    legend = test.legend([p1, p2, p3], [label1, label2, label3],
-                         loc="lower center", bbox_to_anchor=(-0.12, -0.15), ncol=3)
+    return plot, ani
 
 
 # input functions
@@ -1,124 +1,316 @@
 import math
 import numpy as np
-import random
-from src.human import Human, Status
+from src.human import Status
+import src.kernels as kernels
+from src.neighbours import CellGrid, radius_pairs
 
 # constants for the potential
 epsilon = 2
 sigma = 7.5
 
 
-def calculate_movement(humans, dt, energy):
+def calculate_movement(humans, dt, energy, world_limit=100, neighbours=None, rng=None):
     """
-    calculates location, speed and acceleration in respect to the potential
+    calculates location, speed and acceleration in respect to the potential,
+    all humans are integrated at once with whole-array operations
 
     Args:
-        humans (list): list of all humans
+        humans (Population): population containing all humans
         dt (float): time step in which the movement is calculated
         energy (float): amount of movement
+        world_limit (float): length of the x and y axis
+        neighbours (NeighbourList): cached pairs shared by forces and infection, optional
+        rng (Generator): random number generator for the infection, optional
 
     Returns:
-        humans (list): list of all humans
-    """
-    new_energy = 0
-    old_humans = humans
-    for i, h in enumerate(humans):
-        new_location = h.location + dt * h.velocity + \
-            0.5 * dt ** 2 * old_humans[i].acceleration
-        calculate_interactions(humans, h, i)
-        infection(humans, h, i)
-        new_velocity = h.velocity + 0.5 * dt * h.acceleration
-        # subtract the old value so that we are "starting the next calculation for the acceleration from 0"
-        h.acceleration -= old_humans[i].acceleration
-
-        # handle maximum velocity based on total energy
-        new_energy += np.linalg.norm(new_velocity)**2
-        factor = math.sqrt(energy / new_energy)
-        new_velocity = new_velocity*factor
-
-        # checks that single particles get too fast
-        abs_speed = np.linalg.norm(new_velocity)**2
-        factor_v = math.sqrt(abs_speed / energy)
-        if factor_v > 3*(1/len(humans)):
-            scaling = 0.03/factor_v
-            new_velocity = new_velocity*scaling
-        h.update(new_location, new_velocity)
+        humans (Population): population containing all humans
+    """
+    if len(humans) == 0:
+        return humans
+    if neighbours is not None:
+        neighbours.update(humans, interaction_cutoff(humans))
+    # "start the calculation for the acceleration from 0"
+    humans.ax[:] = 0.0
+    humans.ay[:] = 0.0
+    calculate_interactions(humans, world_limit, neighbours)
+    infection(humans, world_limit, neighbours, rng)
+
+    def limit(vx, vy, rows):
+        return limit_velocity(vx, vy, energy)
+
+    integrate(humans, dt, limit, world_limit)
     return humans
 
 
-def random_walk(humans, dt, energy, temperature):
+def integrate(humans, dt, limit, world_limit=100):
     """
-    calculates location, speed and acceleration by adding random values to the speed
+    moves all humans with the accelerations that were calculated for them
+    and limits the new velocities of the humans that are not quarantined
 
     Args:
-        humans (list): list of all humans
+        humans (Population): population containing all humans
         dt (float): time step in which the movement is calculated
-        energy (float): amount of movement
+        limit (function): takes velocities in x and y direction and the rows
+            they belong to, gives the limited velocities (e.g. limit_velocity)
+        world_limit (float): length of the x and y axis
+
+    Returns:
+        humans (Population): population containing all humans
+    """
+    new_x = humans.x + dt * humans.vx + 0.5 * dt ** 2 * humans.ax
+    new_y = humans.y + dt * humans.vy + 0.5 * dt ** 2 * humans.ay
+    new_vx = humans.vx + 0.5 * dt * humans.ax
+    new_vy = humans.vy + 0.5 * dt * humans.ay
+    new_vx, new_vy = limit_free(humans, new_vx, new_vy, limit)
+    humans.update(new_x, new_y, new_vx, new_vy, world_limit)
+    return humans
+
+
+def limit_velocity(vx, vy, energy):
+    """
+    rescales the velocities so the total energy stays the same and slows down
+    single humans that are too fast
+
+    Args:
+        vx (array): velocities in x direction
+        vy (array): velocities in y direction
+        energy (float): amount of movement the system should have
 
     Returns:
-        humans (list): list of all humans
-    """
-    new_energy = 0
-    old_humans = humans
-    for i, h in enumerate(humans):
-        infection(humans, h, i)
-        new_location = h.location + dt * h.velocity
-        velocity_gen_x = random.gauss(0, 1)
-        velocity_gen_y = random.gauss(0, 1)
-        velocity_random = [
-            velocity_gen_x * float(temperature)/15, velocity_gen_y * float(temperature)/15]
-        new_velocity = h.velocity + velocity_random
-
-        # handle maximum velocity based on total energy
-        new_energy += np.linalg.norm(new_velocity)**2
+        vx (array): limited velocities in x direction
+        vy (array): limited velocities in y direction
+    """
+    if energy <= 0:
+        return vx, vy
+    # handle maximum velocity based on total energy
+    new_energy = np.sum(vx ** 2 + vy ** 2)
+    if new_energy > 0:
         factor = math.sqrt(energy / new_energy)
-        new_velocity = new_velocity*factor
-
-        abs_speed = np.linalg.norm(new_velocity)**2
-        factor_v = math.sqrt(abs_speed / energy)
-        if factor_v > 3*(1/len(humans)):
-            scaling = 0.03/factor_v
-            new_velocity = new_velocity*scaling
-        h.update(new_location, new_velocity)
+        vx = vx * factor
+        vy = vy * factor
+
+    # checks that single particles get too fast
+    factor_v = np.sqrt((vx ** 2 + vy ** 2) / energy)
+    too_fast = factor_v > 3*(1/len(vx))
+    scaling = np.where(too_fast, 0.03 / np.where(too_fast, factor_v, 1), 1)
+    return vx * scaling, vy * scaling
+
+
+def limit_free(humans, vx, vy, limit):
+    """
+    limits the velocities, but quarantined humans are left out, they keep their
+    velocity and do not count to the energy of the system
+
+    Args:
+        humans (Population): population containing all humans
+        vx (array): velocities in x direction
+        vy (array): velocities in y direction
+        limit (function): takes velocities in x and y direction and the rows
+            they belong to, gives the limited velocities
+
+    Returns:
+        vx (array): limited velocities in x direction
+        vy (array): limited velocities in y direction
+    """
+    quarantined = humans.quarantined
+    if not np.any(quarantined):
+        return limit(vx, vy, slice(None))
+    free = ~quarantined
+    vx = vx.copy()
+    vy = vy.copy()
+    if np.any(free):
+        vx[free], vy[free] = limit(vx[free], vy[free], free)
+    return vx, vy
+
+
+def limit_velocity_patches(vx, vy, energy, patch):
+    """
+    like limit_velocity, but every patch keeps its own energy and the speed
+    limit of a human depends on the amount of humans in its patch
+
+    Args:
+        vx (array): velocities in x direction
+        vy (array): velocities in y direction
+        energy (array): amount of movement every patch should have
+        patch (array): patch of every human
+
+    Returns:
+        vx (array): limited velocities in x direction
+        vy (array): limited velocities in y direction
+    """
+    energy = np.asarray(energy, dtype=float)
+    number_of_patches = len(energy)
+    new_energy = np.bincount(patch, vx ** 2 + vy ** 2, number_of_patches)
+    size = np.bincount(patch, minlength=number_of_patches)
+    rescale = (energy > 0) & (new_energy > 0)
+    factor = np.where(rescale, np.sqrt(energy / np.where(rescale, new_energy, 1)), 1)
+    vx = vx * factor[patch]
+    vy = vy * factor[patch]
+
+    # checks that single particles get too fast
+    own_energy = energy[patch]
+    limited = own_energy > 0
+    factor_v = np.sqrt((vx ** 2 + vy ** 2) / np.where(limited, own_energy, 1))
+    too_fast = limited & (factor_v > 3 / size[patch])
+    scaling = np.where(too_fast, 0.03 / np.where(too_fast, factor_v, 1), 1)
+    return vx * scaling, vy * scaling
+
+
+def random_walk(humans, dt, energy, temperature, rng=None, world_limit=100, neighbours=None):
+    """
+    calculates location, speed and acceleration by adding random values to the speed,
+    the noise of all humans is drawn at once from a numpy Generator
+
+    Args:
+        humans (Population): population containing all humans
+        dt (float): time step in which the movement is calculated
+        energy (float): amount of movement
+        temperature (float): influences the size of the random changes
+        rng (Generator): random number generator, a new one is created if None
+        world_limit (float): length of the x and y axis
+        neighbours (NeighbourList): cached pairs for the infection, optional
+
+    Returns:
+        humans (Population): population containing all humans
+    """
+    if len(humans) == 0:
+        return humans
+    if rng is None:
+        rng = np.random.default_rng()
+    if neighbours is not None:
+        neighbours.update(humans, interaction_cutoff(humans))
+    infection(humans, world_limit, neighbours, rng)
+    new_x = humans.x + dt * humans.vx
+    new_y = humans.y + dt * humans.vy
+    noise = rng.standard_normal((2, len(humans)))
+    noise *= float(temperature)/15
+
+    def limit(vx, vy, rows):
+        return limit_velocity(vx, vy, energy)
+
+    new_vx, new_vy = limit_free(humans, humans.vx + noise[0], humans.vy + noise[1], limit)
+    humans.update(new_x, new_y, new_vx, new_vy, world_limit)
     return humans
 
 
-def calculate_interactions(humans, h, i):
+def interaction_cutoff(humans):
+    """
+    gives the largest distance at which two humans can still interact
+
+    Args:
+        humans (Population): population containing all humans
+
+    Returns:
+        cutoff (float): maximum of the force cutoff and the infection radii
+    """
+    return max(3 * np.max(humans.radius, initial=0),
+               np.max(humans.infection_radius, initial=0))
+
+
+def calculate_interactions(humans, world_limit=100, neighbours=None):
     """
-    calculates the force between 2 particles if they are near enough
+    calculates the force between all pairs of humans that are near enough,
+    the pairs are found with a cell list whose cells are as large as the cutoff
+    or taken from a neighbour list, the forces are added by the selected kernel
+    backend (see kernels.set_backend)
 
     Args:
-        humans (list): list of all humans
-        i (index): index going through humans
-        h (index): index going through humans
+        humans (Population): population containing all humans
+        world_limit (float): length of the x and y axis
+        neighbours (NeighbourList): cached pairs, optional
+    """
+    cutoff = 3 * np.max(humans.radius, initial=0)
+    if len(humans) == 0 or cutoff <= 0:
+        return
+    if neighbours is not None:
+        i, j, dist = neighbours.pairs(humans)
+    else:
+        grid = CellGrid(humans.x, humans.y, cutoff, world_limit)
+        i, j, dist = grid.pairs(cutoff)
+    i, j, dist = free_pairs(humans, i, j, dist)
+    # calculate repulsion force
+    kernels.pair_forces(humans.x, humans.y, humans.radius, i, j, dist,
+                        humans.ax, humans.ay, epsilon, sigma)
+
+
+def free_pairs(humans, i, j, dist):
+    """
+    removes the pairs with a quarantined human, quarantined humans neither
+    feel forces nor take part in infections
+
+    Args:
+        humans (Population): population containing all humans
+        i (array): index of the first human of every pair
+        j (array): index of the second human of every pair
+        dist (array): distance between the humans of every pair
+
+    Returns:
+        i (array): index of the first human of the kept pairs
+        j (array): index of the second human of the kept pairs
+        dist (array): distance between the humans of the kept pairs
+    """
+    quarantined = humans.quarantined
+    if not np.any(quarantined):
+        return i, j, dist
+    keep = ~(quarantined[i] | quarantined[j])
+    return i[keep], j[keep], dist[keep]
+
+
+def quarantine(humans, detection_probability, rng=None):
+    """
+    tests all infected humans that are not yet quarantined at once and
+    quarantines the detected ones, they are released by Population.update
+    when they are recovered
+
+    Args:
+        humans (Population): population containing all humans
+        detection_probability (float): probability of an infected human to be detected in a step
+        rng (Generator): random number generator, a new one is created if None
+
+    Returns:
+        detected (array): rows of the humans that were quarantined
     """
-    for p in humans[i + 1:]:
-        dist = math.dist(h.location, p.location)
-        if dist < 3 * h.radius and dist > 0:
-            # calculate repulsion force
-            ljp = lennard_jones(dist)
-            force = ljp * ((h.location - p.location) / dist)
-            h.acceleration += force
-            p.acceleration -= force
+    if rng is None:
+        rng = np.random.default_rng()
+    candidates = np.flatnonzero(humans.is_infected() & ~humans.quarantined)
+    detected = candidates[rng.random(len(candidates)) < detection_probability]
+    humans.quarantined[detected] = True
+    return detected
 
 
-def infection(humans, h, i):
+def infection(humans, world_limit=100, neighbours=None, rng=None):
     """
-    infects humans within the infection radius of an infected human
+    infects humans within the infection radius of an infected human.
+    All infected-suceptible pairs are collected first and all random numbers
+    are drawn at once, the new statuses are applied together at the end so
+    humans infected in this step can only infect others in the next one.
 
     Args:
-        humans (list): list of all humans
-        i (index): index going through humans
-        h (index): index going through humans
+        humans (Population): population containing all humans
+        world_limit (float): length of the x and y axis
+        neighbours (NeighbourList): cached pairs, optional
+        rng (Generator): random number generator, a new one is created if None
     """
-    for p in humans[i + 1:]:
-        dist = math.dist(h.location, p.location)
-        if dist < h.infection_radius and dist > 0:
-            if p.will_infect(h):
-                h.infect()
-        if dist < p.infection_radius and dist > 0:
-            if h.will_infect(p):
-                p.infect()
+    suceptible = humans.is_suceptible()
+    infected = humans.is_infected() & ~humans.quarantined
+    if not (np.any(infected) and np.any(suceptible)):
+        return
+    if rng is None:
+        rng = np.random.default_rng()
+    if neighbours is not None:
+        i, j, dist = neighbours.pairs(humans)
+        target = np.concatenate((i, j))
+        source = np.concatenate((j, i))
+        dist = np.concatenate((dist, dist))
+    else:
+        target, source, dist = radius_pairs(
+            humans.x, humans.y, humans.infection_radius, world_limit)
+    target, source, dist = free_pairs(humans, target, source, dist)
+    target, source = kernels.infection_candidates(
+        humans.status, humans.infection_radius, target, source, dist,
+        Status.SUCEPTIBLE.value, Status.INFECTED.value)
+    hits = rng.random(len(target)) <= humans.infection_probability[source]
+    humans.infect(np.unique(target[hits]))
 
 
 def lennard_jones(r):
@@ -128,5 +320,4 @@ def lennard_jones(r):
     Args:
         r (float): distance between two humans
     """
-    # derivative of 4 * epsilon * ((sigma / r) ** 12 - (sigma / r) ** 6)
-    return (-24 * epsilon * sigma ** 6 * (r ** 6 - 2 * sigma ** 6)) / (r ** 13)
+    return kernels.lennard_jones(r, epsilon, sigma)
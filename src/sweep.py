@@ -0,0 +1,192 @@
+import argparse
+import itertools
+import multiprocessing
+import numpy as np
+
+from src.runner import default_config, models, run
+
+
+# parameters that can be swept and the metrics collected for every run
+parameters = ("prob", "infection_radius", "number_of_humans", "temperature", "detection_probability")
+metrics = ("peak_infected", "time_to_peak", "final_size")
+
+# row of the result table
+result_dtype = np.dtype(
+    [(name, np.float64) for name in parameters]
+    + [("replica", np.int64)]
+    + [("peak_infected", np.int64), ("time_to_peak", np.float64), ("final_size", np.int64)])
+
+
+def grid(**values):
+    """
+    creates every combination of the given parameter values
+
+    Args:
+        values (list): values of a parameter, e.g. prob=[0.2, 0.5, 1]
+
+    Returns:
+        configs (list): one config (dict) per combination
+    """
+    names = list(values)
+    return [dict(zip(names, combination))
+            for combination in itertools.product(*(values[name] for name in names))]
+
+
+def latin_hypercube(ranges, n, seed=None):
+    """
+    creates a latin hypercube design: the range of every parameter is cut into
+    n intervals of the same size and every interval is used by exactly one run
+
+    Args:
+        ranges (dict): smallest and largest value of every parameter,
+            e.g. prob=(0.1, 1)
+        n (int): amount of runs
+        seed (int): seed of the random design
+
+    Returns:
+        configs (list): one config (dict) per run
+    """
+    rng = np.random.default_rng(seed)
+    n = int(n)
+    columns = {}
+    for name, (low, high) in ranges.items():
+        position = (rng.permutation(n) + rng.random(n)) / n
+        columns[name] = low + position * (high - low)
+        if name == "number_of_humans":
+            columns[name] = np.rint(columns[name]).astype(int)
+    return [{name: columns[name][k].item() for name in ranges} for k in range(n)]
+
+
+def summarise(result):
+    """
+    calculates the metrics of a single run
+
+    Args:
+        result (dict): series returned by runner.run
+
+    Returns:
+        peak_infected (int): largest amount of infected humans at the same time
+        time_to_peak (float): time at which the peak was reached first
+        final_size (int): amount of humans that have been infected at the end
+    """
+    peak = int(np.argmax(result["infected"]))
+    final_size = int(result["infected"][-1] + result["recovered"][-1])
+    return int(result["infected"][peak]), float(result["time"][peak]), final_size
+
+
+def run_single(task):
+    """
+    runs one configuration of a sweep, used by the worker processes
+
+    Args:
+        task (tuple): config (dict) and amount of steps
+
+    Returns:
+        metrics (tuple): peak infected, time to peak and final size
+    """
+    config, n_steps = task
+    return summarise(run(config, n_steps))
+
+
+def sweep(configs, n_steps, processes=None, base=None, seed=None, replicas=1):
+    """
+    runs every configuration in a pool of processes and collects the metrics.
+    Every run gets its own random stream spawned from the seed, so the runs are
+    independent and the table is the same for any amount of processes.
+
+    Args:
+        configs (list): configs (dict) to run, e.g. from grid or latin_hypercube
+        n_steps (int): amount of steps of every run
+        processes (int): amount of worker processes, one per core if None
+        base (dict): values used for everything that is not given in a config
+        seed (int): seed all random streams are spawned from, every sweep differs if None
+        replicas (int): amount of runs of every configuration
+
+    Returns:
+        table (array): structured array with the parameters and metrics of every run
+    """
+    base = {**default_config, **(base or {})}
+    runs = [(config, replica) for config in configs for replica in range(int(replicas))]
+    streams = np.random.SeedSequence(seed).spawn(len(runs))
+    tasks = [({**base, **config, "seed": stream}, n_steps)
+             for (config, _), stream in zip(runs, streams)]
+    table = np.zeros(len(tasks), dtype=result_dtype)
+    for k, (config, _) in enumerate(tasks):
+        for name in parameters:
+            table[name][k] = float(config[name])
+        table["replica"][k] = runs[k][1]
+    if processes == 1:
+        _collect(table, map(run_single, tasks))
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            _collect(table, pool.imap(run_single, tasks))
+    return table
+
+
+def _collect(table, results):
+    """writes the metrics of the runs into the result table in order"""
+    for k, values in enumerate(results):
+        for name, value in zip(metrics, values):
+            table[name][k] = value
+
+
+def parse_args(argv=None):
+    """
+    reads the command line arguments of the sweep
+
+    Args:
+        argv (list): arguments, the ones of the process if None
+
+    Returns:
+        args (Namespace): all parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Runs a virus spread scenario for many parameters in parallel.")
+    parser.add_argument("--model", choices=sorted(models), default=default_config["model"])
+    parser.add_argument("--prob", type=float, nargs="+", default=[default_config["prob"]])
+    parser.add_argument("--infection-radius", type=float, nargs="+",
+                        default=[default_config["infection_radius"]])
+    parser.add_argument("--humans", type=int, nargs="+", default=[default_config["number_of_humans"]])
+    parser.add_argument("--temperature", type=float, nargs="+", default=[default_config["temperature"]])
+    parser.add_argument("--detection-probability", type=float, nargs="+",
+                        default=[default_config["detection_probability"]])
+    parser.add_argument("--lhs", type=int, metavar="N",
+                        help="samples N runs between the smallest and largest given value "
+                             "of every parameter instead of running the full grid")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed of the latin hypercube design and of all runs")
+    parser.add_argument("--replicas", type=int, default=1, help="amount of runs of every configuration")
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--backend", choices=["numpy", "numba"], default=None,
+                        help="implementation of the pair kernels, numba if installed by default")
+    parser.add_argument("--out", help="stores the result table in this .npy file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """runs a sweep from the command line"""
+    args = parse_args(argv)
+    values = {
+        "prob": args.prob,
+        "infection_radius": args.infection_radius,
+        "number_of_humans": args.humans,
+        "temperature": args.temperature,
+        "detection_probability": args.detection_probability,
+    }
+    if args.lhs:
+        ranges = {name: (min(v), max(v)) for name, v in values.items()}
+        configs = latin_hypercube(ranges, args.lhs, args.seed)
+    else:
+        configs = grid(**values)
+    table = sweep(configs, args.steps, args.processes, {"model": args.model, "backend": args.backend},
+                  seed=args.seed, replicas=args.replicas)
+    if args.out:
+        np.save(args.out, table)
+    print(" ".join(f"{name:>16}" for name in table.dtype.names))
+    for row in table:
+        print(" ".join(f"{value:>16.6g}" for value in row.tolist()))
+
+
+if __name__ == "__main__":
+    main()
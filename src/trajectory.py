@@ -0,0 +1,409 @@
+import json
+import os
+import queue
+import threading
+import numpy as np
+
+from src.codec import decode_chunk, encode_chunk
+from src.columns import number_of_states
+from src.population import Population
+
+
+def _write_meta(path, meta):
+    """writes the description of a trajectory, replacing the old one at once"""
+    temporary = os.path.join(path, "meta.json.tmp")
+    with open(temporary, "w") as file:
+        json.dump(meta, file, indent=1)
+    os.replace(temporary, os.path.join(path, "meta.json"))
+
+
+def summarise(status):
+    """
+    counts the humans in each health state in every frame
+
+    Args:
+        status (array): status codes of shape (frames, humans)
+
+    Returns:
+        counts (array): amount of suceptible, infected and recovered humans
+            (columns) in every frame (rows)
+    """
+    return np.stack([np.count_nonzero(status == code, axis=1)
+                     for code in range(number_of_states)], axis=1).astype(np.int64)
+
+
+class TrajectoryWriter:
+    """
+    Writes the columns of the humans after every stride-th step into a
+    directory, one flat binary file per column holding one row per frame.
+    Frames are collected in chunks of a fixed size, full chunks are written
+    by a background thread while the simulation goes on. Only two chunks
+    exist, so the memory does not grow with the length of the run, the
+    simulation only waits if the disk is slower than the simulation.
+    The files can be opened with Trajectory (numpy memmaps). With the delta
+    codec (see codec.py) the chunks are encoded into a single file instead,
+    codec, positions as fixed point differences and codes as 2 bits, optionally
+    compressed with zlib. An existing trajectory can be continued, e.g. by a
+    run that is resumed from a checkpoint (see start_at).
+    """
+
+    def __init__(self, path, number_of_humans, columns=("x", "y", "status"), stride=1,
+                 chunk_size=256, time_step=1.0, codec=None, compress=False, append=False):
+        """
+        creates the directory and starts the writing thread
+
+        Args:
+            path (str): directory of the trajectory, created if missing
+            number_of_humans (int): amount of humans, the same in every frame
+            columns (list): columns of the population that are written
+            stride (int): amount of steps between two frames
+            chunk_size (int): amount of frames collected before they are written
+            time_step (float): time of a step, used for the time of every frame
+            codec (str): "delta" to encode the chunks, one flat file per column if None
+            compress (bool): compresses every encoded chunk with zlib
+            append (bool): continues the trajectory in the directory after its last
+                frame, it has to be written with the same arguments. A new
+                trajectory replaces the old one if False.
+
+        Attr:
+            self.steps (int): amount of recorded steps
+            self.frames (int): amount of frames taken so far
+            self.written (int): amount of frames on the disk
+        """
+        unknown = set(columns) - set(Population.columns)
+        if unknown:
+            raise ValueError(f"unknown columns {sorted(unknown)}, choose from {Population.columns}")
+        if stride < 1 or chunk_size < 1:
+            raise ValueError("stride and chunk_size have to be at least 1")
+        if codec not in (None, "delta"):
+            raise ValueError(f"unknown codec {codec!r}, choose 'delta' or None")
+        self.path = str(path)
+        self.number_of_humans = int(number_of_humans)
+        self.columns = tuple(columns)
+        self.stride = int(stride)
+        self.chunk_size = int(chunk_size)
+        self.time_step = float(time_step)
+        self.codec = codec
+        self.compress = bool(compress) and codec is not None
+        self.dtypes = {name: np.dtype(Population._dtype(name)) for name in self.columns}
+        self.dtypes["time"] = np.dtype(np.float64)
+        self.steps = 0
+        self.frames = 0
+        self.written = 0
+
+        os.makedirs(self.path, exist_ok=True)
+        files = ("time", "chunks") if codec else tuple(self.dtypes)
+        if "status" in self.columns:
+            files += ("summary",)
+        # offset, length and amount of frames of every encoded chunk
+        self._index = []
+        existing = append and os.path.exists(os.path.join(self.path, "meta.json"))
+        if existing:
+            with open(os.path.join(self.path, "meta.json")) as file:
+                meta = json.load(file)
+            self._index = meta["chunks"]
+            self.written = meta["frames"]
+            if {key: meta.get(key) for key in self._settings()} != self._settings():
+                raise ValueError(f"the trajectory in {self.path} was written with other settings, "
+                                 "continue it with the same ones or write a new one")
+        self._files = {name: open(os.path.join(self.path, name + ".bin"), "r+b" if existing else "wb")
+                       for name in files}
+        self._free = queue.Queue()
+        self._full = queue.Queue()
+        for _ in range(2):
+            chunk = {name: np.empty((self.chunk_size, self.number_of_humans), self.dtypes[name])
+                     for name in self.columns}
+            chunk["time"] = np.empty(self.chunk_size)
+            self._free.put(chunk)
+        self._chunk = self._free.get()
+        self._used = 0
+        self._error = None
+        self._recording = False
+        # frames behind the last complete write are dropped
+        self._cut(self.written)
+        self.steps = self.written * self.stride
+        _write_meta(self.path, self.meta())
+        self._thread = threading.Thread(target=self._write_chunks, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _settings(self):
+        """gives the values a continued trajectory has to share with the old one"""
+        return {
+            "number_of_humans": self.number_of_humans,
+            "stride": self.stride,
+            "time_step": self.time_step,
+            "columns": {name: dtype.str for name, dtype in self.dtypes.items()},
+            "codec": self.codec,
+            "compress": self.compress,
+            "summary": "status" in self.columns,
+        }
+
+    def meta(self):
+        """
+        describes the files of the trajectory
+
+        Returns:
+            meta (dict): amount of humans and frames, stride, time step and
+                dtype of every column
+        """
+        return {**self._settings(), "frames": self.written, "chunks": list(self._index)}
+
+    def _cut(self, frames):
+        """
+        drops the frames on the disk from the given one on, the kept frames
+        of a partly dropped encoded chunk become the current chunk again
+        """
+        sizes = {name: self.number_of_humans * dtype.itemsize for name, dtype in self.dtypes.items()}
+        sizes["time"] = self.dtypes["time"].itemsize
+        sizes["summary"] = number_of_states * np.dtype(np.int64).itemsize
+        written = frames
+        self._used = 0
+        if self.codec:
+            starts = np.cumsum([0] + [chunk[2] for chunk in self._index])
+            # amount of chunks that are kept completely
+            k = int(np.count_nonzero(starts[1:] <= frames))
+            written = int(starts[k])
+            sizes["chunks"] = ([0] + [offset + length for offset, length, _ in self._index])[k]
+            if frames > written:
+                offset, length, _ = self._index[k]
+                self._files["chunks"].seek(offset)
+                columns = decode_chunk(self._files["chunks"].read(length), self.compress, self.dtypes)
+                self._files["time"].seek(written * sizes["time"])
+                self._used = frames - written
+                self._chunk["time"][:self._used] = np.frombuffer(
+                    self._files["time"].read(self._used * sizes["time"]), self.dtypes["time"])
+                for name in self.columns:
+                    self._chunk[name][:self._used] = columns[name][:self._used]
+            self._index = self._index[:k]
+        for name, file in self._files.items():
+            file.truncate(sizes[name] if name == "chunks" else written * sizes[name])
+            file.seek(0, os.SEEK_END)
+        self.written = written
+        self.frames = frames
+
+    def start_at(self, step):
+        """
+        continues the trajectory at a step, e.g. when a run is resumed from a
+        checkpoint: frames of this and later steps are dropped and the next
+        recorded step is this one. Only possible before the first record.
+
+        Args:
+            step (int): step of the next record
+        """
+        if self._recording:
+            raise ValueError("a trajectory can only be continued before the first record")
+        frames = -(-int(step) // self.stride)
+        if frames > self.written:
+            raise ValueError(f"the trajectory has {self.written} frames, continuing it at step "
+                             f"{step} needs {frames}, open it with append=True")
+        self._cut(frames)
+        self.steps = int(step)
+        _write_meta(self.path, self.meta())
+
+    def record(self, humans):
+        """
+        records a step, every stride-th step (starting with the first) is
+        taken as a frame. Call it once for the initial state and after every step.
+
+        Args:
+            humans (Population): population containing all humans
+        """
+        self._recording = True
+        if self.steps % self.stride == 0:
+            if len(humans) != self.number_of_humans:
+                raise ValueError(f"the trajectory was created for {self.number_of_humans} "
+                                 f"humans, the population has {len(humans)}")
+            row = self._used
+            for name in self.columns:
+                self._chunk[name][row] = getattr(humans, name)
+            self._chunk["time"][row] = self.steps * self.time_step
+            self._used += 1
+            self.frames += 1
+            if self._used == self.chunk_size:
+                self._flush()
+        self.steps += 1
+
+    def _flush(self):
+        """hands the current chunk to the writing thread and takes a free one"""
+        if self._error is not None:
+            raise self._error
+        self._full.put((self._chunk, self._used))
+        self._chunk = self._free.get()
+        self._used = 0
+
+    def sync(self):
+        """
+        writes the collected frames and waits until everything is on the disk,
+        e.g. before a checkpoint of the run is saved
+        """
+        if self._used:
+            self._flush()
+        self._full.join()
+        if self._error is not None:
+            raise self._error
+
+    def _write_chunks(self):
+        """writes full chunks until close, runs in the background thread"""
+        while True:
+            item = self._full.get()
+            if item is None:
+                self._full.task_done()
+                return
+            chunk, used = item
+            try:
+                if self.codec:
+                    data = encode_chunk({name: chunk[name][:used] for name in self.columns},
+                                        self.compress)
+                    offset = self._files["chunks"].tell()
+                    self._files["chunks"].write(data)
+                    self._files["time"].write(chunk["time"][:used].data)
+                    self._index.append([offset, len(data), used])
+                else:
+                    for name in self.dtypes:
+                        self._files[name].write(chunk[name][:used].data)
+                if "summary" in self._files:
+                    self._files["summary"].write(summarise(chunk["status"][:used]).data)
+                for file in self._files.values():
+                    file.flush()
+                self.written += used
+                _write_meta(self.path, self.meta())
+            except Exception as error:
+                self._error = error
+            self._free.put(chunk)
+            self._full.task_done()
+
+    def close(self):
+        """writes the remaining frames and waits until everything is on the disk"""
+        if self._thread is None:
+            return
+        if self._used:
+            self._flush()
+        self._full.put(None)
+        self._thread.join()
+        self._thread = None
+        for file in self._files.values():
+            file.close()
+        if self._error is not None:
+            raise self._error
+
+
+class Trajectory:
+    """
+    Trajectory written by TrajectoryWriter. Without a codec the columns are
+    numpy memmaps of shape (frames, humans), so a frame is only read when it
+    is used. Encoded trajectories decode the chunk of a frame when it is used.
+    """
+
+    def __init__(self, path):
+        """
+        opens the files of a trajectory
+
+        Args:
+            path (str): directory of the trajectory
+
+        Attr:
+            self.meta (dict): description written by the writer
+            self.time (array): time of every frame
+            self.summary (array): amount of suceptible, infected and recovered
+                humans in every frame, None if the statuses were not recorded
+        """
+        self.path = str(path)
+        with open(os.path.join(self.path, "meta.json")) as file:
+            self.meta = json.load(file)
+        self.number_of_humans = self.meta["number_of_humans"]
+        self.dtypes = {name: np.dtype(dtype) for name, dtype in self.meta["columns"].items()}
+        self.codec = self.meta.get("codec")
+        self.dtypes["summary"] = np.dtype(np.int64)
+        self.time = self._map("time", (len(self),))
+        self.summary = None
+        if self.meta.get("summary"):
+            self.summary = self._map("summary", (len(self), number_of_states))
+        self.columns = {}
+        if self.codec:
+            chunks = np.array(self.meta["chunks"], dtype=np.int64).reshape(-1, 3)
+            self._chunks = chunks
+            # index of the first frame of every chunk
+            self._starts = np.concatenate(([0], np.cumsum(chunks[:, 2])))
+            self._cached = (-1, None)
+        else:
+            for name in self.dtypes:
+                if name not in ("time", "summary"):
+                    self.columns[name] = self._map(name, (len(self), self.number_of_humans))
+
+    def _map(self, name, shape):
+        """maps a flat file of the trajectory"""
+        if np.prod(shape) == 0:
+            # an empty file cannot be mapped
+            return np.zeros(shape, self.dtypes[name])
+        return np.memmap(os.path.join(self.path, name + ".bin"), self.dtypes[name], mode="r", shape=shape)
+
+    def __len__(self):
+        """amount of frames"""
+        return self.meta["frames"]
+
+    def names(self):
+        """
+        gives the names of the recorded columns
+
+        Returns:
+            names (list): names of the columns, e.g. ["x", "y", "status"]
+        """
+        return [name for name in self.dtypes if name not in ("time", "summary")]
+
+    def chunk(self, k):
+        """
+        decodes a chunk of an encoded trajectory, the last one is kept
+
+        Args:
+            k (int): index of the chunk
+
+        Returns:
+            columns (dict): values of every column in the frames of the chunk
+        """
+        if self._cached[0] != k:
+            offset, length, _ = self._chunks[k]
+            with open(os.path.join(self.path, "chunks.bin"), "rb") as file:
+                file.seek(int(offset))
+                data = file.read(int(length))
+            self._cached = (k, decode_chunk(data, self.meta["compress"], self.dtypes))
+        return self._cached[1]
+
+    def __getitem__(self, name):
+        """
+        gives a column of all frames, encoded trajectories are decoded completely
+
+        Args:
+            name (str): name of the column, e.g. "x"
+
+        Returns:
+            values (array): one row per frame
+        """
+        if not self.codec:
+            return self.columns[name]
+        if len(self._chunks) == 0:
+            return np.zeros((0, self.number_of_humans), self.dtypes[name])
+        return np.concatenate([self.chunk(k)[name] for k in range(len(self._chunks))])
+
+    def frame(self, index):
+        """
+        gives the values of all columns in a frame
+
+        Args:
+            index (int): index of the frame
+
+        Returns:
+            frame (dict): values of every column
+        """
+        index = int(index)
+        if not 0 <= index < len(self):
+            raise IndexError("frame index out of range")
+        if not self.codec:
+            return {name: np.asarray(values[index]) for name, values in self.columns.items()}
+        k = int(np.searchsorted(self._starts, index, side="right")) - 1
+        return {name: values[index - self._starts[k]] for name, values in self.chunk(k).items()}
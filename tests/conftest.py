@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from src.population import Population
+
+
+@pytest.fixture
+def moving_population():
+    """gives a function that creates humans at random places with random velocities"""
+    def create(n=200, seed=3, speed=3000, infected=0):
+        rng = np.random.default_rng(seed)
+        humans = Population(n)
+        humans.x[:] = rng.uniform(2, 98, n)
+        humans.y[:] = rng.uniform(2, 98, n)
+        humans.vx[:] = rng.normal(0, speed, n)
+        humans.vy[:] = rng.normal(0, speed, n)
+        humans.radius[:] = 1.5
+        humans.infection_radius[:] = 5
+        humans.infection_probability[:] = 0.5
+        humans.infect(np.arange(infected))
+        return humans
+    return create
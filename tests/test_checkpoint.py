@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+import src.init as init
+import src.simulation as sim
+from src.checkpoint import load_checkpoint, save_checkpoint
+from src.history import History
+from src.neighbours import NeighbourList
+from src.population import Population
+from src.runner import run
+
+
+def test_checkpoint_restores_the_whole_state(tmp_path):
+    rng = np.random.default_rng(7)
+    humans, energy = init.init_sys(10000, 0.5, 40, rng=rng)
+    humans.quarantined[3] = True
+    history = History(["inf", "rec", "suc"], capacity=4)
+    for step in range(11):
+        sim.calculate_movement(humans, 0.0001, energy, rng=rng)
+        history.append(step, humans.status_counts())
+    path = save_checkpoint(tmp_path / "run.npz", humans, energy, rng, history, steps=11,
+                           series={"counts": np.arange(6)})
+
+    state = load_checkpoint(path)
+    restored = state["humans"]
+    for name in Population.columns:
+        assert np.array_equal(getattr(restored, name), getattr(humans, name))
+        assert getattr(restored, name).dtype == getattr(humans, name).dtype
+    assert np.array_equal(restored.counts, humans.counts)
+    assert state["energy"] == energy and state["steps"] == 11
+    assert np.array_equal(state["series"]["counts"], np.arange(6))
+    assert state["rng"].random() == rng.random()
+    assert state["history"].stride == history.stride
+    for kind in ("mean", "min", "max"):
+        assert np.array_equal(state["history"].curves(kind)[1], history.curves(kind)[1])
+    history.append(11, [1, 2, 3])
+    state["history"].append(11, [1, 2, 3])
+    assert np.array_equal(state["history"].curves()[0], history.curves()[0])
+
+
+def test_restored_simulation_continues_like_the_original(tmp_path):
+    rng = np.random.default_rng(1)
+    humans, energy = init.init_sys(10000, 0.5, 40, infection_radius=10, rng=rng)
+    path = save_checkpoint(tmp_path / "run.npz", humans, energy, rng)
+    state = load_checkpoint(path)
+    for _ in range(50):
+        sim.calculate_movement(humans, 0.0001, energy, rng=rng)
+        sim.calculate_movement(state["humans"], 0.0001, state["energy"], rng=state["rng"])
+    assert np.array_equal(humans.x, state["humans"].x)
+    assert np.array_equal(humans.status, state["humans"].status)
+
+
+def test_interrupted_run_resumes_from_the_checkpoint(tmp_path):
+    config = {"number_of_humans": 40, "infection_radius": 10, "prob": 0.3, "seed": 4}
+    whole = run(config, 120, tmp_path / "whole.npz", 50)
+    # the first run is stopped after 70 steps, the checkpoint of step 50 is left
+    run(config, 70, tmp_path / "stopped.npz", 50)
+    assert load_checkpoint(tmp_path / "stopped.npz")["steps"] == 50
+    resumed = run(config, 120, tmp_path / "stopped.npz", 50)
+    for name in whole:
+        assert np.array_equal(whole[name], resumed[name])
+
+
+def test_config_and_energies_of_patches_are_kept(tmp_path):
+    humans, _ = init.init_sys(10000, 0.5, 10, rng=np.random.default_rng(0))
+    config = {"scenario": "cities", "inputs": [1.0, 10.0, 15, 10000.0]}
+    path = save_checkpoint(tmp_path / "cities.npz", humans, [1.5, 2.5, 3.5], config=config)
+    state = load_checkpoint(path)
+    assert state["config"] == config
+    assert np.array_equal(state["energy"], [1.5, 2.5, 3.5])
+    assert load_checkpoint(save_checkpoint(tmp_path / "run.npz", humans, 2.0))["config"] is None
+
+
+def test_run_refuses_a_checkpoint_of_another_config(tmp_path):
+    config = {"number_of_humans": 30, "seed": 4}
+    run(config, 20, tmp_path / "run.npz", 10)
+    with pytest.raises(ValueError, match="number_of_humans 30 instead of 50"):
+        run({**config, "number_of_humans": 50}, 40, tmp_path / "run.npz", 10)
+    with pytest.raises(ValueError, match="model 'basic' instead of 'randomwalk'"):
+        run({**config, "model": "randomwalk"}, 40, tmp_path / "run.npz", 10)
+
+
+def test_run_refuses_a_checkpoint_it_did_not_write(tmp_path):
+    rng = np.random.default_rng(0)
+    humans, energy = init.init_sys(10000, 0.5, 50, rng=rng)
+    path = save_checkpoint(tmp_path / "notebook.npz", humans, energy, rng)
+    with pytest.raises(ValueError, match="not written by run"):
+        run({}, 40, path, 10)
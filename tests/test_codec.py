@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+import pytest
+
+import src.init as init
+import src.simulation as sim
+from src.codec import decode_chunk, encode_chunk, pack_codes, unpack_codes
+from src.trajectory import Trajectory, TrajectoryWriter
+
+
+def test_codes_are_packed_into_two_bits():
+    codes = np.random.default_rng(0).integers(0, 3, (4, 13)).astype(np.int8)
+    packed = pack_codes(codes)
+    assert packed.shape == (4, 4) and packed.dtype == np.uint8
+    assert np.array_equal(unpack_codes(packed, 13), codes)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_chunk_is_lossless_at_the_simulation_precision(compress):
+    rng = np.random.default_rng(1)
+    x = np.round(rng.uniform(0, 100, (6, 50)), 3)
+    x[3, 7] = 99.999  # a jump that does not fit into int16 differences
+    x[2, 7] = 0.001
+    x[4, 9] = 1 / 3  # a position that is not a multiple of 1/1000
+    columns = {
+        "x": x,
+        "y": np.round(np.cumsum(rng.normal(0, 0.1, (6, 50)), axis=0) + 50, 3),
+        "status": rng.integers(0, 3, (6, 50)).astype(np.int8),
+        "quarantined": rng.random((6, 50)) < 0.5,
+        "vx": rng.normal(0, 1000, (6, 50)),
+    }
+    decoded = decode_chunk(encode_chunk(columns, compress), compress)
+    for name, values in columns.items():
+        assert np.array_equal(decoded[name], values), name
+        assert decoded[name].dtype == values.dtype
+
+
+def test_encoded_trajectory_matches_the_raw_one_and_is_smaller(tmp_path):
+    rng = np.random.default_rng(2)
+    # the initial positions are not rounded to the precision of the simulation
+    humans, energy = init.init_sys(10000, 1, 400, rng=rng)
+    raw = TrajectoryWriter(tmp_path / "raw", 400, chunk_size=16)
+    encoded = TrajectoryWriter(tmp_path / "encoded", 400, chunk_size=16, codec="delta", compress=True)
+    for _ in range(40):
+        raw.record(humans)
+        encoded.record(humans)
+        sim.calculate_movement(humans, 0.0001, energy, rng=rng)
+    raw.close()
+    encoded.close()
+
+    raw = Trajectory(tmp_path / "raw")
+    encoded = Trajectory(tmp_path / "encoded")
+    assert len(encoded) == 40
+    assert np.array_equal(encoded.time, raw.time)
+    for name in ("x", "y", "status"):
+        assert np.array_equal(encoded[name], raw[name])
+    for index in (0, 17, 39, 16):
+        assert np.array_equal(encoded.frame(index)["x"], raw.frame(index)["x"])
+
+    def size(path):
+        return sum(os.path.getsize(path / name) for name in os.listdir(path) if name.endswith(".bin"))
+    assert size(tmp_path / "encoded") * 4 < size(tmp_path / "raw")
@@ -0,0 +1,71 @@
+import shutil
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import src.init as init
+import src.simulation as sim
+import src.export as export
+from src.export import export_run, export_trajectory
+from src.trajectory import TrajectoryWriter
+
+
+def record(path, frames=12):
+    rng = np.random.default_rng(5)
+    humans, energy = init.init_sys(10000, 1, 20, rng=rng)
+    with TrajectoryWriter(path, 20, chunk_size=5) as writer:
+        for _ in range(frames):
+            writer.record(humans)
+            sim.calculate_movement(humans, 0.0001, energy, rng=rng)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_gif_has_every_frame_in_order(tmp_path, processes):
+    record(tmp_path / "run")
+    out = export_trajectory(tmp_path / "run", tmp_path / "run.gif", every=2,
+                            processes=processes, dpi=30)
+    with Image.open(out) as video:
+        assert video.n_frames == 6
+    if processes == 2:
+        single = export_trajectory(tmp_path / "run", tmp_path / "single.gif", every=2,
+                                   processes=1, dpi=30)
+        assert (tmp_path / "run.gif").read_bytes() == (tmp_path / single).read_bytes()
+
+
+def test_export_of_a_new_run(tmp_path):
+    out = export_run({"number_of_humans": 15, "seed": 1}, 20, tmp_path / "run.gif",
+                     stride=5, processes=1, dpi=30)
+    with Image.open(out) as video:
+        assert video.n_frames == 5
+
+
+def test_export_records_the_quarantine(tmp_path, monkeypatch):
+    layouts = []
+    original = export.Replay
+
+    def remember(*args, **kwargs):
+        viewer = original(*args, **kwargs)
+        layouts.append(viewer.view_quarantine is not None)
+        return viewer
+
+    monkeypatch.setattr(export, "Replay", remember)
+    export.main([str(tmp_path / "run.gif"), "--humans", "15", "--steps", "10", "--stride", "5",
+                 "--detection-probability", "0.5", "--processes", "1", "--dpi", "30"])
+    assert layouts and all(layouts)
+    with Image.open(tmp_path / "run.gif") as video:
+        assert video.n_frames == 3
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_mp4_is_written_with_ffmpeg(tmp_path):
+    record(tmp_path / "run")
+    out = export_trajectory(tmp_path / "run", tmp_path / "run.mp4", processes=1, dpi=30)
+    assert (tmp_path / "run.mp4").stat().st_size > 0 and out.endswith(".mp4")
+
+
+def test_mp4_without_ffmpeg_is_explained(tmp_path, monkeypatch):
+    record(tmp_path / "run", frames=2)
+    monkeypatch.setattr(shutil, "which", lambda name: None)
+    with pytest.raises(RuntimeError, match="ffmpeg"):
+        export_trajectory(tmp_path / "run", tmp_path / "run.mp4", processes=1, dpi=30)
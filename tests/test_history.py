@@ -0,0 +1,46 @@
+import numpy as np
+
+from src.history import History
+
+
+def test_history_keeps_every_state_until_full():
+    history = History(["a", "b"], capacity=8)
+    for t in range(5):
+        history.append(t * 0.1, (t, 10 - t))
+    time, values = history.curves()
+    assert np.allclose(time, np.arange(5) * 0.1)
+    assert np.array_equal(values, [np.arange(5), 10 - np.arange(5)])
+    assert np.array_equal(history["b"], 10 - np.arange(5))
+
+
+def test_history_stays_bounded_and_summarises_buckets():
+    history = History(["a"], capacity=16)
+    n = 1000
+    for t in range(n):
+        history.append(float(t), (t,))
+    assert len(history) <= history.capacity
+    assert history.recorded == n
+    assert history.stride == 64
+    time, mean = history.curves()
+    _, low = history.curves("min")
+    _, high = history.curves("max")
+    stride = history.stride
+    # every complete bucket summarises stride consecutive states
+    for b in range(history.size):
+        states = np.arange(b * stride, (b + 1) * stride)
+        assert time[b] == states[0]
+        assert mean[0, b] == states.mean()
+        assert low[0, b] == states.min()
+        assert high[0, b] == states.max()
+    # the bucket that is still being filled holds the rest
+    assert high[0, -1] == n - 1
+    assert np.isclose(mean[0, -1], np.arange(history.size * stride, n).mean())
+
+
+def test_history_keeps_the_peak():
+    history = History(["inf"], capacity=10)
+    values = np.sin(np.linspace(0, np.pi, 777)) * 100
+    for t, v in enumerate(values):
+        history.append(t, (v,))
+    _, high = history.curves("max")
+    assert np.max(high) == np.max(values)
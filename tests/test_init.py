@@ -0,0 +1,43 @@
+import time
+
+import numpy as np
+import pytest
+
+import src.init as init
+from src.human import Group
+from src.population import Population
+
+
+def standard_population(n, prob=0.8):
+    humans = Population(n)
+    humans.infection_radius[:] = 5
+    humans.infection_probability[:] = prob
+    return humans
+
+
+def test_groups_are_disjoint_and_scaled():
+    rng = np.random.default_rng(0)
+    humans = standard_population(1000)
+    init.make_vulnerable(humans, 1000, 300, 5, 0.8, rng)
+    init.wear_mask(humans, 1000, 700, 5, 0.8, rng)
+    assert list(humans.counts.sum(axis=1)) == [0, 700, 300]
+    vulnerable = humans.group == Group.VULNERABLE.value
+    mask = humans.group == Group.MASK.value
+    assert abs(np.mean(humans.infection_radius[vulnerable]) - 5 * 1.9) < 0.2
+    assert abs(np.mean(humans.infection_radius[mask]) - 5 * 0.45) < 0.2
+    assert np.all(humans.infection_probability[vulnerable] <= 0.99)
+
+
+def test_whole_large_population_is_assigned_at_once():
+    humans = standard_population(200000)
+    start = time.perf_counter()
+    init.wear_mask(humans, 200000, 200000, 5, 0.8, np.random.default_rng(1))
+    assert time.perf_counter() - start < 1
+    assert np.all(humans.group == Group.MASK.value)
+
+
+def test_too_many_humans_for_a_group_fail():
+    humans = standard_population(10)
+    init.make_vulnerable(humans, 10, 6, 5, 0.8)
+    with pytest.raises(ValueError, match="only 4"):
+        init.wear_mask(humans, 10, 5, 5, 0.8)
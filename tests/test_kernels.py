@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+import src.kernels as kernels
+import src.simulation as sim
+from src.human import Status
+from src.neighbours import CellGrid
+from src.population import Population
+
+
+def random_pairs(n=150, seed=4):
+    rng = np.random.default_rng(seed)
+    x = rng.random(n) * 30
+    y = rng.random(n) * 30
+    radius = rng.uniform(0.5, 2, n)
+    i, j, dist = CellGrid(x, y, 6, 30).pairs(6)
+    return x, y, radius, i, j, dist
+
+
+def test_loop_forces_match_numpy_forces():
+    x, y, radius, i, j, dist = random_pairs()
+    ax = np.zeros(len(x))
+    ay = np.zeros(len(x))
+    kernels._pair_forces_numpy(x, y, radius, i, j, dist, ax, ay, sim.epsilon, sim.sigma)
+    loop_ax = np.zeros(len(x))
+    loop_ay = np.zeros(len(x))
+    kernels._pair_forces_loop(x, y, radius, i, j, dist, loop_ax, loop_ay, sim.epsilon, sim.sigma)
+    assert np.any(ax)
+    assert np.allclose(ax, loop_ax)
+    assert np.allclose(ay, loop_ay)
+
+
+def test_loop_candidates_match_numpy_candidates():
+    x, y, radius, i, j, dist = random_pairs()
+    rng = np.random.default_rng(1)
+    status = rng.integers(0, 3, len(x)).astype(np.int8)
+    infection_radius = rng.uniform(0, 6, len(x))
+    target = np.concatenate((i, j))
+    source = np.concatenate((j, i))
+    dist = np.concatenate((dist, dist))
+    args = (status, infection_radius, target, source, dist,
+            Status.SUCEPTIBLE.value, Status.INFECTED.value)
+    numpy_target, numpy_source = kernels._infection_candidates_numpy(*args)
+    loop_target, loop_source = kernels._infection_candidates_loop(*args)
+    assert len(numpy_target) > 0
+    assert np.array_equal(numpy_target, loop_target)
+    assert np.array_equal(numpy_source, loop_source)
+
+
+def test_set_backend_checks_the_name():
+    with pytest.raises(ValueError):
+        kernels.set_backend("fortran")
+    if "numba" not in kernels.backends:
+        with pytest.raises(ImportError):
+            kernels.set_backend("numba")
+    assert kernels.backend in kernels.backends
+
+
+def test_backends_give_the_same_movement():
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(2)
+    humans = Population(300)
+    humans.x[:] = rng.random(300) * 100
+    humans.y[:] = rng.random(300) * 100
+    humans.vx[:] = rng.normal(0, 3000, 300)
+    humans.radius[:] = 1.5
+    humans.infection_radius[:] = 5
+    humans.infection_probability[:] = 0.5
+    humans.infect([0, 1, 2])
+    other = humans.take(np.arange(300))
+    energy = humans.energy()
+    previous = kernels.backend
+    try:
+        for backend, population in (("numpy", humans), ("numba", other)):
+            kernels.set_backend(backend)
+            step_rng = np.random.default_rng(3)
+            for _ in range(20):
+                sim.calculate_movement(population, 0.0001, energy, rng=step_rng)
+    finally:
+        kernels.set_backend(previous)
+    assert np.allclose(humans.x, other.x)
+    assert np.array_equal(humans.status, other.status)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import src.simulation as sim
+from src.metapopulation import Metapopulation
+from src.population import Population
+
+
+def test_patches_move_like_separate_populations(moving_population):
+    patches = [moving_population(80, seed) for seed in range(5)]
+    energies = [p.energy() for p in patches]
+    metapopulation = Metapopulation.from_patches(patches, energies)
+    assert metapopulation.tiles == 3
+    for _ in range(30):
+        metapopulation.step(0.0001)
+        for patch, energy in zip(patches, energies):
+            sim.calculate_movement(patch, 0.0001, energy)
+    humans = metapopulation.humans
+    for k, patch in enumerate(patches):
+        rows = metapopulation.patch_rows(k)
+        assert np.allclose(humans.x[rows], patch.x)
+        assert np.allclose(humans.vy[rows], patch.vy)
+
+
+def test_infection_stays_inside_a_patch(moving_population):
+    first = moving_population(50, 1)
+    second = first.take(np.arange(50))
+    first.infection_probability[:] = 1
+    first.infect(np.arange(50))
+    second.infection_probability[:] = 1
+    metapopulation = Metapopulation.from_patches([first, second], [1, 1])
+    for _ in range(5):
+        metapopulation.step(0.0001, np.random.default_rng(0))
+    # the humans of the second patch stand on the same spots, but elsewhere
+    assert list(metapopulation.patch_counts()[:, 1]) == [50, 0]
+
+
+def test_migration_follows_the_matrix():
+    humans = Population(30000)
+    humans.patch[:] = np.arange(30000) % 3
+    migration = [[0, 0.2, 0.1], [0, 0, 0], [0.5, 0, 0]]
+    metapopulation = Metapopulation(humans, [0, 0, 0], migration, migration_interval=1)
+    before = humans.patch.copy()
+    movers = metapopulation.migrate(np.random.default_rng(4))
+    after = humans.patch
+    assert np.all(after[before == 1] == 1)
+    assert np.all(after[movers] != before[movers])
+    from_first = after[before == 0]
+    assert abs(np.mean(from_first == 1) - 0.2) < 0.02
+    assert abs(np.mean(from_first == 2) - 0.1) < 0.02
+    assert abs(np.mean(after[before == 2] == 0) - 0.5) < 0.02
+    assert metapopulation.migrations == len(movers)
+
+
+def test_migration_matrix_is_checked():
+    with pytest.raises(ValueError):
+        Metapopulation(Population(3), [1, 1], [[0, 0.7], [1.2, 0]])
+    with pytest.raises(ValueError):
+        Metapopulation(Population(3), [1, 1, 1], np.zeros((2, 2)))
+
+
+def test_hundreds_of_patches_in_one_pass():
+    rng = np.random.default_rng(2)
+    humans = Population(20000)
+    humans.x[:] = rng.uniform(1, 99, 20000)
+    humans.y[:] = rng.uniform(1, 99, 20000)
+    humans.radius[:] = 0.5
+    humans.patch[:] = rng.integers(0, 400, 20000)
+    humans.infection_radius[:] = 2
+    humans.infect(np.arange(20))
+    migration = np.full((400, 400), 0.001)
+    metapopulation = Metapopulation(humans, np.full(400, 1e6), migration, migration_interval=2)
+    for _ in range(4):
+        metapopulation.step(0.0001, rng)
+    assert metapopulation.migrations > 0
+    assert metapopulation.patch_counts().sum() == 20000
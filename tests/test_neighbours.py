@@ -0,0 +1,142 @@
+import numpy as np
+import pytest
+
+import src.simulation as sim
+from src.neighbours import CellGrid, NeighbourList, radius_pairs
+from src.population import Population
+
+
+def brute_force_pairs(x, y, cutoff):
+    """all pairs i < j closer than cutoff, found with an O(N²) scan"""
+    dist = np.hypot(x[:, None] - x, y[:, None] - y)
+    i, j = np.nonzero(np.triu(dist < cutoff, 1))
+    return set(zip(i.tolist(), j.tolist()))
+
+
+def brute_force_accelerations(humans):
+    """accelerations of the Lennard-Jones forces, found with an O(N²) scan"""
+    ax = np.zeros(len(humans))
+    ay = np.zeros(len(humans))
+    for i in range(len(humans)):
+        for j in range(i + 1, len(humans)):
+            dx = humans.x[i] - humans.x[j]
+            dy = humans.y[i] - humans.y[j]
+            dist = np.hypot(dx, dy)
+            if 0 < dist < 3 * humans.radius[i]:
+                ljp = sim.lennard_jones(dist)
+                ax[i] += ljp * dx / dist
+                ay[i] += ljp * dy / dist
+                ax[j] -= ljp * dx / dist
+                ay[j] -= ljp * dy / dist
+    return ax, ay
+
+
+def random_population(n, radius, seed=0):
+    rng = np.random.default_rng(seed)
+    humans = Population(n)
+    humans.x[:] = rng.random(n) * 100
+    humans.y[:] = rng.random(n) * 100
+    humans.radius[:] = radius
+    return humans
+
+
+@pytest.mark.parametrize("n, cutoff", [(500, 4.5), (300, 30), (50, 120), (2000, 1.0), (1, 3)])
+def test_pairs_match_brute_force(n, cutoff):
+    rng = np.random.default_rng(n)
+    x = rng.random(n) * 100
+    y = rng.random(n) * 100
+    i, j, dist = CellGrid(x, y, cutoff).pairs(cutoff)
+    assert np.all(i < j)
+    assert len(i) == len(set(zip(i.tolist(), j.tolist())))
+    assert set(zip(i.tolist(), j.tolist())) == brute_force_pairs(x, y, cutoff)
+    assert np.allclose(dist, np.hypot(x[i] - x[j], y[i] - y[j]))
+
+
+def test_forces_match_brute_force():
+    humans = random_population(300, 1.5)
+    ax, ay = brute_force_accelerations(humans)
+    sim.calculate_interactions(humans)
+    assert np.allclose(humans.ax, ax)
+    assert np.allclose(humans.ay, ay)
+
+
+def test_empty_population():
+    humans = Population()
+    sim.calculate_interactions(humans)
+    assert len(humans.ax) == 0
+    i, j, dist = CellGrid(humans.x, humans.y, 4.5).pairs(4.5)
+    assert len(i) == 0
+
+
+def test_zero_radius_has_no_forces():
+    humans = random_population(50, 0.0)
+    sim.calculate_interactions(humans)
+    assert not np.any(humans.ax) and not np.any(humans.ay)
+
+
+def test_tiny_cutoff_keeps_grid_small():
+    humans = random_population(50, 0.001)
+    grid = CellGrid(humans.x, humans.y, 0.003)
+    assert grid.cells_per_axis ** 2 <= 64
+    ax, ay = brute_force_accelerations(humans)
+    sim.calculate_interactions(humans)
+    assert np.allclose(humans.ax, ax)
+
+
+@pytest.mark.parametrize("n", [0, 1, 400, 2000])
+def test_radius_pairs_match_brute_force(n):
+    rng = np.random.default_rng(n)
+    x = rng.random(n) * 100
+    y = rng.random(n) * 100
+    # mix of standard, mask and vulnerable radii like in the mask scenario
+    radius = 5 * rng.choice([0.45, 1, 1.9], n) * rng.normal(1, 0.2, n)
+    radius[:n // 20] = 0
+    i, j, dist = radius_pairs(x, y, radius)
+    full = np.hypot(x[:, None] - x, y[:, None] - y)
+    bi, bj = np.nonzero((full < radius[:, None]) & ~np.eye(n, dtype=bool))
+    assert len(i) == len(bi)
+    assert set(zip(i.tolist(), j.tolist())) == set(zip(bi.tolist(), bj.tolist()))
+    assert np.allclose(dist, full[i, j])
+
+
+def test_neighbour_list_rebuilds_only_after_large_moves():
+    humans = random_population(400, 1.5)
+    neighbours = NeighbourList(skin=1.0)
+    rng = np.random.default_rng(7)
+    for step in range(30):
+        neighbours.update(humans, 4.5)
+        i, j, dist = neighbours.pairs(humans)
+        assert set(zip(i.tolist(), j.tolist())) == brute_force_pairs(humans.x, humans.y, 4.5)
+        humans.x += rng.uniform(-0.05, 0.05, len(humans))
+        humans.y += rng.uniform(-0.05, 0.05, len(humans))
+    assert neighbours.steps == 30
+    # humans move at most 0.07 per step, so 0.5 is only exceeded after 7 steps
+    assert 1 < neighbours.rebuilds <= 30 // 7 + 1
+    assert "rebuilds" in neighbours.report()
+
+
+def test_neighbour_list_rebuilds_after_rows_change():
+    humans = random_population(100, 1.5)
+    neighbours = NeighbourList()
+    neighbours.update(humans, 4.5)
+    humans.delete([0])
+    humans.extend(random_population(1, 1.5, seed=1))
+    neighbours.update(humans, 4.5)
+    assert neighbours.rebuilds == 2
+    neighbours.update(humans, 6)
+    assert neighbours.rebuilds == 3
+
+
+def test_movement_with_neighbour_list_matches_grid():
+    humans = random_population(300, 1.5)
+    humans.vx[:] = 3000
+    humans.infection_radius[:] = 5
+    other = humans.take(np.arange(len(humans)))
+    neighbours = NeighbourList()
+    energy = humans.energy()
+    for _ in range(10):
+        sim.calculate_movement(humans, 0.0001, energy, neighbours=neighbours)
+        sim.calculate_movement(other, 0.0001, energy)
+    assert np.allclose(humans.x, other.x)
+    assert np.allclose(humans.vx, other.vx)
+    assert neighbours.rebuilds < neighbours.steps
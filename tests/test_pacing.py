@@ -0,0 +1,54 @@
+from src.pacing import FramePacer
+
+
+class FakeClock:
+    """clock that only moves when a step is calculated"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_steps_fill_the_budget():
+    clock = FakeClock()
+    pacer = FramePacer(budget=0.0105, clock=clock)
+
+    def step():
+        clock.now += 0.001
+
+    assert pacer.advance(step) == 10
+    assert pacer.advance(step) == 10
+    assert pacer.steps == 20
+    assert pacer.render
+    steps_per_second, frames_per_second = pacer.rates()
+    assert abs(steps_per_second - 1000) < 1e-6
+    assert abs(frames_per_second - 100) < 1e-6
+
+
+def test_max_steps_limits_a_frame():
+    clock = FakeClock()
+    pacer = FramePacer(budget=1, max_steps=3, clock=clock)
+
+    def step():
+        clock.now += 0.001
+
+    assert pacer.advance(step) == 3
+
+
+def test_slow_steps_skip_rendering_but_not_forever():
+    clock = FakeClock()
+    pacer = FramePacer(budget=0.01, max_skipped=2, clock=clock)
+
+    def step():
+        clock.now += 0.05
+
+    rendered = []
+    for _ in range(6):
+        assert pacer.advance(step) == 1
+        rendered.append(pacer.render)
+    assert rendered == [False, False, True, False, False, True]
+    assert pacer.skipped == 4
+    assert pacer.frames == 2
+    assert "frames skipped" in pacer.report()
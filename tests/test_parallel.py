@@ -0,0 +1,100 @@
+import multiprocessing
+import threading
+import numpy as np
+import pytest
+
+import src.simulation as sim
+from src.neighbours import NeighbourList
+from src.parallel import ParallelCities, SharedPopulation
+from src.population import Population
+
+
+def test_shared_population_keeps_the_columns(moving_population):
+    humans = moving_population(30, 0, infected=5)
+    block = SharedPopulation(50)
+    try:
+        block.store(humans)
+        view = block.view(30)
+        assert np.array_equal(view.x, humans.x)
+        assert view.status.dtype == np.int8
+        assert np.array_equal(view.status_counts(), humans.status_counts())
+        with pytest.raises(ValueError):
+            block.store(Population(51))
+        del view
+    finally:
+        block.close(unlink=True)
+
+
+def test_cities_step_like_separate_populations(moving_population):
+    cities = [moving_population(60, seed, infected=5) for seed in range(3)]
+    energies = [c.energy() for c in cities]
+    with ParallelCities(cities, energies, migration_interval=10, seed=4) as parallel:
+        parallel.step(25)
+        result = parallel.populations()
+        counts = parallel.status_counts()
+    streams = np.random.SeedSequence(4).spawn(len(cities) + 1)
+    for city, energy, stream, humans in zip(cities, energies, streams, result):
+        rng = np.random.default_rng(stream)
+        neighbours = NeighbourList()
+        for _ in range(25):
+            sim.calculate_movement(city, 0.0001, energy, 100, neighbours, rng)
+        assert np.allclose(humans.x, city.x)
+        assert np.array_equal(humans.status, city.status)
+    assert np.array_equal(counts, [c.status_counts() for c in cities])
+
+
+def test_migration_keeps_every_human(moving_population):
+    cities = [moving_population(40, seed, infected=5) for seed in range(3)]
+    migration = np.full((3, 3), 0.2)
+    with ParallelCities(cities, [c.energy() for c in cities], migration,
+                        migration_interval=5, capacity=120, seed=1) as parallel:
+        parallel.step(20)
+        result = parallel.populations()
+        assert parallel.migrations > 0
+        assert parallel.status_counts().sum() == 120
+    assert sum(len(humans) for humans in result) == 120
+    assert np.array_equal(np.sort(np.concatenate([h.radius for h in result])), np.full(120, 1.5))
+
+
+def test_full_city_raises(moving_population):
+    cities = [moving_population(20, 0, infected=5), moving_population(20, 1, infected=5)]
+    migration = [[0, 1], [0, 0]]
+    with ParallelCities(cities, [c.energy() for c in cities], migration,
+                        migration_interval=1, capacity=20) as parallel:
+        with pytest.raises(RuntimeError):
+            parallel.step(1)
+        assert [len(h) for h in parallel.populations()] == [20, 20]
+
+
+def fail_second_city(humans, *args):
+    if len(humans) == 30:
+        raise ValueError("the city failed")
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                    reason="the workers only see the patched module when they are forked")
+def test_failing_worker_reaches_the_caller(monkeypatch, moving_population):
+    monkeypatch.setattr(sim, "calculate_movement", fail_second_city)
+    cities = [moving_population(20, 0), moving_population(30, 1)]
+    parallel = ParallelCities(cities, [c.energy() for c in cities], seed=0)
+    try:
+        with pytest.raises(threading.BrokenBarrierError, match=r"\[1\]"):
+            parallel.step(1)
+    finally:
+        parallel.close()
+    assert parallel.workers == [] and parallel.blocks == [] and parallel.control is None
+
+
+class FailingProcess(multiprocessing.Process):
+    def start(self):
+        if self._args[0] == 1:
+            raise OSError("no more processes")
+        super().start()
+
+
+def test_partial_start_is_cleaned_up(monkeypatch, moving_population):
+    monkeypatch.setattr(multiprocessing, "Process", FailingProcess)
+    cities = [moving_population(20, 0), moving_population(20, 1)]
+    with pytest.raises(OSError):
+        ParallelCities(cities, [c.energy() for c in cities], seed=0)
+    assert not [p for p in multiprocessing.active_children() if isinstance(p, FailingProcess)]
@@ -0,0 +1,54 @@
+import time
+
+import numpy as np
+import pytest
+
+import src.init as init
+from src.neighbours import CellGrid
+from src.placement import lattice_capacity, place_humans, place_on_lattice
+
+
+def assert_no_overlap(x, y, min_distance, world_limit=100):
+    i, j, dist = CellGrid(x, y, 2 * min_distance, world_limit).pairs(2 * min_distance - 1e-9)
+    assert len(i) == 0
+    assert np.all((x >= min_distance) & (x <= world_limit - min_distance))
+    assert np.all((y >= min_distance) & (y <= world_limit - min_distance))
+
+
+@pytest.mark.parametrize("n", [1, 50, 500, 1000])
+def test_humans_do_not_overlap(n):
+    x, y = place_humans(n, 1.5, rng=np.random.default_rng(n))
+    assert len(x) == n
+    assert_no_overlap(x, y, 1.5)
+
+
+def test_sparse_placement_is_uniform():
+    x, y = place_humans(4000, 0.2, rng=np.random.default_rng(0))
+    counts, _, _ = np.histogram2d(x, y, bins=4, range=[[0, 100], [0, 100]])
+    assert np.all(np.abs(counts - 250) < 60)
+
+
+def test_full_world_uses_the_lattice():
+    square, hexagonal = lattice_capacity(1.5)
+    assert hexagonal > square
+    x, y = place_humans(hexagonal, 1.5, rng=np.random.default_rng(1))
+    assert len(x) == hexagonal
+    assert_no_overlap(x, y, 1.5)
+    x, y = place_on_lattice(square, 1.5, 100, np.random.default_rng(2))
+    assert_no_overlap(x, y, 1.5)
+
+
+def test_too_many_humans_fail_fast():
+    start = time.perf_counter()
+    with pytest.raises(ValueError, match="at most"):
+        init.init_sys(10000, 1, 3000)
+    assert time.perf_counter() - start < 1
+
+
+def test_many_humans_are_placed_quickly():
+    start = time.perf_counter()
+    humans, energy = init.init_sys(10000, 1, 100000, min_distance=0.1,
+                                   rng=np.random.default_rng(3))
+    assert time.perf_counter() - start < 10
+    assert len(humans) == 100000
+    assert_no_overlap(humans.x, humans.y, 0.1)
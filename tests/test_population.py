@@ -0,0 +1,148 @@
+import numpy as np
+
+import src.init as init
+from src.human import Group, Human, Status
+from src.population import Population
+
+
+def make_population(n=6):
+    """creates a population whose columns can be told apart by row"""
+    population = Population(n)
+    for k, name in enumerate(Population.columns):
+        if name in ("status", "group"):
+            getattr(population, name)[:] = np.arange(n) % 3
+        elif name == "quarantined":
+            population.quarantined[:] = np.arange(n) % 2 == 1
+        else:
+            getattr(population, name)[:] = np.arange(n) + 100 * k
+    population.recount()
+    return population
+
+
+def assert_rows_aligned(population):
+    """every row still holds the values of a single original row"""
+    rows = population.x.astype(int)
+    for k, name in enumerate(Population.columns):
+        if name in ("status", "group"):
+            expected = rows % 3
+        elif name == "quarantined":
+            expected = rows % 2 == 1
+        else:
+            expected = rows + 100 * k
+        assert np.array_equal(getattr(population, name), expected)
+
+
+def test_take_delete_extend_keep_rows_aligned():
+    population = make_population()
+    taken = population.take([1, 4])
+    assert isinstance(taken, Population)
+    assert list(taken.x) == [1, 4]
+    assert_rows_aligned(taken)
+
+    population.delete(np.array([True, False, False, True, False, False]))
+    assert list(population.x) == [1, 2, 4, 5]
+    assert_rows_aligned(population)
+
+    population.extend(make_population(1))
+    assert list(population.x) == [1, 2, 4, 5, 0]
+    assert_rows_aligned(population)
+
+
+def test_update_matches_human_update():
+    locations = [(0.5, 50), (99.8, 50), (50, 0.2), (50, 99.9), (40, 60), (30.1234, 70.5678)]
+    velocities = [(-1, 2), (3, -1), (1, -4), (2, 5), (-1, -1), (1, 1)]
+    new_locations = [(-2, 50), (101, 51), (49, -3), (52, 104), (41.23456, 59), (31.98765, 71.1)]
+    new_velocities = [(-2, 1), (4, 2), (-1, -5), (3, 6), (-2, -3), (2, 2)]
+    statuses = [Status.INFECTED, Status.INFECTED, Status.SUCEPTIBLE,
+                Status.RECOVERED, Status.INFECTED, Status.SUCEPTIBLE]
+    times = [1, 5, 0, 0, 200, 0]
+
+    humans = [Human(l, v, radius=1.5, status=s, time_till_recovery=t)
+              for l, v, s, t in zip(locations, velocities, statuses, times)]
+    population = Population.from_humans(humans)
+
+    for h, l, v in zip(humans, new_locations, new_velocities):
+        h.update(l, v)
+    population.update(*np.array(new_locations).T, *np.array(new_velocities).T)
+
+    for h, p in zip(humans, population):
+        assert np.allclose(p.location, h.location)
+        assert np.allclose(p.velocity, h.velocity)
+        assert p.status == h.status
+        assert p.time_till_recovery == h.time_till_recovery
+    assert population[0].is_recovered()
+    assert population[1].is_infected()
+
+
+def test_status_counts_match_views():
+    population = make_population(10)
+    counts = [0] * len(Status)
+    for h in population:
+        counts[h.status.value] += 1
+    assert list(population.status_counts()) == counts
+
+
+def test_standalone_human_round_trip():
+    h = Human((5, 5), (1, 2))
+    assert np.array_equal(h.location, [5, 5])
+    assert h.status == Status.SUCEPTIBLE
+    h.infect(time_till_recovery=10)
+    assert h.is_infected()
+    assert h.time_till_recovery == 10
+    h.location = (200, 0)
+    assert np.array_equal(h.location, [100 - h.radius, h.radius])
+
+
+def test_views_write_through_to_columns():
+    population = Population(3)
+    population.x[:] = 50
+    population.y[:] = 50
+    population.radius[:] = 1.5
+    population[-1].infect()
+    assert population.status[2] == Status.INFECTED.value
+    population[0].velocity = (7, 8)
+    assert (population.vx[0], population.vy[0]) == (7, 8)
+
+
+def assert_counts_match_columns(population):
+    """the counts kept up to date equal a full recount"""
+    counts = population.counts.copy()
+    population.recount()
+    assert np.array_equal(counts, population.counts)
+
+
+def test_counts_follow_every_change():
+    population = make_population(12)
+    population.x[:] = 50
+    population.y[:] = 50
+    population.radius[:] = 1.5
+    assert_counts_match_columns(population)
+
+    population.infect([0, 3, 3, 4])
+    population[5].status = Status.RECOVERED
+    population[6].infect()
+    population.set_group(np.array([True, False] * 6), Group.MASK.value)
+    assert_counts_match_columns(population)
+
+    population.time_till_recovery[:] = 1
+    population.update(population.x, population.y, population.vx, population.vy)
+    assert population.status_counts()[Status.INFECTED.value] == 0
+    assert_counts_match_columns(population)
+
+    other = population.take([1, 2, 7])
+    assert_counts_match_columns(other)
+    population.delete([1, 2, 7])
+    assert_counts_match_columns(population)
+    population.extend(other)
+    assert_counts_match_columns(population)
+    assert population.counts.sum() == 12
+
+
+def test_groups_are_counted_separately():
+    rng = np.random.default_rng(3)
+    humans, energy = init.init_sys(10000, 0.5, 40, infection_radius=5, rng=rng)
+    humans = init.make_vulnerable(humans, 40, 10, 5, 0.5, rng)
+    humans = init.wear_mask(humans, 40, 5, 5, 0.5, rng)
+    assert list(humans.counts.sum(axis=1)) == [25, 5, 10]
+    assert humans.counts[Group.STANDARD.value].sum() == np.sum(humans.infection_radius == 5)
+    assert_counts_match_columns(humans)
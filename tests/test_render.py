@@ -0,0 +1,72 @@
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+import src.render as render
+from src.pacing import FramePacer
+from src.population import Population
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_stack_view_stacks_series():
+    fig, subplot = plt.subplots()
+    view = render.StackView(subplot, render.sir_colors, 10)
+    bands = view.update([0, 1, 2], [[1, 2, 3], [0, 1, 1], [9, 7, 6]])
+    assert len(bands) == 3
+    verts = bands[1].get_paths()[0].vertices
+    # upper edge of the second band is the sum of the first two series
+    assert np.allclose(verts[:3], [[0, 1], [0.5, 3], [1, 4]])
+    assert np.allclose(verts[3:6], [[1, 3], [0.5, 2], [0, 1]])
+    assert subplot.get_ylim() == (0, 10)
+    plt.close(fig)
+
+
+def test_human_view_reuses_scatter():
+    fig, subplot = plt.subplots()
+    view = render.HumanView(subplot, title=True)
+    humans = Population(5)
+    humans.x[:] = np.arange(5)
+    humans.y[:] = 2 * np.arange(5)
+    humans.infect([3])
+    pacer = FramePacer()
+    scatter, title = view.update(humans, pacer)
+    assert scatter is view.scatter
+    assert np.allclose(scatter.get_offsets(), np.column_stack((humans.x, humans.y)))
+    assert len(subplot.collections) == 1
+    assert "steps/s" in title.get_text()
+    # blitting restores only the axes, the text has to stay inside them
+    extent = title.get_window_extent(fig.canvas.get_renderer())
+    assert subplot.bbox.x0 <= extent.x0 and extent.x1 <= subplot.bbox.x1
+    assert subplot.bbox.y0 <= extent.y0 and extent.y1 <= subplot.bbox.y1
+    plt.close(fig)
+
+
+def test_animate_skips_drawing_when_behind():
+    clock = FakeClock()
+    pacer = FramePacer(budget=1.0, max_skipped=1, clock=clock)
+    recorded = []
+    drawn = []
+
+    def step():
+        clock.now += 2.0
+
+    def draw():
+        drawn.append(pacer.steps)
+        return ()
+
+    fig = plt.figure()
+    ani = render.animate(fig, pacer, step, lambda: recorded.append(pacer.steps), draw)
+    for _ in range(4):
+        ani._draw_next_frame(next(ani.frame_seq), ani._blit)
+    plt.close(fig)
+    assert recorded == [1, 2, 3, 4]
+    # every frame is behind, so only every second one is drawn
+    assert drawn[-2:] == [2, 4]
@@ -0,0 +1,105 @@
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import src.init as init
+import src.simulation as sim
+from src.human import Group
+from src.metapopulation import Metapopulation
+from src.replay import band_counts, replay, summary_index
+from src.trajectory import Trajectory, TrajectoryWriter
+
+
+@pytest.fixture(params=[None, "delta"])
+def recorded(request, tmp_path):
+    rng = np.random.default_rng(3)
+    humans, energy = init.init_sys(10000, 1, 30, infection_radius=10, rng=rng)
+    counts = []
+    with TrajectoryWriter(tmp_path / "run", 30, chunk_size=8, codec=request.param) as writer:
+        for _ in range(30):
+            writer.record(humans)
+            counts.append(humans.status_counts())
+            sim.calculate_movement(humans, 0.0001, energy, rng=rng)
+    return tmp_path / "run", np.array(counts)
+
+
+def test_summary_is_written_with_the_trajectory(recorded):
+    path, counts = recorded
+    trajectory = Trajectory(path)
+    assert np.array_equal(trajectory.summary, counts)
+    # trajectories without a summary are counted from the statuses
+    trajectory.summary = None
+    assert np.array_equal(summary_index(trajectory, block=7), counts)
+
+
+def test_replay_seeks_to_any_frame(recorded):
+    path, counts = recorded
+    plot, viewer = replay(path, plt)
+    trajectory = Trajectory(path)
+    for index in (29, 3, 17):
+        viewer.slider.set_val(index)
+        assert viewer.index == index
+        offsets = viewer.view_humans.scatter.get_offsets()
+        assert np.array_equal(offsets[:, 0], trajectory.frame(index)["x"])
+        assert f"I {counts[index][1]}" in viewer.title.get_text()
+    viewer.fig.canvas.draw()
+    plt.close(viewer.fig)
+
+
+def test_cities_replay_with_one_world_per_city(tmp_path, moving_population):
+    cities = [moving_population(20, seed, infected=2) for seed in range(3)]
+    humans = Metapopulation.from_patches(cities, [c.energy() for c in cities],
+                                         np.full((3, 3), 0.3), migration_interval=2)
+    rng = np.random.default_rng(1)
+    patches = []
+    with TrajectoryWriter(tmp_path / "run", 60, ("x", "y", "status", "patch")) as writer:
+        for _ in range(6):
+            writer.record(humans.humans)
+            patches.append(humans.humans.patch.copy())
+            humans.step(0.0001, rng)
+    plot, viewer = replay(tmp_path / "run", plt)
+    assert len(viewer.views) == 3 and viewer.view_quarantine is None
+    viewer.slider.set_val(5)
+    for k, view in enumerate(viewer.views):
+        assert len(view.scatter.get_offsets()) == np.count_nonzero(patches[5] == k)
+    plt.close(viewer.fig)
+
+
+def test_quarantine_replay_counts_the_quarantined(tmp_path):
+    rng = np.random.default_rng(2)
+    humans, energy = init.init_sys(10000, 1, 30, infection_radius=10, rng=rng)
+    quarantined = []
+    with TrajectoryWriter(tmp_path / "run", 30, ("x", "y", "status", "quarantined")) as writer:
+        for _ in range(20):
+            writer.record(humans)
+            quarantined.append(np.count_nonzero(humans.quarantined))
+            sim.calculate_movement(humans, 0.0001, energy, rng=rng)
+            sim.quarantine(humans, 0.2, rng)
+    plot, viewer = replay(tmp_path / "run", plt)
+    assert viewer.bands.shape == (20, 4) and np.array_equal(viewer.bands[:, 1], quarantined)
+    viewer.slider.set_val(19)
+    assert viewer.view_quarantine.text.get_text() == f"Quarantined: {quarantined[19]}"
+    assert len(viewer.view_humans.scatter.get_offsets()) == 30 - quarantined[19]
+    plt.close(viewer.fig)
+
+
+def test_group_bands_split_every_state(tmp_path):
+    rng = np.random.default_rng(4)
+    humans, energy = init.init_sys(10000, 1, 30, infection_radius=10, rng=rng)
+    humans = init.make_vulnerable(humans, 30, 5, 10, 1, rng)
+    humans = init.wear_mask(humans, 30, 10, 10, 1, rng)
+    counts = []
+    with TrajectoryWriter(tmp_path / "run", 30, ("x", "y", "status", "group"),
+                          chunk_size=4, codec="delta") as writer:
+        for _ in range(10):
+            writer.record(humans)
+            counts.append(humans.counts.copy())
+            sim.calculate_movement(humans, 0.0001, energy, rng=rng)
+    trajectory = Trajectory(tmp_path / "run")
+    bands = band_counts(trajectory, summary_index(trajectory), block=3)
+    order = [Group.VULNERABLE.value, Group.STANDARD.value, Group.MASK.value]
+    # infected, recovered and suceptible humans of the vulnerable, standard and mask group
+    expected = [np.concatenate([c[order, 1], c[order, 2], c[order, 0]]) for c in counts]
+    assert np.array_equal(bands, expected)
@@ -0,0 +1,76 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.neighbours import NeighbourList
+from src.runner import main, run
+
+
+@pytest.mark.parametrize("model", ["basic", "randomwalk"])
+def test_run_returns_sir_series(model):
+    result = run({"model": model, "number_of_humans": 30, "seed": 1}, 20)
+    assert set(result) == {"time", "suceptible", "infected", "recovered"}
+    for series in result.values():
+        assert isinstance(series, np.ndarray)
+        assert len(series) == 21
+    total = result["suceptible"] + result["infected"] + result["recovered"]
+    assert np.all(total == 30)
+    assert result["infected"][0] == 1
+
+
+def test_run_rejects_unknown_model():
+    with pytest.raises(ValueError):
+        run({"model": "cities"}, 1)
+
+
+def test_runner_does_not_import_matplotlib():
+    code = "import sys, src.runner; print('matplotlib' in sys.modules)"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).resolve().parents[1])
+    assert output.stdout.strip() == "False"
+
+
+def test_command_line_writes_series(tmp_path, capsys):
+    out = tmp_path / "series.npz"
+    main(["--humans", "20", "--steps", "5", "--seed", "3", "--out", str(out)])
+    assert "S=" in capsys.readouterr().out
+    with np.load(out) as series:
+        assert len(series["infected"]) == 6
+
+
+@pytest.mark.parametrize("model", ["basic", "randomwalk"])
+def test_run_is_repeated_exactly_with_the_same_seed(model):
+    config = {"model": model, "number_of_humans": 40, "infection_radius": 10, "prob": 0.3}
+    first = run({**config, "seed": 5}, 200)
+    again = run({**config, "seed": 5}, 200)
+    other = run({**config, "seed": 6}, 200)
+    for name in first:
+        assert np.array_equal(first[name], again[name])
+    assert not np.array_equal(first["infected"], other["infected"])
+
+
+def test_run_does_not_use_the_global_random_state():
+    np.random.seed(0)
+    first = run({"number_of_humans": 30, "seed": 2}, 50)
+    np.random.seed(1)
+    again = run({"number_of_humans": 30, "seed": 2}, 50)
+    assert np.array_equal(first["infected"], again["infected"])
+
+
+def test_quarantine_slows_the_spread():
+    config = {"number_of_humans": 60, "seed": 3}
+    free = run(config, 300)
+    tested = run({**config, "detection_probability": 1.0}, 300)
+    assert tested["recovered"][-1] + tested["infected"][-1] <= free["recovered"][-1] + free["infected"][-1]
+
+
+def test_skin_is_used_and_reported(capsys):
+    neighbours = NeighbourList(4.0)
+    run({"number_of_humans": 30, "seed": 1}, 20, neighbours=neighbours)
+    assert neighbours.steps == 20 and 1 <= neighbours.rebuilds <= 20
+    main(["--humans", "20", "--steps", "5", "--seed", "3", "--skin", "3"])
+    report = capsys.readouterr().out.splitlines()[-1]
+    assert "rebuilds in 5 steps" in report and "skin 3.0" in report
@@ -0,0 +1,64 @@
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+import src.scenarios as scenarios
+from src.checkpoint import load_checkpoint
+
+answers = {
+    "basic": ["1", "5", "30", "10000"],
+    "randomwalk": ["1", "5", "30", "10000"],
+    "cities": ["1", "10", "15", "10000"],
+    "mask_vulnerable": ["0.4", "5", "30", "10000", "10", "10"],
+    "quarantine": ["40"],
+}
+
+
+def draw_frames(ani, n):
+    for _ in range(n):
+        ani._draw_next_frame(next(ani.frame_seq), ani._blit)
+
+
+def never_asked(prompt=""):
+    raise AssertionError("a resumed scenario takes its inputs from the checkpoint")
+
+
+@pytest.mark.parametrize("name", sorted(answers))
+def test_scenario_is_saved_and_resumed(tmp_path, monkeypatch, name):
+    path = tmp_path / f"{name}.npz"
+    scenario = getattr(scenarios, "scenario_" + name)
+    monkeypatch.setattr(scenarios, "checkpoint_interval", 1)
+    replies = iter(answers[name])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(replies))
+    _, ani = scenario(plt, seed=3, checkpoint=path)
+    draw_frames(ani, 2)
+    plt.close("all")
+    saved = load_checkpoint(path)
+    assert saved["steps"] > 0
+    assert saved["config"]["scenario"] == name
+    assert len(saved["config"]["inputs"]) == len(answers[name])
+
+    monkeypatch.setattr("builtins.input", never_asked)
+    _, ani = scenario(plt, checkpoint=path)
+    draw_frames(ani, 1)
+    plt.close("all")
+    resumed = load_checkpoint(path)
+    assert resumed["steps"] > saved["steps"]
+    # the curves go on where the saved ones ended
+    time, _ = resumed["history"].curves()
+    assert np.max(time) > np.max(saved["history"].curves()[0])
+    assert np.array_equal(np.unique(resumed["humans"].patch), np.unique(saved["humans"].patch))
+
+
+def test_checkpoint_of_another_scenario_is_refused(tmp_path, monkeypatch):
+    path = tmp_path / "basic.npz"
+    monkeypatch.setattr(scenarios, "checkpoint_interval", 1)
+    replies = iter(answers["basic"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(replies))
+    _, ani = scenarios.scenario_basic(plt, seed=3, checkpoint=path)
+    draw_frames(ani, 1)
+    plt.close("all")
+    with pytest.raises(ValueError, match="randomwalk"):
+        scenarios.scenario_randomwalk(plt, checkpoint=path)
@@ -0,0 +1,144 @@
+import numpy as np
+
+import src.simulation as sim
+from src.human import Status
+from src.population import Population
+
+
+def line_of_humans(xs, infection_radius=5, prob=1):
+    """creates suceptible humans on a horizontal line, the first one is infected"""
+    humans = Population(len(xs))
+    humans.x[:] = xs
+    humans.y[:] = 50
+    humans.radius[:] = 1.5
+    humans.infection_radius[:] = infection_radius
+    humans.infection_probability[:] = prob
+    humans.infect(0)
+    return humans
+
+
+def test_infection_reaches_only_humans_inside_their_radius():
+    humans = line_of_humans([50, 53, 60, 40])
+    humans.infection_radius[3] = 11
+    sim.infection(humans)
+    assert list(humans.status) == [Status.INFECTED.value, Status.INFECTED.value,
+                                   Status.SUCEPTIBLE.value, Status.INFECTED.value]
+
+
+def test_infection_needs_probability():
+    humans = line_of_humans([50, 53], prob=0)
+    sim.infection(humans)
+    assert humans.status[1] == Status.SUCEPTIBLE.value
+
+
+def test_recovered_humans_are_not_infected():
+    humans = line_of_humans([50, 53])
+    humans.status[1] = Status.RECOVERED.value
+    sim.infection(humans)
+    assert humans.status[1] == Status.RECOVERED.value
+
+
+def reference_movement(humans, dt, energy):
+    """the per-human integration loop, with the energy summed over all humans first"""
+    humans.ax[:] = 0.0
+    humans.ay[:] = 0.0
+    sim.calculate_interactions(humans)
+    new_velocities = [h.velocity + 0.5 * dt * h.acceleration for h in humans]
+    new_locations = [h.location + dt * h.velocity + 0.5 * dt ** 2 * h.acceleration
+                     for h in humans]
+    new_energy = sum(np.linalg.norm(v) ** 2 for v in new_velocities)
+    for h, location, velocity in zip(humans, new_locations, new_velocities):
+        velocity = velocity * np.sqrt(energy / new_energy)
+        factor_v = np.sqrt(np.linalg.norm(velocity) ** 2 / energy)
+        if factor_v > 3 * (1 / len(humans)):
+            velocity = velocity * 0.03 / factor_v
+        h.update(location, velocity)
+
+
+def test_vectorized_movement_matches_reference(moving_population):
+    humans = moving_population(speed=10000)
+    reference = humans.take(np.arange(len(humans)))
+    energy = humans.energy()
+    for _ in range(20):
+        sim.calculate_movement(humans, 0.0001, energy)
+        reference_movement(reference, 0.0001, energy)
+    assert np.allclose(humans.x, reference.x, atol=2e-3)
+    assert np.allclose(humans.y, reference.y, atol=2e-3)
+    assert np.allclose(humans.vx, reference.vx)
+    assert np.allclose(humans.vy, reference.vy)
+
+
+def test_limit_velocity_keeps_energy_and_caps_speed():
+    vx = np.array([3.0, 1.0, 0.5, 100.0])
+    vy = np.array([0.0, 1.0, 0.5, 0.0])
+    new_vx, new_vy = sim.limit_velocity(vx, vy, 10.0)
+    speed = np.hypot(new_vx, new_vy)
+    assert np.all(np.sqrt(speed ** 2 / 10.0) <= 3 / 4 + 1e-12)
+    assert np.all(np.sign(new_vx) == np.sign(vx))
+
+
+def test_movement_of_empty_population():
+    humans = Population()
+    assert len(sim.calculate_movement(humans, 0.0001, 1.0)) == 0
+
+
+def test_random_walk_is_reproducible_and_keeps_energy_bounded(moving_population):
+    first = moving_population(seed=5, speed=10000)
+    second = first.take(np.arange(len(first)))
+    energy = first.energy()
+    for _ in range(10):
+        sim.random_walk(first, 0.0001, energy, 10000, rng=np.random.default_rng(1))
+        sim.random_walk(second, 0.0001, energy, 10000, rng=np.random.default_rng(1))
+    assert np.array_equal(first.x, second.x)
+    assert np.array_equal(first.vx, second.vx)
+    assert first.energy() <= energy * (1 + 1e-9)
+    assert np.all(first.x >= first.radius) and np.all(first.x <= 100 - first.radius)
+
+
+def test_humans_infected_in_a_step_do_not_infect_in_the_same_step():
+    # the chain 0 -> 1 -> 2 needs two steps, 2 is too far from 0
+    humans = line_of_humans([50, 54, 58])
+    sim.infection(humans)
+    assert list(humans.status) == [Status.INFECTED.value, Status.INFECTED.value,
+                                   Status.SUCEPTIBLE.value]
+    sim.infection(humans)
+    assert humans.status[2] == Status.INFECTED.value
+
+
+def test_infection_probability_of_many_sources():
+    # one suceptible human surrounded by infected ones gets infected with
+    # probability 1 - (1 - p) ** sources
+    rng = np.random.default_rng(11)
+    infected = 0
+    runs = 2000
+    for _ in range(runs):
+        humans = line_of_humans([50, 47, 53, 50, 50], prob=0.2)
+        humans.y[3:] = [47, 53]
+        humans.status[:] = Status.INFECTED.value
+        humans.status[0] = Status.SUCEPTIBLE.value
+        sim.infection(humans, rng=rng)
+        infected += humans.status[0] == Status.INFECTED.value
+    assert abs(infected / runs - (1 - 0.8 ** 4)) < 0.04
+
+
+def test_quarantined_humans_neither_infect_nor_move():
+    humans = line_of_humans([50, 53, 56])
+    humans.vx[:] = 1000
+    humans.quarantined[0] = True
+    sim.calculate_movement(humans, 0.0001, 3e6)
+    assert humans.x[0] == 50 and humans.vx[0] == 1000
+    assert list(humans.status[1:]) == [Status.SUCEPTIBLE.value] * 2
+    assert humans.x[1] != 53
+
+
+def test_quarantine_detects_only_infected_and_releases_on_recovery():
+    humans = line_of_humans([10, 30, 50, 70])
+    humans.infect([1, 2])
+    humans.time_till_recovery[1] = 1
+    detected = sim.quarantine(humans, 1.0, np.random.default_rng(0))
+    assert list(detected) == [0, 1, 2]
+    assert list(humans.is_quarantined()) == [True, True, True, False]
+    assert len(sim.quarantine(humans, 1.0, np.random.default_rng(0))) == 0
+    humans.update(humans.x, humans.y, humans.vx, humans.vy)
+    assert humans.status[1] == Status.RECOVERED.value
+    assert list(humans.quarantined) == [True, False, True, False]
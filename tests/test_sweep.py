@@ -0,0 +1,57 @@
+import numpy as np
+
+from src.sweep import grid, latin_hypercube, main, summarise, sweep
+
+
+def test_grid_has_every_combination():
+    configs = grid(prob=[0.5, 1], number_of_humans=[10, 20, 30])
+    assert len(configs) == 6
+    assert {"prob": 1, "number_of_humans": 20} in configs
+
+
+def test_latin_hypercube_uses_every_interval_once():
+    configs = latin_hypercube({"prob": (0, 1), "number_of_humans": (10, 50)}, 8, seed=2)
+    assert len(configs) == 8
+    probs = np.array([c["prob"] for c in configs])
+    assert sorted(np.floor(probs * 8).astype(int)) == list(range(8))
+    assert all(isinstance(c["number_of_humans"], int) for c in configs)
+    assert latin_hypercube({"prob": (0, 1)}, 4, seed=2) == latin_hypercube({"prob": (0, 1)}, 4, seed=2)
+
+
+def test_summarise_finds_the_peak():
+    result = {
+        "time": np.arange(5) * 0.1,
+        "suceptible": np.array([9, 7, 4, 3, 3]),
+        "infected": np.array([1, 3, 5, 4, 2]),
+        "recovered": np.array([0, 0, 1, 3, 5]),
+    }
+    assert summarise(result) == (5, 0.2, 7)
+
+
+def test_sweep_in_processes_matches_the_parameters():
+    configs = grid(prob=[0, 1], number_of_humans=[15, 25])
+    table = sweep(configs, 10, processes=2, base={"infection_radius": 8})
+    assert len(table) == 4
+    assert list(table["number_of_humans"]) == [15, 25, 15, 25]
+    # without any probability nobody but the first human gets infected
+    assert np.all(table["final_size"][table["prob"] == 0] == 1)
+    assert np.all(table["peak_infected"] >= 1)
+    assert np.all(table["final_size"] <= table["number_of_humans"])
+
+
+def test_command_line_writes_table(tmp_path, capsys):
+    out = tmp_path / "table.npy"
+    main(["--humans", "12", "20", "--steps", "3", "--processes", "1", "--out", str(out)])
+    assert "peak_infected" in capsys.readouterr().out
+    assert len(np.load(out)) == 2
+
+
+def test_sweep_is_the_same_for_any_amount_of_processes():
+    configs = grid(prob=[0.3, 0.6], infection_radius=[6, 10])
+    serial = sweep(configs, 40, processes=1, seed=9, replicas=2)
+    parallel = sweep(configs, 40, processes=3, seed=9, replicas=2)
+    assert np.array_equal(serial, parallel)
+    assert list(serial["replica"]) == [0, 1] * 4
+    # the replicas of a configuration use independent streams
+    other = sweep(configs, 40, processes=1, seed=10, replicas=2)
+    assert not np.array_equal(serial, other)
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+import src.init as init
+import src.simulation as sim
+from src.runner import main, run
+from src.trajectory import Trajectory, TrajectoryWriter
+
+
+def test_frames_are_written_with_stride(tmp_path):
+    rng = np.random.default_rng(0)
+    humans, energy = init.init_sys(10000, 1, 30, rng=rng)
+    expected = []
+    with TrajectoryWriter(tmp_path / "run", 30, stride=3, chunk_size=4, time_step=0.5) as writer:
+        for step in range(20):
+            if step % 3 == 0:
+                expected.append((humans.x.copy(), humans.status.copy()))
+            writer.record(humans)
+            sim.calculate_movement(humans, 0.0001, energy, rng=rng)
+    assert writer.frames == writer.written == 7
+    trajectory = Trajectory(tmp_path / "run")
+    assert len(trajectory) == 7
+    assert isinstance(trajectory["x"], np.memmap)
+    assert trajectory["status"].dtype == np.int8
+    assert np.array_equal(trajectory.time, np.arange(0, 20, 3) * 0.5)
+    for k, (x, status) in enumerate(expected):
+        assert np.array_equal(trajectory["x"][k], x)
+        assert np.array_equal(trajectory.frame(k)["status"], status)
+
+
+def test_memory_is_bounded_by_the_chunks(tmp_path):
+    humans, _ = init.init_sys(10000, 1, 10, rng=np.random.default_rng(1))
+    with TrajectoryWriter(tmp_path / "run", 10, chunk_size=2) as writer:
+        for _ in range(101):
+            writer.record(humans)
+        # the current chunk and one being written or free
+        assert writer._free.qsize() + writer._full.qsize() <= 2
+    assert len(Trajectory(tmp_path / "run")) == 101
+
+
+def test_writer_checks_the_population(tmp_path):
+    humans, _ = init.init_sys(10000, 1, 10, rng=np.random.default_rng(1))
+    with pytest.raises(ValueError):
+        TrajectoryWriter(tmp_path / "run", 10, columns=("x", "speed"))
+    with TrajectoryWriter(tmp_path / "run", 11) as writer:
+        with pytest.raises(ValueError):
+            writer.record(humans)
+
+
+def test_runner_writes_a_trajectory(tmp_path, capsys):
+    main(["--humans", "20", "--steps", "10", "--seed", "3",
+          "--trajectory", str(tmp_path / "run"), "--stride", "5"])
+    trajectory = Trajectory(tmp_path / "run")
+    assert len(trajectory) == 3
+    assert trajectory["x"].shape == (3, 20)
+
+
+@pytest.mark.parametrize("codec", [None, "delta"])
+def test_resumed_run_continues_the_trajectory(tmp_path, codec):
+    config = {"number_of_humans": 20, "infection_radius": 10, "prob": 0.3, "seed": 4}
+    # the frame of the checkpoint step is recorded again, so a written chunk is cut
+    options = {"stride": 4, "chunk_size": 4, "time_step": 0.0001, "codec": codec}
+    with TrajectoryWriter(tmp_path / "whole", 20, **options) as writer:
+        run(config, 60, trajectory=writer)
+    # the first run is stopped after 35 steps, its trajectory goes beyond the checkpoint of step 20
+    with TrajectoryWriter(tmp_path / "resumed", 20, append=True, **options) as writer:
+        run(config, 35, tmp_path / "run.npz", 20, trajectory=writer)
+    with TrajectoryWriter(tmp_path / "resumed", 20, append=True, **options) as writer:
+        run(config, 60, tmp_path / "run.npz", 20, trajectory=writer)
+    whole = Trajectory(tmp_path / "whole")
+    resumed = Trajectory(tmp_path / "resumed")
+    assert len(resumed) == len(whole) == 16
+    assert np.array_equal(resumed.time, whole.time)
+    assert np.array_equal(resumed.summary, whole.summary)
+    for name in ("x", "y", "status"):
+        assert np.array_equal(resumed[name], whole[name])
+
+
+def test_resumed_run_needs_the_old_trajectory(tmp_path):
+    config = {"number_of_humans": 20, "seed": 4}
+    run(config, 30, tmp_path / "run.npz", 20)
+    with TrajectoryWriter(tmp_path / "new", 20) as writer:
+        with pytest.raises(ValueError, match="append=True"):
+            run(config, 40, tmp_path / "run.npz", 20, trajectory=writer)
+    with pytest.raises(ValueError, match="other settings"):
+        TrajectoryWriter(tmp_path / "new", 20, stride=2, append=True)